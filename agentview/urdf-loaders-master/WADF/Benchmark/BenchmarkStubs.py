@@ -0,0 +1,224 @@
+"""
+WADF 벤치마크용 스텁 모듈
+PySide2 디스플레이/이벤트 루프와 물리 엔진 없이 InP 셀의 링커를 VirtualMode로 생성할 수 있도록
+PySide2.QtCore, pybullet, Device.*, Driver.VirtualDriver.*, Parser.WDFParser 모듈을 sys.modules에 등록
+(Parser.WDFParser는 실제 모듈이 있으면 그대로 사용)
+"""
+import sys
+import types
+import xml.etree.ElementTree as ET
+
+'''
+PySide2.QtCore
+'''
+class Signal():
+    def __init__(self, *types_):
+        self.slots = []
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        key = f"_signal_{id(self)}"
+        bound = instance.__dict__.get(key)
+        if bound is None:
+            bound = instance.__dict__[key] = Signal()
+        return bound
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self, *args):
+        for slot in self.slots:
+            slot(*args)
+
+class QObject():
+    def __init__(self, *args, **kwargs):
+        pass
+
+class QRunnable():
+    def __init__(self, *args, **kwargs):
+        pass
+
+class QThread(QObject):
+    pass
+
+class QThreadPool(QObject):
+    '''
+        작업을 호출한 스레드에서 바로 실행 (큐잉 비용 없이 링커 측 비용만 측정)
+    '''
+    def start(self, runnable):
+        runnable.run()
+
+class QTimer(QObject):
+    timeout = Signal()
+
+    def start(self, msec=None):
+        self.interval = msec
+
+    def stop(self):
+        pass
+
+    @staticmethod
+    def singleShot(msec, callback):
+        callback()
+
+class QEventLoop(QObject):
+    '''
+        msleep의 대기 없이 바로 반환 (프로그램 디스패치 비용만 측정)
+    '''
+    def exec_(self):
+        return 0
+
+    def quit(self):
+        pass
+
+'''
+pybullet (물리 엔진 없이 고정된 링크 자세, 감지 없는 레이 반환)
+'''
+def getLinkStates(bodyUniqueId, linkIndices, computeLinkVelocity=0, computeForwardKinematics=0, physicsClientId=0):
+    return [((0.0, 0.0, 0.0), (0.0, 0.0, 0.0, 1.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0, 1.0),
+             (0.1 * link, 0.0, 0.8), (0.0, 0.0, 0.0, 1.0)) for link in linkIndices]
+
+def rayTestBatch(rayFromPositions, rayToPositions, numThreads=1, physicsClientId=0):
+    return [(-1, -1, 1.0, (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)) for _ in rayFromPositions]
+
+def stepSimulation(physicsClientId=0):
+    pass
+
+def setPhysicsEngineParameter(physicsClientId=0, **params):
+    pass
+
+def getJointStates(bodyUniqueId, jointIndices, physicsClientId=0):
+    return [(0.0, 0.0, (0.0,) * 6, 0.0) for _ in jointIndices]
+
+def setJointMotorControlArray(bodyUniqueId, jointIndices, controlMode, targetPositions=None, forces=None, physicsClientId=0):
+    pass
+
+def setJointMotorControl2(bodyUniqueId, jointIndex, controlMode, targetPosition=0.0, force=None, maxVelocity=None, physicsClientId=0):
+    pass
+
+def changeDynamics(bodyUniqueId, linkIndex, physicsClientId=0, **dynamics):
+    pass
+
+'''
+Device / Driver
+'''
+class Virtual_ProximitySensor():
+    def __init__(self, robotId, linkId, direction, rayMaxLen):
+        self.robotId = robotId
+        self.linkId = linkId
+        self.direction = direction
+        self.rayMaxLen = rayMaxLen
+
+class Virtual_PneumaticActuator():
+    def __init__(self, robotId, jointId, oriPos, tarPos, tarVel, tarForce, **dynamics):
+        self.robotId = robotId
+        self.jointId = jointId
+        self.oriPos = oriPos
+        self.tarPos = tarPos
+        self.tarVel = tarVel
+        self.tarForce = tarForce
+        self.dynamics = dynamics
+
+class Virtual_Conveyor():
+    def __init__(self, robotId, linkId, linVel, direction):
+        self.linVel = linVel
+        self.power = False
+
+    def power_on(self):
+        self.power = True
+
+    def power_off(self):
+        self.power = False
+
+class Virtual_SCARARobot():
+    def __init__(self, robotId, jointId):
+        self.robotId = robotId
+        self.jointId = jointId
+
+class Virtual_DIODriver():
+    def __init__(self, DI_devices, DI_pins, DO_devices, DO_pins, period_ms):
+        self.states = {pin: 0 for pin in list(DI_pins) + list(DO_pins)}
+
+    def Read(self, pins):
+        return [self.states.get(pin, 0) for pin in pins]
+
+    def Write(self, pins, states):
+        for pin, state in zip(pins, states):
+            self.states[pin] = state
+
+class Virtual_SCARARobotDriver():
+    def __init__(self, scaraRobot):
+        self.scaraRobot = scaraRobot
+        self.power = 0
+        self.joints = [0.0] * 6
+
+    def set_power(self, power):
+        self.power = power
+
+    def MoveAbsolute(self, theta1=None, theta2=None, theta3=None, d1=None, d2=None, d3=None):
+        for i, value in enumerate((theta1, theta2, theta3, d1, d2, d3)):
+            if value is not None:
+                self.joints[i] = value
+
+'''
+Parser.WDFParser
+'''
+class WDFParser():
+    '''
+        WDF 파일을 {WorkcellName: {DeviceName: {"Monitoring"|"Control": {VariableName: {...}}}}} 형태로 변환
+    '''
+    def __init__(self, wdf_path):
+        root = ET.parse(wdf_path).getroot()
+        workcell = root.find("Workcell")
+        self.workcell_name = workcell.get("WorkcellName")
+
+        devices = {}
+        for device in workcell.findall("Device"):
+            sections = {}
+            for section in ("Monitoring", "Control"):
+                node = device.find(section)
+                if node is None:
+                    continue
+                sections[section] = {
+                    variable.get("VariableName"): {"DataType": variable.get("DataType"), "Value": None, "Timestamp": None}
+                    for variable in node.findall("Variable")
+                }
+            devices[device.get("DeviceName")] = sections
+        self.value = {self.workcell_name: devices}
+
+
+def make_module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    module.__all__ = list(attrs)
+    sys.modules[name] = module
+    return module
+
+def install_stubs():
+    make_module("PySide2")
+    make_module("PySide2.QtCore", Signal=Signal, QObject=QObject, QRunnable=QRunnable, QThread=QThread,
+                QThreadPool=QThreadPool, QTimer=QTimer, QEventLoop=QEventLoop)
+    sys.modules["PySide2"].QtCore = sys.modules["PySide2.QtCore"]
+
+    make_module("pybullet", getLinkStates=getLinkStates, rayTestBatch=rayTestBatch, stepSimulation=stepSimulation,
+                setPhysicsEngineParameter=setPhysicsEngineParameter, getJointStates=getJointStates, setJointMotorControlArray=setJointMotorControlArray,
+                setJointMotorControl2=setJointMotorControl2,
+                changeDynamics=changeDynamics, POSITION_CONTROL=2, MAX_RAY_INTERSECTION_BATCH_SIZE=16384)
+
+    make_module("Device")
+    make_module("Device.Virtual_ProximitySensor", Virtual_ProximitySensor=Virtual_ProximitySensor)
+    make_module("Device.Virtual_PneumaticActuator", Virtual_PneumaticActuator=Virtual_PneumaticActuator)
+    make_module("Device.Virtual_Conveyor", Virtual_Conveyor=Virtual_Conveyor)
+    make_module("Device.Virtual_SCARARobot", Virtual_SCARARobot=Virtual_SCARARobot)
+
+    make_module("Driver")
+    make_module("Driver.VirtualDriver")
+    make_module("Driver.VirtualDriver.Virtual_DIODriver", Virtual_DIODriver=Virtual_DIODriver)
+    make_module("Driver.VirtualDriver.Virtual_SCARARobotDriver", Virtual_SCARARobotDriver=Virtual_SCARARobotDriver)
+
+    try:
+        import Parser.WDFParser
+    except ImportError:
+        make_module("Parser")
+        make_module("Parser.WDFParser", WDFParser=WDFParser)
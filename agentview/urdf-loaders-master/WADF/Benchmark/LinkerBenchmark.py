@@ -0,0 +1,181 @@
+"""
+WADF 링커 계층 벤치마크
+스텁 드라이버(BenchmarkStubs)로 InP 셀을 VirtualMode로 구성하여 아래 항목을 측정하고 JSON으로 저장
+    - data_store_decorator 처리량
+    - 링커 수(9 -> 1000)에 따른 폴링 주기(tick) 비용
+    - SCARA 프로그램 디스패치 지연 시간
+    - WDF/WADF 로드 시간
+    - 링커당 메모리
+
+저장된 baseline과 비교하여 tolerance 이상 느려진 항목이 있으면 종료 코드 1을 반환
+
+사용법 (urdf-loaders-master 디렉토리에서 실행)
+    python -m WADF.Benchmark.LinkerBenchmark --output result.json
+    python -m WADF.Benchmark.LinkerBenchmark --update-baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from WADF.Benchmark.BenchmarkStubs import install_stubs
+
+install_stubs()
+
+from Parser.WDFParser import WDFParser
+from WADF.Linker.LinkerScheduler import SCHEDULER, LinkerScheduler
+from WADF.Linker.PalletInSensor import PalletInSensor
+from WADF.Linker.PalletOutSensor import PalletOutSensor
+from WADF.Linker.AssemblySensor import AssemblySensor
+from WADF.Linker.AssemblyBlockActuator import AssemblyBlockActuator
+from WADF.Linker.EngravingActuator import EngravingActuator
+from WADF.Linker.PartPusher1 import PartPusher1
+from WADF.Linker.PartPusher2 import PartPusher2
+from WADF.Linker.Conveyor import Conveyor
+from WADF.Linker.SCARARobot import SCARARobot
+
+WADF_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WDF_PATH = os.path.join(WADF_DIR, "WDF", "InP.wdf")
+WADF_PATH = os.path.join(WADF_DIR, "INP.wadf")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SENSOR_CLASSES = [PalletInSensor, PalletOutSensor, AssemblySensor]
+ACTUATOR_CLASSES = [AssemblyBlockActuator, EngravingActuator, PartPusher1, PartPusher2]
+POLLING_SIZES = [9, 100, 1000]
+PROGRAMS = [f"GRIPPER_TEST2_{i:02d}" for i in range(1, 22)]
+
+def measure(func, number, repeat=5):
+    '''
+        func를 number번 호출하는 시간을 repeat번 측정하여 1회 호출당 중앙값(초) 반환
+    '''
+    samples = []
+    for _ in range(repeat):
+        gc.disable()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+        gc.enable()
+    return statistics.median(samples)
+
+def build_cell(count):
+    '''
+        InP 셀의 링커(센서 3 + 액추에이터 4 + Conveyor + SCARARobot)를 count개가 될 때까지 반복 생성
+    '''
+    classes = SENSOR_CLASSES + ACTUATOR_CLASSES
+    linkers = [Conveyor(WDF_PATH), SCARARobot(WDF_PATH)]
+    while len(linkers) < count:
+        linkers.append(classes[len(linkers) % len(classes)](WDF_PATH))
+    return linkers[:count]
+
+def bench_decorator(results):
+    pusher = PartPusher1(WDF_PATH)
+    sensor = PalletInSensor(WDF_PATH)
+
+    results["decorator.set_state.calls_per_s"] = {"value": 1.0 / measure(lambda: pusher.set_state(True), 20000), "unit": "calls/s", "better": "higher"}
+    results["decorator.get_state.calls_per_s"] = {"value": 1.0 / measure(sensor.get_state, 20000), "unit": "calls/s", "better": "higher"}
+    results["undecorated.get_state.calls_per_s"] = {"value": 1.0 / measure(sensor.impl["get_state"], 20000), "unit": "calls/s", "better": "higher"}
+
+def bench_polling(results):
+    for size in POLLING_SIZES:
+        linkers = build_cell(size)
+        scheduler = LinkerScheduler(period_ms=200)
+        scheduler.tasks = [linker.get_state for linker in linkers if hasattr(linker, "get_state")]
+        results[f"polling.tick_us.{size}_linkers"] = {"value": measure(scheduler.tick, 200) * 1e6, "unit": "us", "better": "lower"}
+        SCHEDULER.tasks = []
+
+def bench_scara(results):
+    robot = SCARARobot(WDF_PATH)
+    latencies = []
+    for program in PROGRAMS:
+        latencies.append(measure(lambda: robot.set_program(program), 2000))
+    results["scara.set_program_us.mean"] = {"value": statistics.mean(latencies) * 1e6, "unit": "us", "better": "lower"}
+    results["scara.set_program_us.max"] = {"value": max(latencies) * 1e6, "unit": "us", "better": "lower"}
+
+def bench_load(results):
+    results["load.wdf_ms"] = {"value": measure(lambda: WDFParser(WDF_PATH), 50) * 1e3, "unit": "ms", "better": "lower"}
+    results["load.wadf_ms"] = {"value": measure(lambda: ET.parse(WADF_PATH), 50) * 1e3, "unit": "ms", "better": "lower"}
+
+def bench_memory(results):
+    count = 200
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    linkers = build_cell(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    SCHEDULER.tasks = []
+    results["memory.bytes_per_linker"] = {"value": (after - before) / len(linkers), "unit": "bytes", "better": "lower"}
+
+def run_all():
+    results = {}
+    bench_decorator(results)
+    bench_polling(results)
+    bench_scara(results)
+    bench_load(results)
+    bench_memory(results)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+def compare(report, baseline, tolerance):
+    '''
+        baseline 대비 tolerance(비율) 이상 나빠진 항목 목록 반환
+    '''
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None or not previous["value"]:
+            continue
+        ratio = current["value"] / previous["value"]
+        current["baseline"] = previous["value"]
+        current["ratio"] = ratio
+        worse = ratio > 1.0 + tolerance if current["better"] == "lower" else ratio < 1.0 / (1.0 + tolerance)
+        if worse:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WADF linker benchmark")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="비교 기준 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 성능 저하 비율 (기본 0.25)")
+    parser.add_argument("--update-baseline", action="store_true", help="결과를 baseline으로 저장")
+    args = parser.parse_args(argv)
+
+    report = run_all()
+
+    regressions = []
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+    report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    for name in regressions:
+        print(f"REGRESSION: {name}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
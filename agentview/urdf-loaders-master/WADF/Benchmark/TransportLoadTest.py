@@ -0,0 +1,116 @@
+"""
+WADF 실제 장비 전송 계층 부하 테스트
+DeviceSimulator를 같은 프로세스에서 띄우고 InP 셀 링커를 ActualMode / DigitalTwinMode로 전환하여
+여러 스레드에서 센서 읽기, 액추에이터 쓰기, SCARA 이동을 반복한 뒤 장비별 RTT, 명령 큐 대기 시간과 처리량을 JSON으로 출력
+
+사용법 (urdf-loaders-master 디렉토리에서 실행)
+    python -m WADF.Benchmark.TransportLoadTest --mode ActualMode --threads 8 --seconds 5 --latency-ms 1
+"""
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+
+from WADF.Benchmark.BenchmarkStubs import install_stubs
+
+install_stubs()
+
+from WADF.Linker.DeviceSimulator import DeviceSimulator
+from WADF.Linker.DeviceTransport import TransportDIODriver, TransportSCARARobotDriver
+from WADF.Linker.CommandQueue import queue_metrics
+from WADF.Linker.PalletInSensor import PalletInSensor
+from WADF.Linker.PalletOutSensor import PalletOutSensor
+from WADF.Linker.AssemblySensor import AssemblySensor
+from WADF.Linker.PartPusher1 import PartPusher1
+from WADF.Linker.PartPusher2 import PartPusher2
+from WADF.Linker.SCARARobot import SCARARobot
+from WADF.Benchmark.LinkerBenchmark import WDF_PATH
+
+HOST = "127.0.0.1"
+
+def start_simulator(dio_ports, scara_ports, latency_ms, jitter_ms):
+    simulator = DeviceSimulator(latency_ms, jitter_ms)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(simulator.run(HOST, dio_ports, scara_ports),), daemon=True)
+    thread.start()
+    while len(simulator.servers) < len(dio_ports) + len(scara_ports):
+        time.sleep(0.01)
+    return simulator
+
+def build_linkers(mode, di_driver, do_driver, scara_driver):
+    sensors = [cls(WDF_PATH) for cls in (PalletInSensor, PalletOutSensor, AssemblySensor)]
+    pushers = [cls(WDF_PATH) for cls in (PartPusher1, PartPusher2)]
+    robot = SCARARobot(WDF_PATH)
+    for linker in sensors:
+        linker.actual_driver = di_driver
+    for linker in pushers:
+        linker.actual_driver = do_driver
+    robot.actual_driver = scara_driver
+    for linker in sensors + pushers + [robot]:
+        linker.switch_mode(mode)
+    return sensors, pushers, robot
+
+def worker(index, deadline, sensors, pushers, scara_driver, counts, errors):
+    n = 0
+    while time.monotonic() < deadline:
+        try:
+            for sensor in sensors:
+                sensor.get_state()
+            pushers[n % len(pushers)].set_state(n % 2 == 0)
+            scara_driver.MoveAbsolute(theta1=0.001 * (n % 100))
+        except Exception:
+            errors[index] += 1
+        n += 1
+    counts[index] = n
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WADF transport load test")
+    parser.add_argument("--mode", default="ActualMode", choices=["ActualMode", "DigitalTwinMode"])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    start_simulator([2000, 1000], [5000], args.latency_ms, args.jitter_ms)
+    di_driver = TransportDIODriver(HOST, 2000, pool_size=args.pool_size)
+    do_driver = TransportDIODriver(HOST, 1000, pool_size=args.pool_size)
+    scara_driver = TransportSCARARobotDriver(HOST, 5000, pool_size=args.pool_size)
+    scara_driver.connect()
+    scara_driver.set_power(1)
+    sensors, pushers, robot = build_linkers(args.mode, di_driver, do_driver, scara_driver)
+
+    counts = [0] * args.threads
+    errors = [0] * args.threads
+    deadline = time.monotonic() + args.seconds
+    threads = [threading.Thread(target=worker, args=(i, deadline, sensors, pushers, scara_driver, counts, errors))
+               for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = {
+        "mode": args.mode,
+        "threads": args.threads,
+        "seconds": args.seconds,
+        "latency_ms": args.latency_ms,
+        "cycles_per_s": sum(counts) / args.seconds,
+        "errors": sum(errors),
+        "devices": [driver.transport.metrics() for driver in (di_driver, do_driver, scara_driver)],
+        "command_queues": queue_metrics(),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
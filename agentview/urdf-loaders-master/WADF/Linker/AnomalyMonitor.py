@@ -0,0 +1,246 @@
+"""
+WADF 이상 감지 모듈
+링커 이벤트(액추에이터 명령 -> 센서 엣지 지연, SCARA 프로그램 명령 -> 관절 도달 시간, WPF CycleTime/IdleTime)를 신호별로 온라인 감시
+    - 신호마다 EWMA 평균/분산 기준선과 양방향 CUSUM 누적합만 유지 (이벤트당 O(1), 신호당 고정 메모리)
+    - 처음 warmup개는 기준선 학습, 이후 |z| > threshold(급변) 또는 CUSUM > h(완만한 드리프트)이면 알람 발생
+    - 이상값은 기준선에 반영하지 않고, clear_after개 연속 정상이면 알람 해제
+알람은 DSF Event 서비스(ex. "Anomaly_alarm" -> Alarm/Anomaly)로 발생/해제를 전달
+"""
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from WADF.Linker.LinkerLogger import get_logger
+from WADF.Linker.SCARASequence import PROGRAMS, JOINT_TOLERANCE
+
+class SignalDetector():
+    __slots__ = ("name", "alpha", "threshold", "k", "h", "warmup", "clear_after", "min_std", "rel_std",
+                 "count", "mean", "var", "cusum_high", "cusum_low", "active", "normal_run", "last")
+
+    def __init__(self, name, alpha=0.05, threshold=4.0, k=0.5, h=5.0, warmup=10, clear_after=3, min_std=0.0, rel_std=0.02):
+        '''
+            alpha: EWMA 계수, threshold: 급변 판정 z, k/h: CUSUM 허용 편차/판정 한계 (표준편차 단위)
+            min_std, rel_std: 표준편차 하한 (절대값, 평균 대비 비율) - 가상 모드처럼 분산이 거의 없는 신호의 오탐 방지
+        '''
+        self.name = name
+        self.alpha = alpha
+        self.threshold = threshold
+        self.k = k
+        self.h = h
+        self.warmup = warmup
+        self.clear_after = clear_after
+        self.min_std = min_std
+        self.rel_std = rel_std
+
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.cusum_high = 0.0
+        self.cusum_low = 0.0
+        self.active = None          # 발생 중인 알람 종류 ("spike" | "drift_high" | "drift_low")
+        self.normal_run = 0
+        self.last = None
+
+    def std(self):
+        return max(math.sqrt(self.var), self.min_std, self.rel_std * abs(self.mean))
+
+    def update(self, value):
+        '''
+            return: (알람 종류 또는 None, z)
+        '''
+        self.last = value
+        self.count += 1
+        if self.count <= self.warmup:     # Welford로 초기 기준선
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.var += (delta * (value - self.mean) - self.var) / self.count
+            return None, 0.0
+
+        z = (value - self.mean) / self.std()
+        limit = 2.0 * self.h        # 드리프트가 끝나면 빨리 해제되도록 누적합 상한 적용
+        self.cusum_high = min(limit, max(0.0, self.cusum_high + z - self.k))
+        self.cusum_low = min(limit, max(0.0, self.cusum_low - z - self.k))
+
+        kind = None
+        if abs(z) > self.threshold:
+            kind = "spike"
+        elif self.cusum_high > self.h:
+            kind = "drift_high"
+        elif self.cusum_low > self.h:
+            kind = "drift_low"
+
+        if kind is None:
+            delta = value - self.mean
+            self.mean += self.alpha * delta
+            self.var = (1.0 - self.alpha) * (self.var + self.alpha * delta * delta)
+        return kind, z
+
+
+class AnomalyMonitor():
+    def __init__(self, services=None, service_name="Anomaly_alarm", **defaults):
+        '''
+            services: DataServiceRuntime (None이면 로그와 subscribe 콜백으로만 전달)
+            defaults: SignalDetector 기본 파라미터
+        '''
+        self.services = services
+        self.service_name = service_name
+        self.defaults = defaults
+        self.detectors = {}
+        self.overrides = {}         # 신호 이름 -> SignalDetector 파라미터
+        self.pending = {}           # 응답 지연 신호 -> 명령 시각(monotonic_ns), 신호당 하나만 유지
+        self.reaching = {}          # 프로그램 신호 -> (명령 시각(monotonic_ns), 관절 목표), 스텝 훅에서 도달 확인
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.log = get_logger(self.__class__.__name__)
+
+    def configure(self, name, **params):
+        self.overrides[name] = params
+        self.detectors.pop(name, None)
+
+    def subscribe(self, callback):
+        '''
+            callback(alarm: dict)
+        '''
+        self.subscribers = self.subscribers + [callback]
+
+    def detector(self, name):
+        detector = self.detectors.get(name)
+        if detector is None:
+            detector = self.detectors[name] = SignalDetector(name, **{**self.defaults, **self.overrides.get(name, {})})
+        return detector
+
+    def observe(self, name, value, timestamp=None):
+        '''
+            신호 값 하나를 반영, 알람이 발생/해제되면 DSF로 전달
+        '''
+        if isinstance(value, timedelta):
+            value = value.total_seconds()
+        if value is None:
+            return None
+        with self.lock:
+            detector = self.detector(name)
+            kind, z = detector.update(float(value))
+            if kind is not None:
+                detector.normal_run = 0
+                if detector.active is not None:     # 해제될 때까지 신호당 하나의 알람
+                    return None
+                detector.active = kind
+                state = "raised"
+            else:
+                if detector.active is None:
+                    return None
+                detector.normal_run += 1
+                if detector.normal_run < detector.clear_after:
+                    return None
+                kind, detector.active = detector.active, None
+                state = "cleared"
+            alarm = {"signal": name, "kind": kind, "state": state, "value": float(value), "baseline": detector.mean,
+                     "std": detector.std(), "z": z, "timestamp": timestamp or datetime.now()}
+
+        (self.log.warning if state == "raised" else self.log.info)(
+            "%s %s %s: %.4f (baseline %.4f, z=%.1f)", name, kind, state, alarm["value"], alarm["baseline"], z)
+        if self.services is not None:
+            try:
+                self.services.publish(self.service_name, alarm)
+            except KeyError as e:   # DSF reload로 서비스가 제거된 경우: 스텝 훅/센서 콜백으로 예외를 전파하지 않음
+                self.log.warning("alarm not published: %s", e)
+        for callback in self.subscribers:
+            callback(alarm)
+        return alarm
+
+    '''
+        이벤트 연결
+    '''
+    def start(self, name):
+        self.pending[name] = time.monotonic_ns()
+
+    def finish(self, name, end_ns=None):
+        start_ns = self.pending.pop(name, None)
+        if start_ns is None:
+            return None
+        return self.observe(name, ((end_ns or time.monotonic_ns()) - start_ns) / 1e9)
+
+    def watch_response(self, linker, sensor, edge, name=None):
+        '''
+            linker.set_state 호출부터 sensor 링커(PalletInSensor 등) 핀 엣지까지의 지연 시간(s)을 감시
+            센서 링커에 구독하므로 switch_mode 이후에도 새 모드의 퍼블리셔에서 계속 수신
+            ex) watch_response(part_pusher1, assembly_sensor, edge="Rising")
+        '''
+        name = name or f"{linker.__class__.__name__}.set_state->{sensor.__class__.__name__}.{edge}"
+        set_state = linker.set_state
+
+        def timed_set_state(*args, **kwargs):
+            self.start(name)
+            return set_state(*args, **kwargs)
+        linker.set_state = timed_set_state
+        sensor.subscribe(lambda event: self.finish(name, event.monotonic_ns), edge)
+        return name
+
+    def watch_program(self, scara, stepper=None, robot_id=None, joint_ids=None, prefix=None, tolerance=JOINT_TOLERANCE):
+        '''
+            SCARARobot.set_program 명령부터 관절이 목표에 도달할 때까지의 시간(s)을 프로그램 이름별 기준선으로 감시
+            (ex. "SCARARobot.GRIPPER_TEST2_02")
+            stepper(SimulationStepper)가 진행 중이면 스텝 스냅샷으로 도달을 확인하고, 대기 시간 안에 도달하지 못하면
+            set_program이 끝난 시점까지를 관측값으로 사용
+            이동이 없는 프로그램이나 스냅샷이 없는 경우(ActualMode)는 set_program 완료(컨트롤러 응답)까지의 시간
+            ex) watch_program(scara, VSIM_STEPPER, VSCR_ROBOT_ID, VSCR_JOINT_IDS)
+        '''
+        prefix = prefix or scara.__class__.__name__
+        set_program = scara.set_program
+
+        def on_step(dt=None):
+            if not self.reaching:
+                return
+            snapshot = stepper.latest()
+            joints = snapshot.joint_positions(robot_id, joint_ids)
+            if joints is None:
+                return
+            for name, (start_ns, goal) in list(self.reaching.items()):
+                if np.all(np.abs(np.asarray(joints) - goal) <= tolerance) and self.reaching.pop(name, None) is not None:
+                    self.observe(name, max(0, snapshot.monotonic_ns - start_ns) / 1e9)
+
+        def timed_set_program(program):
+            name = f"{prefix}.{program}"
+            step = PROGRAMS.get(program)
+            start_ns = time.monotonic_ns()
+            tracked = (stepper is not None and stepper.running and scara.mode == "VirtualMode"
+                       and step is not None and step.target is not None)
+            if tracked:
+                goal = np.array([current if value is None else value for current, value in zip(scara.joint_state, step.target)])
+                self.reaching[name] = (start_ns, goal)
+            try:
+                return set_program(program)
+            finally:
+                if not tracked or self.reaching.pop(name, None) is not None:     # 도달하지 못했거나 추적하지 않는 프로그램
+                    self.observe(name, (time.monotonic_ns() - start_ns) / 1e9)
+        scara.set_program = timed_set_program
+        if stepper is not None:
+            stepper.add_hook(on_step)
+
+    def watch_performance(self, performance, names=("CycleTime", "IdleTime")):
+        '''
+            PerformanceRuntime 결과를 감시, Update="Accumulate"는 누적 증가분을 관측값으로 사용
+            timestamp가 바뀌지 않은 결과(WPF reload에서 바뀐 식을 다시 계산한 값)는 새 측정이 아니므로 제외
+        '''
+        previous = {name: performance.evaluators[name].value for name in names if name in performance.evaluators}
+        stamps = {name: performance.evaluators[name].timestamp for name in names if name in performance.evaluators}
+
+        def on_result(name, value, evaluator):
+            if name not in names:
+                return
+            if evaluator.timestamp is not None and evaluator.timestamp == stamps.get(name):
+                return
+            stamps[name] = evaluator.timestamp
+            if evaluator.definition.update == "Accumulate":
+                last, previous[name] = previous.get(name), value
+                if last is not None:
+                    value = value - last
+            self.observe(f"WPF.{name}", value, evaluator.timestamp)
+        performance.subscribe(on_result)
+
+    def stats(self):
+        return {name: {"count": d.count, "mean": d.mean, "std": d.std(), "last": d.last, "active": d.active}
+                for name, d in list(self.detectors.items())}
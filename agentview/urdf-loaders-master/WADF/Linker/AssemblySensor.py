@@ -1,12 +1,17 @@
-from WADF.Linker.DeviceDriverDefinition import ADIO_DRIVER, VDIO_DRIVER
+from WADF.Linker.DeviceDriverDefinition import ADIO_DRIVER, VDIO_DRIVER, ADIO_EVENTS, VDIO_EVENTS
 from WADF.Linker.CommonDecorators import data_store_decorator
+from WADF.Linker.ModeDispatch import compile_mode_table
+from WADF.Linker.LinkerLogger import get_logger
+from WADF.Linker.LinkerScheduler import SCHEDULER
 from Parser.WDFParser import *
-from PySide2.QtCore import QRunnable, QThread, QThreadPool, Signal, QObject, QTimer
+from PySide2.QtCore import QRunnable, QThread, QThreadPool, Signal, QObject
 
 class AssemblySensor():
     def __init__(self, wdf_path):
         self.actual_driver = ADIO_DRIVER
         self.virtual_driver = VDIO_DRIVER
+        self.actual_events = ADIO_EVENTS
+        self.virtual_events = VDIO_EVENTS
         # self.mode = "ActualMode"
         self.mode = "VirtualMode"
         # self.mode = "DigitalTwinMode"
@@ -22,27 +27,72 @@ class AssemblySensor():
         self.linker_name = self.__class__.__name__
         self.data = self.wdf[wdf.workcell_name][self.linker_name]
 
-        self.timer = QTimer()  # QTimer 생성
-        self.timer.timeout.connect(self.get_state)  # QTimer와 get_state 연결
-        self.timer.start(200)
+        self.subscribers = []   # [(callback, edge)] 모드를 바꾸면 새 모드의 퍼블리셔로 다시 구독
+        self.log = get_logger(self.__class__.__name__)
+        self.impl = compile_mode_table(self, self.mode)
+
+        SCHEDULER.register(self.get_state)  # 공유 스케줄러(200 ms)에 get_state 등록
 
     def switch_mode(self, mode):
+        impl = compile_mode_table(self, mode)  # 테이블 전체를 한 번에 교체 (폴링 중에도 안전)
+        self.move_subscribers(self.impl["events"](), impl["events"]())
+        self.impl = impl
         self.mode = mode
-        
+
+    def move_subscribers(self, old, new):
+        '''
+            구독자 목록을 이전 모드의 퍼블리셔에서 새 모드의 퍼블리셔로 옮김
+            새 모드에 퍼블리셔가 없으면(ex. 가상 환경의 ADIO_EVENTS) 목록만 유지하고 다음 모드 전환 때 다시 구독
+        '''
+        if old is new:
+            return
+        for callback, edge in self.subscribers:
+            if old is not None:
+                old.unsubscribe(self.pin[0], callback)
+            if new is not None:
+                new.subscribe(self.pin[0], callback, edge)
+        if new is None and self.subscribers:
+            self.log.warning("no edge publisher in this mode, %d subscribers detached", len(self.subscribers))
+
+    def subscribe(self, callback, edge="Both"):
+        '''
+            센서 핀의 디바운스된 엣지 이벤트 구독 (edge: "Rising" | "Falling" | "Both")
+            callback(event)의 event.timestamp는 드라이버에서 값 변화를 처음 읽은 시각
+        '''
+        events = self.impl["events"]()
+        if events is not None:
+            events.subscribe(self.pin[0], callback, edge)
+        self.subscribers = self.subscribers + [(callback, edge)]
+
+    def unsubscribe(self, callback):
+        self.subscribers = [(cb, edge) for cb, edge in self.subscribers if cb != callback]
+        for events in (self.actual_events, self.virtual_events):
+            if events is not None:
+                events.unsubscribe(self.pin[0], callback)
+
+    def _events_virtual(self):
+        return self.virtual_events
+
+    def _events_actual(self):
+        return self.actual_events
+
+    def _events_digitaltwin(self):
+        return self.actual_events
+
     '''
     '''
     @data_store_decorator
     def get_state(self):
-        if self.mode == "VirtualMode":
-            return self.virtual_driver.Read(pins=self.pin)[0]
-        
-        elif self.mode == "ActualMode":
-            return self.actual_driver.digital_read(pin_number=self.pin[0])
-        
-        elif self.mode == "DigitalTwinMode":
-            virtual_result = self.virtual_driver.Read(pins=self.pin)[0]
-            actual_result = self.actual_driver.digital_read(pin_number=self.pin[0])
-            return actual_result
-                
-        else:
-            print(f"{self.mode} is not defined..!")
+        return self.impl["get_state"]()
+
+    def _get_state_virtual(self):
+        return self.virtual_driver.Read(pins=self.pin)[0]
+
+    def _get_state_actual(self):
+        return self.actual_driver.digital_read(pin_number=self.pin[0])
+
+    def _get_state_digitaltwin(self):
+        virtual_result = self.virtual_driver.Read(pins=self.pin)[0]
+        actual_result = self.actual_driver.digital_read(pin_number=self.pin[0])
+        return actual_result
+
@@ -0,0 +1,224 @@
+"""
+WADF 장비 명령 큐 모듈
+드라이버(ex. NMC2 DIO 보드)마다 하나의 큐와 전송 스레드를 두고 액추에이터 링커의 쓰기 명령을 직렬화
+    - 우선순위(PRIORITY_STOP < PRIORITY_HIGH < PRIORITY_NORMAL < PRIORITY_LOW) 순, 같은 우선순위는 마감 시간이 빠른 순으로 전송
+    - 아직 전송되지 않은 같은 핀의 명령은 마지막 상태 하나로 합침 (우선순위와 마감 시간은 더 급한 쪽을 따름)
+    - 마감 시간(deadline_ms)이 지난 명령은 전송하지 않고 DeadlineExceeded로 완료
+    - call()은 deadline_ms(없으면 CALL_TIMEOUT_MS)까지만 기다리고, 그때까지 전송되지 않은 명령은 취소 후 TimeoutError
+    - 큐 대기 시간과 전송 시간을 히스토그램으로 기록 (metrics())
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from WADF.Linker.LinkerLogger import get_logger
+from WADF.Linker.LinkerProfiler import PROFILER, Histogram
+
+PRIORITY_STOP = 0       # 비상 정지, 인터락 해제 등
+PRIORITY_HIGH = 1
+PRIORITY_NORMAL = 2     # 일반 공정 동작
+PRIORITY_LOW = 3
+
+CALL_TIMEOUT_MS = 3000  # deadline_ms 없이 call()할 때 최대 대기 시간 (드라이버가 응답하지 않아도 GUI 스레드가 멈추지 않도록)
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Command():
+    __slots__ = ("method_name", "key", "args", "priority", "deadline_ns", "queued_ns", "future", "superseded")
+
+    def __init__(self, method_name, key, args, priority, deadline_ns):
+        self.method_name = method_name
+        self.key = key
+        self.args = args
+        self.priority = priority
+        self.deadline_ns = deadline_ns
+        self.queued_ns = time.perf_counter_ns()
+        self.future = Future()
+        self.superseded = False
+
+    def order(self, seq):
+        return (self.priority, self.deadline_ns if self.deadline_ns is not None else float("inf"), seq)
+
+
+def chain_future(source, target):
+    '''
+        합쳐진 명령의 Future를 대신 전송되는 명령의 결과로 완료
+    '''
+    def copy(done):
+        if done.exception() is not None:
+            target.set_exception(done.exception())
+        else:
+            target.set_result(done.result())
+    source.add_done_callback(copy)
+
+
+class DriverCommandQueue():
+    def __init__(self, driver, name=None):
+        self.driver = driver
+        self.name = name or driver.__class__.__name__
+        self.heap = []
+        self.pending = {}           # key -> 대기 중인 Command
+        self.seq = itertools.count()
+        self.cond = threading.Condition()
+        self.thread = None
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.executed = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.queue_wait = Histogram()
+        self.execution = Histogram()
+        self.metrics_lock = threading.Lock()
+        self.log = get_logger(self.__class__.__name__)
+
+    def submit(self, method_name, key, args, priority=PRIORITY_NORMAL, deadline_ms=None):
+        '''
+            key: 합칠 대상 (ex. 핀 번호), None이면 합치지 않음
+            return: concurrent.futures.Future (드라이버 메서드의 반환값)
+        '''
+        deadline_ns = None if deadline_ms is None else time.perf_counter_ns() + int(deadline_ms * 1e6)
+        command = Command(method_name, (method_name, key), args, priority, deadline_ns)
+        with self.cond:
+            self.submitted += 1
+            previous = self.pending.get(command.key) if key is not None else None
+            if previous is not None:
+                previous.superseded = True
+                command.priority = min(command.priority, previous.priority)
+                if previous.deadline_ns is not None:
+                    command.deadline_ns = previous.deadline_ns if deadline_ns is None else min(deadline_ns, previous.deadline_ns)
+                command.queued_ns = previous.queued_ns
+                chain_future(command.future, previous.future)
+                self.coalesced += 1
+            if key is not None:
+                self.pending[command.key] = command
+            heapq.heappush(self.heap, (command.order(next(self.seq)), command))
+            self.max_depth = max(self.max_depth, len(self.pending))
+            self.cond.notify()
+        if self.thread is None:
+            self.start()
+        return command.future
+
+    def call(self, method_name, key, args, priority=PRIORITY_NORMAL, deadline_ms=None):
+        '''
+            deadline_ms(없으면 CALL_TIMEOUT_MS) 안에 완료되지 않으면 TimeoutError
+        '''
+        future = self.submit(method_name, key, args, priority, deadline_ms)
+        timeout_ms = CALL_TIMEOUT_MS if deadline_ms is None else deadline_ms
+        try:
+            return future.result(timeout=timeout_ms / 1000.0)
+        except FutureTimeout:
+            self.withdraw(future)
+            raise TimeoutError(f"{self.name}.{method_name}{args} did not complete in {timeout_ms} ms") from None
+
+    def withdraw(self, future):
+        '''
+            아직 전송되지 않은 명령이면 취소 (이미 드라이버에서 실행 중이면 그대로 둠)
+        '''
+        with self.cond:
+            for _, command in self.heap:
+                if command.future is future and not command.superseded:
+                    command.superseded = True
+                    if self.pending.get(command.key) is command:
+                        del self.pending[command.key]
+                    self.expired += 1
+                    future.set_exception(DeadlineExceeded(f"{self.name}.{command.method_name} withdrawn by caller"))
+                    return True
+        return False
+
+    def start(self):
+        with self.cond:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name=f"CommandQueue-{self.name}", daemon=True)
+                self.thread.start()
+
+    def next_command(self):
+        with self.cond:
+            while True:
+                while not self.heap:
+                    self.cond.wait()
+                command = heapq.heappop(self.heap)[1]
+                if command.superseded:
+                    continue
+                if self.pending.get(command.key) is command:
+                    del self.pending[command.key]
+                return command
+
+    def run(self):
+        while True:
+            command = self.next_command()
+            start_ns = time.perf_counter_ns()
+            with self.metrics_lock:
+                self.queue_wait.record(start_ns - command.queued_ns)
+            if PROFILER.enabled:
+                PROFILER.record("queue", f"{self.name}.{command.method_name}", command.queued_ns, start_ns)
+
+            if command.deadline_ns is not None and start_ns > command.deadline_ns:
+                self.expired += 1
+                self.log.warning("%s%s expired after %.1f ms in queue", command.method_name, command.args,
+                                 (start_ns - command.queued_ns) / 1e6)
+                command.future.set_exception(DeadlineExceeded(f"{self.name}.{command.method_name} deadline exceeded"))
+                continue
+
+            try:
+                result = getattr(self.driver, command.method_name)(*command.args)
+            except Exception as e:
+                self.errors += 1
+                self.log.error("%s.%s failed: %s", self.name, command.method_name, e)
+                command.future.set_exception(e)
+                continue
+            finally:
+                with self.metrics_lock:
+                    self.execution.record(time.perf_counter_ns() - start_ns)
+            self.executed += 1
+            command.future.set_result(result)
+
+    def metrics(self):
+        def summary(histogram):
+            return {
+                "count": histogram.count,
+                "mean": histogram.total_ns / histogram.count / 1e6 if histogram.count else 0.0,
+                "p50": histogram.percentile_ns(50) / 1e6,
+                "p99": histogram.percentile_ns(99) / 1e6,
+                "max": histogram.max_ns / 1e6,
+            }
+        with self.metrics_lock:
+            queue_wait, execution = summary(self.queue_wait), summary(self.execution)
+        return {
+            "driver": self.name,
+            "depth": len(self.pending),
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "expired": self.expired,
+            "executed": self.executed,
+            "errors": self.errors,
+            "queue_wait_ms": queue_wait,
+            "execution_ms": execution,
+        }
+
+
+QUEUES = {}     # id(driver) -> DriverCommandQueue
+QUEUES_LOCK = threading.Lock()
+
+def queue_for(driver, name=None):
+    '''
+        드라이버 인스턴스마다 하나의 큐를 공유 (같은 보드를 쓰는 링커들은 같은 큐를 사용)
+    '''
+    if driver is None:
+        raise ValueError(f"{name or 'driver'} is not defined..!")
+    queue = QUEUES.get(id(driver))
+    if queue is None or queue.driver is not driver:
+        with QUEUES_LOCK:
+            queue = QUEUES.get(id(driver))
+            if queue is None or queue.driver is not driver:
+                queue = QUEUES[id(driver)] = DriverCommandQueue(driver, name)
+    return queue
+
+def queue_metrics():
+    return [queue.metrics() for queue in list(QUEUES.values())]
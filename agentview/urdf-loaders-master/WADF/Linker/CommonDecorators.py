@@ -4,42 +4,56 @@ WADF 공통 데코레이터 모듈
 """
 from functools import wraps
 from datetime import datetime
+import time
+from WADF.Linker.LinkerLogger import get_logger
+from WADF.Linker.LinkerProfiler import PROFILER
 
 def data_store_decorator(func):
     """
     WADF 표준 데이터 저장 데코레이터
     모든 디바이스 드라이버에서 공통으로 사용
+    계측(PROFILER)이 켜져 있으면 링커 메서드별 호출 지연 시간을 기록
     """
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        method_name = func.__name__
-        if method_name.startswith("set"):
-            operation_type = "control"
-            key_name = f"{self.__class__.__name__}_{operation_type}_{method_name[4:]}_arg"
-        elif method_name.startswith("get"):
-            operation_type = "monitoring"
-            key_name = f"{self.__class__.__name__}_{operation_type}_{method_name[4:]}_arg"
-        else:
-            key_name = f"{self.__class__.__name__}_Unknown"
+        if not PROFILER.enabled:
+            return store_data(func, self, args, kwargs)
 
-        # Determine the section
-        section = "Control" if method_name.startswith("set") else "Monitoring"
+        start_ns = time.perf_counter_ns()
+        try:
+            return store_data(func, self, args, kwargs)
+        finally:
+            PROFILER.record("linker", f"{self.__class__.__name__}.{func.__name__}", start_ns, time.perf_counter_ns())
 
-        time_stamp = datetime.now()
-        
-        # Validate key existence
-        if key_name in self.data.get(section, {}):
-            if method_name.startswith("set"):
-                self.data[section][key_name]["Value"] = args[0]
-                self.data[section][key_name]["Timestamp"] = time_stamp
-            elif method_name.startswith("get"):
-                result = func(self, *args, **kwargs)
-                self.data[section][key_name]["Value"] = result
-                self.data[section][key_name]["Timestamp"] = time_stamp
-                return result
-        else:
-            print(f"Key {key_name} not found in {section}. Skipping update.")
+    return wrapper
 
-        return func(self, *args, **kwargs)
+def store_data(func, self, args, kwargs):
+    method_name = func.__name__
+    if method_name.startswith("set"):
+        operation_type = "control"
+        key_name = f"{self.__class__.__name__}_{operation_type}_{method_name[4:]}_arg"
+    elif method_name.startswith("get"):
+        operation_type = "monitoring"
+        key_name = f"{self.__class__.__name__}_{operation_type}_{method_name[4:]}_arg"
+    else:
+        key_name = f"{self.__class__.__name__}_Unknown"
 
-    return wrapper
+    # Determine the section
+    section = "Control" if method_name.startswith("set") else "Monitoring"
+
+    time_stamp = datetime.now()
+    
+    # Validate key existence
+    if key_name in self.data.get(section, {}):
+        if method_name.startswith("set"):
+            self.data[section][key_name]["Value"] = args[0]
+            self.data[section][key_name]["Timestamp"] = time_stamp
+        elif method_name.startswith("get"):
+            result = func(self, *args, **kwargs)
+            self.data[section][key_name]["Value"] = result
+            self.data[section][key_name]["Timestamp"] = time_stamp
+            return result
+    else:
+        get_logger(self.__class__.__name__).warning("Key %s not found in %s. Skipping update.", key_name, section)
+
+    return func(self, *args, **kwargs)
@@ -1,5 +1,9 @@
-from WADF.Linker.DeviceDriverDefinition import ACVY_DEVICE, VCVY_DEVICE
+from WADF.Linker.DeviceDriverDefinition import ACVY_DEVICE, VCVY_DEVICE, VSIM_STEPPER
+from WADF.Linker.ModeDispatch import compile_mode_table
+from WADF.Linker.LinkerLogger import get_logger
+from WADF.Linker.LinkerProfiler import PROFILER
 from Parser.WDFParser import *
+import time
 from PySide2.QtCore import QRunnable, QEventLoop, QThreadPool, Signal, QObject, QTimer
 
 class Conveyor():
@@ -13,37 +17,56 @@ class Conveyor():
         self.pin = []
         '''
         '''
+        self.log = get_logger(self.__class__.__name__)
         self.is_running = False
         self.thread_pool = QThreadPool()
         self.task_done = TaskSignal()
         self.task_done.result_signal.connect(self.update_linker_state)
+        self.impl = compile_mode_table(self, self.mode)
         '''
         '''
-        
+
+    def switch_mode(self, mode):
+        self.impl = compile_mode_table(self, mode)  # 테이블 전체를 한 번에 교체 (폴링 중에도 안전)
+        self.mode = mode
+
     def msleep(self, delay_ms):
         loop = QEventLoop()
         QTimer.singleShot(int(delay_ms), loop.quit)
         loop.exec_()
             
     def update_linker_state(self, result):
-        print(f"result: {result}")
+        self.log.debug("result: %s", result)
         self.is_running = False # Decorator에서 장비 상태 업데이트 수행
             
     def power_on(self):
-        if self.mode == "ActualMode":
-            pass
-        elif self.mode == "VirtualMode":
-            self.virtual_driver.power_on()
-        elif self.mode == "DigitalTwinMode":
-            pass
-            
+        return self.impl["power_on"]()
+
     def power_off(self):
-        if self.mode == "ActualMode":
-            pass
-        elif self.mode == "VirtualMode":
+        return self.impl["power_off"]()
+
+    '''
+        모드별 구현 (switch_mode에서 self.impl로 바인딩)
+    '''
+    def _power_on_actual(self):
+        pass
+
+    def _power_on_virtual(self):
+        with VSIM_STEPPER.physics_lock:     # 컨베이어 링크 속도 변경은 pybullet 호출이므로 스텝과 직렬화
+            self.virtual_driver.power_on()
+
+    def _power_on_digitaltwin(self):
+        pass
+
+    def _power_off_actual(self):
+        pass
+
+    def _power_off_virtual(self):
+        with VSIM_STEPPER.physics_lock:
             self.virtual_driver.power_off()
-        elif self.mode == "DigitalTwinMode":
-            pass
+
+    def _power_off_digitaltwin(self):
+        pass
 
 
 class TaskSignal(QObject):
@@ -59,15 +82,18 @@ class ControlTask(QRunnable):
         self.driver = driver
         self.method_name = method_name
         self.args = args
+        self.queued_ns = time.perf_counter_ns()
 
 
     def run(self):
+        if PROFILER.enabled:
+            PROFILER.record("queue", f"{self.__class__.__name__}.{self.method_name}", self.queued_ns, time.perf_counter_ns())
         if hasattr(self.driver, self.method_name):
             method = getattr(self.driver, self.method_name)
             method(*self.args)
 
         else:
-            print(f"Error: {self.method_name} not found in {self.driver}")
+            get_logger(self.__class__.__name__).error("Error: %s not found in %s", self.method_name, self.driver)
 
 class MonitoringTask(QRunnable):
     def __init__(self, driver, method_name, *args):
@@ -81,4 +107,4 @@ class MonitoringTask(QRunnable):
             method = getattr(self.driver, self.method_name)
             result = method(*self.args)
         else:
-            print(f"Error: {self.method_name} not found in {self.driver}")
\ No newline at end of file
+            get_logger(self.__class__.__name__).error("Error: %s not found in %s", self.method_name, self.driver)
\ No newline at end of file
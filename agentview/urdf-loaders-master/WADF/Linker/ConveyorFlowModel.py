@@ -0,0 +1,249 @@
+"""
+WADF 컨베이어/팔레트 해석 모델 모듈
+물리 엔진 없이 Virtual_Conveyor(linVel, x 방향) 위의 팔레트 위치, 센서 엣지, 스토퍼 블로킹을 닫힌 형태로 계산
+    - 컨베이어가 켜져 있으면 모든 팔레트는 linVel로 이동하고, 올라간 스토퍼 또는 앞 팔레트 뒤에서 정지
+    - 상태가 바뀌는 이벤트(투입, 스토퍼 Write, 전원)마다 현재 위치를 기준점으로 다시 잡으므로 이벤트 사이는 x(t) = min(x0 + v * t, cap)
+    - 센서는 팔레트 구간 [x - L/2, x + L/2]에 센서 위치가 들어오면 1
+inputs(DI: Read)와 outputs(DO: Write) 드라이버, power_on/power_off(Virtual_Conveyor)를 제공하므로
+DeviceDriverDefinition에서 드라이버만 교체하면 링커와 WPF는 그대로 사용
+"""
+import threading
+import time
+
+import numpy as np
+
+'''
+InP3.urdf / INP.wadf 기준 위치 (world x)
+'''
+EMIT_X = -0.65              # WorkpartConfig/Pallet_INP/EmitPos
+REMOVE_X = 0.766            # WorkpartConfig/Pallet_INP/RemovePos
+PALLET_LENGTH = 0.171       # Pallet_INP 진행 방향 길이
+SENSOR_X = {2: -0.6525, 3: -0.251199, 4: 0.5875}    # InP_Sensor_11 / 21 / 31 (PalletIn / Assembly / PalletOut)
+STOPPER_X = {5: -0.22, 6: 0.245}    # PalletBlock_body_11 / 21 (AssemblyBlockActuator / EngravingActuator), Rigid_19 = Rigid_18 + 0.465
+
+class ConveyorFlowModel():
+    def __init__(self, emit_x=EMIT_X, remove_x=REMOVE_X, lin_vel=1.0, pallet_length=PALLET_LENGTH,
+                 sensors=SENSOR_X, stoppers=STOPPER_X, block_state=1, clock=time.monotonic):
+        '''
+            sensors: {DI pin: x}, stoppers: {DO pin: x} (block_state를 Write하면 팔레트를 막음)
+            clock: 현재 시각(초)을 반환하는 함수, None이면 advance_to로만 시간이 진행 (처리량 시뮬레이션)
+        '''
+        self.emit_x = emit_x
+        self.remove_x = remove_x
+        self.lin_vel = lin_vel
+        self.length = pallet_length
+        self.sensor_pins = list(sensors)
+        self.sensor_x = np.array([sensors[pin] for pin in self.sensor_pins], dtype=float)
+        self.stopper_x = dict(stoppers)
+        self.block_state = block_state
+        self.clock = clock
+
+        self.lock = threading.Lock()
+        self.now = 0.0 if clock is None else clock()
+        self.anchor_time = self.now
+        self.power = False
+        self.outputs_state = {}                 # DO pin -> 마지막 Write 값
+        self.ids = np.zeros(0, dtype=int)       # 팔레트 번호 (투입 순서)
+        self.x0 = np.zeros(0)                   # anchor_time 시점 중심 위치
+        self.cap = np.zeros(0)                  # 현재 제약에서 도달 가능한 최대 위치
+        self.next_id = 0
+        self.removed = []                       # (팔레트 번호, 제거 시각)
+
+        self.inputs = FlowInputDriver(self)
+        self.outputs = FlowOutputDriver(self)
+
+    '''
+        시간 / 이벤트
+    '''
+    def time(self):
+        return self.now if self.clock is None else self.clock()
+
+    def advance_to(self, t):
+        with self.lock:
+            self.rebase(t)
+
+    def velocity(self):
+        return self.lin_vel if self.power else 0.0
+
+    def positions(self, t):
+        return np.minimum(self.x0 + self.velocity() * (t - self.anchor_time), self.cap)
+
+    def time_to_reach(self, y):
+        '''
+            각 팔레트 중심이 y에 도달하는 시각 (이미 지났으면 anchor_time, 도달 불가면 inf)
+        '''
+        v = self.velocity()
+        t = np.full(len(self.x0), np.inf)
+        done = self.x0 >= y
+        t[done] = self.anchor_time
+        if v > 0:
+            move = ~done & (self.cap >= y)
+            t[move] = self.anchor_time + (y - self.x0[move]) / v
+        return t
+
+    def rebase(self, t):
+        '''
+            t 시점 위치를 새 기준점으로 잡고, 제거 위치를 지난 팔레트 정리 후 제약(cap) 재계산
+        '''
+        t = max(t, self.anchor_time)
+        exit_time = self.time_to_reach(self.remove_x)
+        gone = exit_time <= t
+        if gone.any():
+            self.removed.extend(zip(self.ids[gone].tolist(), exit_time[gone].tolist()))
+
+        self.x0 = self.positions(t)[~gone]
+        self.ids = self.ids[~gone]
+        self.anchor_time = t
+        self.now = t
+        self.update_caps()
+
+    def update_caps(self):
+        '''
+            cap_i = min(앞쪽에 올라간 첫 스토퍼 - L/2, cap_(i-1) - L)  (x0는 앞 팔레트부터 내림차순)
+        '''
+        half = self.length / 2.0
+        blocks = sorted(x for pin, x in self.stopper_x.items() if self.outputs_state.get(pin) == self.block_state)
+        cap = np.full(len(self.x0), np.inf)
+        ahead = np.inf
+        for i, x in enumerate(self.x0):
+            limit = next((b - half for b in blocks if b - half >= x - 1e-9), np.inf)
+            ahead = min(limit, ahead - self.length)
+            cap[i] = ahead
+        self.cap = cap
+
+    def emit(self, t=None):
+        '''
+            EmitPos에 팔레트 투입 (앞 팔레트와 겹치면 거부하고 None 반환)
+        '''
+        with self.lock:
+            self.rebase(self.time() if t is None else t)
+            if len(self.x0) and self.x0[-1] - self.emit_x < self.length:
+                return None
+            pallet = self.next_id
+            self.next_id += 1
+            self.ids = np.append(self.ids, pallet)
+            self.x0 = np.append(self.x0, self.emit_x)
+            self.update_caps()
+            return pallet
+
+    def power_on(self, t=None):
+        with self.lock:
+            self.rebase(self.time() if t is None else t)
+            self.power = True
+            self.update_caps()
+
+    def power_off(self, t=None):
+        with self.lock:
+            self.rebase(self.time() if t is None else t)
+            self.power = False
+
+    def write(self, pins, states, t=None):
+        with self.lock:
+            self.rebase(self.time() if t is None else t)
+            for pin, state in zip(pins, states):
+                self.outputs_state[pin] = 1 if state else 0
+            self.update_caps()
+
+    '''
+        센서
+    '''
+    def sensor_states(self, t=None):
+        '''
+            {DI pin: 0 | 1}
+        '''
+        with self.lock:
+            t = self.time() if t is None else t
+            x = self.positions(t)[self.time_to_reach(self.remove_x) > t]
+            half = self.length / 2.0
+            occupied = (np.abs(x[None, :] - self.sensor_x[:, None]) <= half).any(axis=1)
+            return {pin: int(state) for pin, state in zip(self.sensor_pins, occupied)}
+
+    def sensor_edges(self, t_from, t_to):
+        '''
+            현재 제약이 유지된다고 가정할 때 (t_from, t_to] 구간의 센서 엣지 [(time, pin, "Rising" | "Falling")]
+            팔레트가 연속으로 붙어 지나가면 하나의 구간으로 합침
+        '''
+        half = self.length / 2.0
+        edges = []
+        with self.lock:
+            removal = self.time_to_reach(self.remove_x)
+            for pin, xs in zip(self.sensor_pins, self.sensor_x):
+                enter = self.time_to_reach(xs - half)
+                leave = np.minimum(self.time_to_reach(xs + half + 1e-9), removal)
+                intervals = sorted((a, b) for a, b in zip(enter, leave) if a < b and a != np.inf)
+                merged = []
+                for a, b in intervals:
+                    if merged and a <= merged[-1][1]:
+                        merged[-1][1] = max(merged[-1][1], b)
+                    else:
+                        merged.append([a, b])
+                for a, b in merged:
+                    if t_from < a <= t_to:
+                        edges.append((float(a), pin, "Rising"))
+                    if t_from < b <= t_to:
+                        edges.append((float(b), pin, "Falling"))
+        edges.sort()
+        return edges
+
+    '''
+        처리량 시뮬레이션 (clock=None)
+    '''
+    def simulate(self, emit_times, output_events=(), until=None):
+        '''
+            emit_times: 팔레트 투입 시각 목록, output_events: [(time, pin, state)] 스토퍼 Write 목록
+            return: {"edges": [(time, pin, edge)], "exits": [(pallet, time)], "rejected": 투입 실패 수}
+        '''
+        events = [(t, 0, None, None) for t in emit_times] + [(t, 1, pin, state) for t, pin, state in output_events]
+        events.sort(key=lambda event: (event[0], event[1]))
+        until = max([event[0] for event in events] + [self.now]) if until is None else until
+
+        edges = []
+        rejected = 0
+        last = self.now
+        self.power_on(last)
+        for t, kind, pin, state in events:
+            if t > until:
+                break
+            edges.extend(self.sensor_edges(last, t))
+            before = self.sensor_states(t)
+            if kind == 0:
+                rejected += self.emit(t) is None
+            else:
+                self.write([pin], [state], t)
+            for sensor, value in self.sensor_states(t).items():
+                if value != before[sensor]:
+                    edges.append((float(t), sensor, "Rising" if value else "Falling"))   # 투입 위치의 센서 등 이벤트 시점 엣지
+            last = t
+        edges.extend(self.sensor_edges(last, until))
+        self.advance_to(until)
+        edges.sort()
+        return {"edges": edges, "exits": list(self.removed), "rejected": rejected}
+
+
+class FlowInputDriver():
+    '''
+        DI 드라이버 인터페이스 (VDIO_DRIVER 대체)
+    '''
+    def __init__(self, model):
+        self.model = model
+
+    def Read(self, pins):
+        states = self.model.sensor_states()
+        return [states.get(pin, 0) for pin in pins]
+
+    def Write(self, pins, states):
+        pass
+
+
+class FlowOutputDriver():
+    '''
+        DO 드라이버 인터페이스 (VDIO_DRIVER2 대체), 스토퍼가 아닌 핀은 값만 기록
+    '''
+    def __init__(self, model):
+        self.model = model
+
+    def Read(self, pins):
+        return [self.model.outputs_state.get(pin, 0) for pin in pins]
+
+    def Write(self, pins, states):
+        self.model.write(pins, states)
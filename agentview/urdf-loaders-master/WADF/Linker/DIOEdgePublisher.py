@@ -0,0 +1,108 @@
+"""
+WADF DIO 엣지 이벤트 모듈
+DIO 드라이버의 입력 핀을 짧은 주기로 읽어 디바운스된 Rising/Falling 엣지를
+드라이버 측 타임스탬프와 함께 등록된 구독자에게 전달
+WPF/DSF/UI 소비자가 200 ms 폴링을 기다리지 않고 바로 반응할 수 있도록 함
+"""
+import time
+from datetime import datetime
+from PySide2.QtCore import QTimer
+from WADF.Linker.LinkerLogger import get_logger
+
+RISING = "Rising"
+FALLING = "Falling"
+BOTH = "Both"
+
+class EdgeEvent():
+    __slots__ = ("pin", "edge", "state", "timestamp", "monotonic_ns")
+
+    def __init__(self, pin, edge, state, timestamp, monotonic_ns):
+        self.pin = pin
+        self.edge = edge                # "Rising" | "Falling"
+        self.state = state
+        self.timestamp = timestamp      # datetime (값이 처음 바뀐 것을 드라이버에서 읽은 시각)
+        self.monotonic_ns = monotonic_ns
+
+    def __repr__(self):
+        return f"EdgeEvent(pin={self.pin}, edge={self.edge}, state={self.state}, timestamp={self.timestamp})"
+
+
+class DIOEdgePublisher():
+    def __init__(self, driver, period_ms=10, debounce_ms=None, default_debounce_ms=0.0):
+        '''
+            driver: Read(pins=[...])를 제공하는 DIO 드라이버
+            debounce_ms: {pin: ms} 핀별 디바운스 시간 (값이 이 시간 이상 유지되어야 엣지로 인정)
+        '''
+        self.driver = driver
+        self.period_ms = period_ms
+        self.default_debounce_ns = int(default_debounce_ms * 1e6)
+        self.debounce_ns = {pin: int(ms * 1e6) for pin, ms in (debounce_ms or {}).items()}
+
+        self.subscribers = {}   # pin -> [(callback, edge)]
+        self.stable = {}        # pin -> 디바운스된 현재 상태
+        self.candidate = {}     # pin -> (새 상태, 처음 읽은 monotonic_ns, 처음 읽은 datetime)
+        self.timer = None
+        self.log = get_logger(self.__class__.__name__)
+
+    def set_debounce(self, pin, debounce_ms):
+        self.debounce_ns[pin] = int(debounce_ms * 1e6)
+
+    def subscribe(self, pin, callback, edge=BOTH):
+        '''
+            callback(event: EdgeEvent)은 폴링 스레드(QTimer: GUI 스레드)에서 호출됨
+        '''
+        if edge not in (RISING, FALLING, BOTH):
+            raise ValueError(f"{edge} is not defined..!")
+        self.subscribers[pin] = self.subscribers.get(pin, []) + [(callback, edge)]
+
+        if self.timer is None and self.period_ms:
+            self.timer = QTimer()
+            self.timer.timeout.connect(self.poll)
+            self.timer.start(self.period_ms)
+
+    def unsubscribe(self, pin, callback):
+        self.subscribers[pin] = [(cb, edge) for cb, edge in self.subscribers.get(pin, []) if cb != callback]
+
+    def poll(self):
+        pins = list(self.subscribers)
+        if not pins:
+            return
+        states = self.driver.Read(pins=pins)
+        self.feed(pins, states, time.monotonic_ns(), datetime.now())
+
+    def feed(self, pins, states, monotonic_ns=None, timestamp=None):
+        '''
+            드라이버에서 읽은 값을 전달 (poll 외에 시뮬레이션 스텝 등에서 직접 호출 가능)
+        '''
+        if monotonic_ns is None:
+            monotonic_ns = time.monotonic_ns()
+        if timestamp is None:
+            timestamp = datetime.now()
+
+        for pin, state in zip(pins, states):
+            state = bool(state)
+            stable = self.stable.get(pin)
+            if stable is None:
+                self.stable[pin] = state
+                continue
+
+            if state == stable:
+                self.candidate.pop(pin, None)
+                continue
+
+            candidate = self.candidate.get(pin)
+            if candidate is None or candidate[0] != state:
+                candidate = self.candidate[pin] = (state, monotonic_ns, timestamp)
+
+            if monotonic_ns - candidate[1] >= self.debounce_ns.get(pin, self.default_debounce_ns):
+                self.stable[pin] = state
+                del self.candidate[pin]
+                self.publish(EdgeEvent(pin, RISING if state else FALLING, state, candidate[2], candidate[1]))
+
+    def publish(self, event):
+        for callback, edge in self.subscribers.get(event.pin, []):
+            if edge == BOTH or edge == event.edge:
+                try:
+                    callback(event)
+                except Exception as e:
+                    self.log.error("pin %s subscriber %s failed: %s", event.pin, callback, e)
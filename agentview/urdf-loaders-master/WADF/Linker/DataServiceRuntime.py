@@ -0,0 +1,128 @@
+"""
+WADF DSF 런타임 모듈
+DSF 파일(ex. DSF/BML.dsf)의 Service를 ServiceReference에 따라 호출 가능한 핸들러로 컴파일
+    - WDF/<링커>/<Section>/<key>: 링커 데이터 저장소 값 (Request)
+    - Linker/<링커>/<메서드>: 링커 메서드 호출 (Request/Command, InputArgument 순서대로 인자 전달)
+    - WPF/<Performance>[/<Measure>]: PerformanceRuntime 결과 또는 측정값 (Request)
+    - Alarm/<그룹>: 현재 발생 중인 알람 목록 (Request), publish()로 발생/해제를 구독자에게 전달 (Event)
+reload()는 바뀐 Service의 핸들러만 다시 컴파일
+"""
+import time
+import xml.etree.ElementTree as ET
+
+from WADF.Linker.LinkerLogger import get_logger
+
+ARGUMENT_TYPES = {"Boolean": lambda value: value if isinstance(value, bool) else str(value).lower() in ("1", "true"),
+                  "Int": int, "Integer": int, "Float": float, "Double": float, "String": str}
+
+class ServiceDefinition():
+    def __init__(self, element):
+        self.name = element.get("ServiceName")
+        self.message_type = (element.findtext("MessageType") or "Request").strip()
+        self.reference = (element.findtext("ServiceReference") or "").strip()
+        self.arguments = [argument.get("DataType") for argument in element.findall("InputArgument")]
+
+    def signature(self):
+        return (self.message_type, self.reference, tuple(self.arguments))
+
+
+def parse_dsf(dsf_path):
+    '''
+        return: {ServiceName: ServiceDefinition}
+    '''
+    root = ET.parse(dsf_path).getroot()
+    return {definition.name: definition for definition in map(ServiceDefinition, root.iter("Service"))}
+
+
+class DataServiceRuntime():
+    def __init__(self, dsf_path, linkers, performance=None):
+        '''
+            linkers: {링커 이름: 링커}, performance: PerformanceRuntime
+        '''
+        self.path = dsf_path
+        self.linkers = linkers
+        self.performance = performance
+        self.definitions = {}
+        self.handlers = {}          # ServiceName -> callable(*args)
+        self.subscribers = {}       # ServiceName -> [callback(service_name, payload)]
+        self.active = {}            # ServiceName -> {signal: 발생 중인 알람}
+        self.log = get_logger(self.__class__.__name__)
+        self.apply(parse_dsf(dsf_path))
+
+    def compile(self, definition):
+        source, _, path = definition.reference.partition("/")
+        parts = path.split("/")
+        casts = [ARGUMENT_TYPES.get(data_type, lambda value: value) for data_type in definition.arguments]
+
+        if source == "WDF" and len(parts) == 3:
+            linker_name, section, key = parts
+            def handler():
+                entry = self.linkers[linker_name].data[section][key]
+                return entry["Value"]
+        elif source == "Linker" and len(parts) == 2:
+            linker_name, method_name = parts
+            def handler(*args):
+                if len(args) != len(casts):
+                    raise TypeError(f"{definition.name} takes {len(casts)} arguments ({len(args)} given)")
+                return getattr(self.linkers[linker_name], method_name)(*[cast(arg) for cast, arg in zip(casts, args)])
+        elif source == "WPF" and len(parts) in (1, 2):
+            def handler():
+                if self.performance is None:
+                    raise LookupError(f"{definition.name}: WPF runtime is not attached")
+                return self.performance.value(*parts)
+        elif source == "Alarm" and len(parts) == 1:
+            def handler():
+                return list(self.active.get(definition.name, {}).values())
+        else:
+            raise ValueError(f"{definition.name}: unsupported ServiceReference {definition.reference}")
+        return handler
+
+    def reload(self, dsf_path=None):
+        start = time.perf_counter()
+        self.path = dsf_path or self.path
+        diff = self.apply(parse_dsf(self.path))
+        diff["ms"] = (time.perf_counter() - start) * 1000.0
+        self.log.info("%s reloaded in %.3f ms: %s", self.path, diff["ms"],
+                      {key: value for key, value in diff.items() if key != "ms" and value})
+        return diff
+
+    def apply(self, definitions):
+        '''
+            컴파일에 실패한 Service가 있으면 ValueError, 기존 핸들러는 그대로 유지
+        '''
+        diff = {"added": [], "changed": [], "removed": []}
+        handlers = {}
+        for name, definition in definitions.items():
+            current = self.definitions.get(name)
+            if current is not None and current.signature() == definition.signature():
+                handlers[name] = self.handlers[name]
+                continue
+            handlers[name] = self.compile(definition)
+            diff["changed" if current is not None else "added"].append(name)
+        diff["removed"] = [name for name in self.definitions if name not in definitions]
+        self.definitions, self.handlers = definitions, handlers
+        return diff
+
+    def subscribe(self, service_name, callback):
+        self.subscribers[service_name] = self.subscribers.get(service_name, []) + [callback]
+
+    def publish(self, service_name, payload):
+        '''
+            Event 서비스로 payload 전달, 알람(payload["state"]: "raised" | "cleared")은 발생 중인 목록도 갱신
+        '''
+        if service_name not in self.handlers:
+            raise KeyError(f"{service_name} is not defined..!")
+        if "signal" in payload:
+            active = self.active.setdefault(service_name, {})
+            if payload.get("state") == "cleared":
+                active.pop(payload["signal"], None)
+            else:
+                active[payload["signal"]] = payload
+        for callback in self.subscribers.get(service_name, ()):
+            callback(service_name, payload)
+
+    def request(self, service_name, *args):
+        handler = self.handlers.get(service_name)
+        if handler is None:
+            raise KeyError(f"{service_name} is not defined..!")
+        return handler(*args)
@@ -0,0 +1,88 @@
+"""
+WADF 디스크립터 변경 감시 모듈
+WPF/DSF/WUIF 파일의 수정 시각을 주기적으로 확인하여 바뀐 파일의 reload 콜백만 호출
+프로세스와 드라이버(DeviceDriverDefinition)는 그대로 두고 해당 런타임만 갱신하므로 누적 상태가 유지됨
+    - 콜백은 QTimer(GUI 스레드)에서 호출되므로 SCHEDULER 폴링과 같은 스레드에서 교체됨
+    - 파싱/컴파일 오류가 나면 기존 모델을 유지하고 오류만 기록 (다음 저장 시 다시 시도)
+"""
+import os
+import time
+import xml.etree.ElementTree as ET
+
+from PySide2.QtCore import QTimer
+from WADF.Linker.LinkerLogger import get_logger
+
+class DescriptorWatcher():
+    def __init__(self, period_ms=500):
+        self.period_ms = period_ms
+        self.watches = {}           # path -> [callback(path)]
+        self.stamps = {}            # path -> (mtime_ns, size)
+        self.timer = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload_ms = {}    # path -> 마지막 reload 소요 시간(ms)
+        self.log = get_logger(self.__class__.__name__)
+
+    def watch(self, path, callback):
+        '''
+            callback(path): 파일이 바뀌었을 때 호출
+        '''
+        path = os.path.abspath(path)
+        self.watches[path] = self.watches.get(path, []) + [callback]
+        self.stamps[path] = self.stamp(path)
+        if self.timer is None and self.period_ms:
+            self.timer = QTimer()
+            self.timer.timeout.connect(self.poll)
+            self.timer.start(self.period_ms)
+
+    def stop(self):
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer = None
+
+    def stamp(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self):
+        for path, callbacks in list(self.watches.items()):
+            stamp = self.stamp(path)
+            if stamp is None or stamp == self.stamps.get(path):
+                continue
+            self.stamps[path] = stamp
+            start = time.perf_counter()
+            for callback in callbacks:
+                try:
+                    callback(path)
+                except Exception as e:     # QTimer 슬롯 밖으로 나가지 않도록 모든 reload 오류에서 기존 모델 유지
+                    self.failures += 1
+                    self.log.error("%s reload failed, keeping live model: %s: %s", path, e.__class__.__name__, e)
+                    break
+            else:
+                self.reloads += 1
+            self.last_reload_ms[path] = (time.perf_counter() - start) * 1000.0
+
+
+def watch_wadf(watcher, wadf_path, performance=None, services=None, wuif=None, base_dir="."):
+    '''
+        WADF 파일의 WPF/DSF FilePath와 WorkcellUIF/MonitoringView를 각 런타임의 reload에 연결
+        wuif: WUIFRuntime (MonitoringView name으로 바인딩된 뷰만 연결)
+    '''
+    root = ET.parse(wadf_path).getroot()
+    def resolve(path):
+        return os.path.join(base_dir, path.strip().replace("\\", os.sep))
+
+    wpf_path = root.findtext("WPF/FilePath")
+    if performance is not None and wpf_path:
+        watcher.watch(resolve(wpf_path), performance.reload)
+    dsf_path = root.findtext("DSF/FilePath")
+    if services is not None and dsf_path:
+        watcher.watch(resolve(dsf_path), services.reload)
+    if wuif is not None:
+        for view in root.iter("MonitoringView"):
+            name = view.get("name")
+            if name in wuif.sources:
+                watcher.watch(resolve(view.findtext("FilePath")), lambda path, name=name: wuif.reload(name))
@@ -9,6 +9,11 @@ from Device.Virtual_SCARARobot          import Virtual_SCARARobot
 '''
 from Driver.VirtualDriver.Virtual_DIODriver         import Virtual_DIODriver
 from Driver.VirtualDriver.Virtual_SCARARobotDriver  import Virtual_SCARARobotDriver
+from WADF.Linker.LinkerProfiler                     import instrument_driver
+from WADF.Linker.DIOEdgePublisher                   import DIOEdgePublisher
+from WADF.Linker.VirtualBatchDriver                 import Virtual_BatchedProximityDriver, Virtual_PneumaticActuatorArrayDriver
+from WADF.Linker.SimulationStepper                  import SimulationStepper
+from WADF.Linker.ConveyorFlowModel                  import ConveyorFlowModel
 '''
 Real Device & Driver Library (주석 처리됨 - 실제 장비 연결 시 활성화)
 실제 장비 사용 시 아래 주석을 해제하고 해당 드라이버를 설치하세요
@@ -21,67 +26,85 @@ Real Device & Driver Library (주석 처리됨 - 실제 장비 연결 시 활성
 # from Driver.ActualDriver.OSESRFIDDriver import *
 # from Driver.ActualDriver.RPQRReaderDriver import *
 # from Driver.ActualDriver.RSSeries import *
+#
+# 연결 풀/파이프라이닝 전송 계층 (장비 대신 로컬 시뮬레이터: python -m WADF.Linker.DeviceSimulator)
+# from WADF.Linker.DeviceTransport import TransportDIODriver, TransportSCARARobotDriver
+# ADIO_DRIVER = instrument_driver(TransportDIODriver(ip="127.0.0.1", port=2000), "ADIO_DRIVER")
+# ADIO_DRIVER2 = instrument_driver(TransportDIODriver(ip="127.0.0.1", port=1000), "ADIO_DRIVER2")
+# ASCR_DRIVER = instrument_driver(TransportSCARARobotDriver(host="127.0.0.1", port=5000), "ASCR_DRIVER")
 
 '''
-Virtual Proximity Sensor Administration
+Conveyor Flow Model Selection
+"Physics": pybullet 물리 엔진으로 팔레트/센서/액추에이터 계산
+"Analytic": 물리 엔진 없이 ConveyorFlowModel로 팔레트 위치, 센서 엣지, 스토퍼 블로킹을 해석적으로 계산 (처리량 검토용)
 '''
-DI_DEVICES = []
-DO_DEVICES = []
-
-DI_PINS = []
-DO_PINS = []
+VCVY_MODEL = "Physics"
+VCVY_FLOW = ConveyorFlowModel(lin_vel=1.0) if VCVY_MODEL == "Analytic" else None
 
-DI_PINS.append(2)
-DI_DEVICES.append(Virtual_ProximitySensor(robotId=1, linkId=14, direction='y', rayMaxLen=0.1)) # 근접 In
-
-DI_PINS.append(3) 
-DI_DEVICES.append(Virtual_ProximitySensor(robotId=1, linkId=16, direction='y', rayMaxLen=0.1)) # 근접 Out
+'''
+Virtual Proximity Sensor Administration
+물리 스텝마다 모든 근접 센서 레이를 한 번에 계산 (Virtual_BatchedProximityDriver)
+라이트 커튼은 add_sensor(..., count=레이 수, spacing=간격, spread='z') 로 추가
+'''
+VDIO_PROXIMITY = Virtual_BatchedProximityDriver(max_age_ms=20.0)
 
-DI_PINS.append(4) 
-DI_DEVICES.append(Virtual_ProximitySensor(robotId=1, linkId=15, direction='y', rayMaxLen=0.1)) # 근접 Out
+VDIO_PROXIMITY.add_sensor(pin=2, robotId=1, linkId=14, direction='y', rayMaxLen=0.1) # 근접 In
+VDIO_PROXIMITY.add_sensor(pin=3, robotId=1, linkId=16, direction='y', rayMaxLen=0.1) # 근접 Out
+VDIO_PROXIMITY.add_sensor(pin=4, robotId=1, linkId=15, direction='y', rayMaxLen=0.1) # 근접 Out
 
-# 실제 장비 연결 시: ADIO_DRIVER = NMC2DIODriver(ip="192.168.0.12", port=2000)
+# 실제 장비 연결 시: ADIO_DRIVER = instrument_driver(NMC2DIODriver(ip="192.168.0.12", port=2000), "ADIO_DRIVER")
 ADIO_DRIVER = None  # 가상 모드용
-VDIO_DRIVER = Virtual_DIODriver(DI_devices=DI_DEVICES, DI_pins=DI_PINS, DO_devices=DO_DEVICES, DO_pins=DO_PINS, period_ms=500)
+VDIO_DRIVER = instrument_driver(VDIO_PROXIMITY if VCVY_FLOW is None else VCVY_FLOW.inputs, "VDIO_DRIVER")
+
+# 입력 핀 엣지 이벤트 (10 ms 주기로 읽고 핀별 디바운스 적용)
+# 실제 장비 연결 시: ADIO_EVENTS = DIOEdgePublisher(ADIO_DRIVER, period_ms=10, debounce_ms={2: 5, 3: 5, 4: 5})
+ADIO_EVENTS = None  # 가상 모드용
+VDIO_EVENTS = DIOEdgePublisher(VDIO_DRIVER, period_ms=10, debounce_ms={2: 5, 3: 5, 4: 5})
 
 '''
 Virutal Pneumatic Actuator Administration
+Write는 목표만 기록하고 물리 스텝마다 바디별로 한 번의 setJointMotorControlArray로 전달
+lateralFriction, mass 등 동역학 파라미터는 첫 전달 시 한 번만 적용
 '''
+VDIO_ACTUATOR = Virtual_PneumaticActuatorArrayDriver()
 
-DI_DEVICES = []
-DO_DEVICES = []
-
-DI_PINS = []
-DO_PINS = []
+VDIO_ACTUATOR.add_actuator(pin=5, robotId=1, jointId=20, oriPos=0.0, tarPos=0.16, tarVel=0.8, tarForce=5000, lateralFriction=5.0) # 공압 In
+VDIO_ACTUATOR.add_actuator(pin=6, robotId=1, jointId=22, oriPos=0.0, tarPos=0.16, tarVel=0.8, tarForce=5000, mass=0.1, lateralFriction=0.8) # 공압 Out
+VDIO_ACTUATOR.add_actuator(pin=4, robotId=1, jointId=25, oriPos=0.0, tarPos=-0.08, tarVel=10.0, tarForce=5000) # 파트 그리퍼 L
+VDIO_ACTUATOR.add_actuator(pin=3, robotId=1, jointId=27, oriPos=0.0, tarPos=-0.08, tarVel=10.0, tarForce=5000) # 파트 그리퍼 R
 
-DO_PINS.append(5)
-DO_DEVICES.append(Virtual_PneumaticActuator(robotId=1, jointId=20, oriPos=0.0, tarPos=0.16, tarVel=0.8, tarForce=5000, lateralFriction=5.0)) # 공압 In
-
-DO_PINS.append(6)
-DO_DEVICES.append(Virtual_PneumaticActuator(robotId=1, jointId=22, oriPos=0.0, tarPos=0.16, tarVel=0.8, tarForce=5000, mass=0.1, lateralFriction=0.8)) # 공압 Out
-
-DO_PINS.append(4)
-DO_DEVICES.append(Virtual_PneumaticActuator(robotId=1, jointId=25, oriPos=0.0, tarPos=-0.08, tarVel=10.0, tarForce=5000)) # 파트 그리퍼 L
-
-DO_PINS.append(3)
-DO_DEVICES.append(Virtual_PneumaticActuator(robotId=1, jointId=27, oriPos=0.0, tarPos=-0.08, tarVel=10.0, tarForce=5000)) # 파트 그리퍼 R
+# 핀별 URDF 관절 이름 (JointStreamFeed로 브라우저 뷰어에 스트리밍할 때 사용)
+VDIO_ACTUATOR_JOINTS = {5: "Slider_17", 6: "Slider_20", 4: "Slider_25", 3: "Slider_26"}
 
 '''
 Virtual DIO Driver Administration
 '''
-# 실제 장비 연결 시: ADIO_DRIVER2 = NMC2DIODriver(ip="192.168.0.11", port=1000)
+# 실제 장비 연결 시: ADIO_DRIVER2 = instrument_driver(NMC2DIODriver(ip="192.168.0.11", port=1000), "ADIO_DRIVER2")
 ADIO_DRIVER2 = None  # 가상 모드용
-VDIO_DRIVER2 = Virtual_DIODriver(DI_devices=DI_DEVICES, DI_pins=DI_PINS, DO_devices=DO_DEVICES, DO_pins=DO_PINS, period_ms=500)
+VDIO_DRIVER2 = instrument_driver(VDIO_ACTUATOR if VCVY_FLOW is None else VCVY_FLOW.outputs, "VDIO_DRIVER2")
 
 '''
 '''
 ACVY_DEVICE = None
-VCVY_DEVICE = Virtual_Conveyor(robotId=1, linkId=0, linVel=1.0, direction='x')
+VCVY_DEVICE = Virtual_Conveyor(robotId=1, linkId=0, linVel=1.0, direction='x') if VCVY_FLOW is None else VCVY_FLOW
 
 '''
 '''
-VSCR_DEVICE = Virtual_SCARARobot(robotId=1, jointId=[6, 7, 9, 8, 10, 12])
+VSCR_ROBOT_ID = 1
+VSCR_JOINT_IDS = [6, 7, 9, 8, 10, 12]
+VSCR_DEVICE = Virtual_SCARARobot(robotId=VSCR_ROBOT_ID, jointId=VSCR_JOINT_IDS)
 
-# 실제 장비 연결 시: ASCR_DRIVER = SR3iA(host="192.168.0.123", password="ADMIN")
+# 실제 장비 연결 시: ASCR_DRIVER = instrument_driver(SR3iA(host="192.168.0.123", password="ADMIN"), "ASCR_DRIVER")
 ASCR_DRIVER = None  # 가상 모드용
-VSCR_DRIVER = Virtual_SCARARobotDriver(scaraRobot=VSCR_DEVICE)
\ No newline at end of file
+VSCR_DRIVER = instrument_driver(Virtual_SCARARobotDriver(scaraRobot=VSCR_DEVICE), "VSCR_DRIVER")
+
+'''
+Virtual Simulation Stepper Administration
+Qt 이벤트 루프와 분리된 스레드에서 WorkcellConfig/UpdateTimeMS(20 ms) 주기로 물리 스텝 수행
+물리 엔진 연결(URDF 로드) 이후 VSIM_STEPPER.start() 호출, 상태는 VSIM_STEPPER.stats()로 확인
+'''
+VSIM_STEPPER = SimulationStepper(period_ms=20.0, substeps=4, max_catchup=4)
+
+VSIM_STEPPER.add_hook(VDIO_ACTUATOR.on_step)    # 공압 목표값 일괄 전달
+VSIM_STEPPER.add_hook(VDIO_PROXIMITY.on_step)   # 근접 센서 레이 일괄 계산
+VSIM_STEPPER.track_joints(robotId=VSCR_ROBOT_ID, jointIds=VSCR_JOINT_IDS)    # SCARA 관절 상태 스냅샷
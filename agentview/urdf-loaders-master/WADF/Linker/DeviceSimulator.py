@@ -0,0 +1,128 @@
+"""
+WADF 실제 장비 시뮬레이터 모듈
+DeviceTransport 프로토콜을 따르는 로컬 TCP 서버로 DIO 보드(NMC2)와 SCARA 컨트롤러(SR3iA)를 흉내냄
+ActualMode / DigitalTwinMode를 장비 없이 개발 PC에서 부하 테스트할 때 사용
+
+사용법 (urdf-loaders-master 디렉토리에서 실행)
+    python -m WADF.Linker.DeviceSimulator --dio-port 2000 --dio-port 1000 --scara-port 5000 --latency-ms 2
+DeviceDriverDefinition에서 ADIO_DRIVER = TransportDIODriver(ip="127.0.0.1", port=2000) 처럼 연결
+"""
+import argparse
+import asyncio
+import random
+
+from WADF.Linker.LinkerLogger import get_logger
+
+class DIOState():
+    def __init__(self, pin_count=32):
+        self.pins = [0] * pin_count
+
+    def handle(self, command, args):
+        if command == "READ":
+            return [self.pins[int(pin)] for pin in args]
+        if command == "WRITE":
+            for pin, state in zip(args[0::2], args[1::2]):
+                self.pins[int(pin)] = 1 if int(state) else 0
+            return []
+        raise ValueError(f"{command} is not defined..!")
+
+
+class SCARAState():
+    def __init__(self, program_ms=0.0):
+        self.power = 0
+        self.joints = [0.0] * 6
+        self.program_ms = program_ms
+
+    def handle(self, command, args):
+        if command == "CONNECT":
+            return []
+        if command == "POWER":
+            self.power = int(args[0])
+            return []
+        if command == "MOVE":
+            if not self.power:
+                raise ValueError("servo power is off")
+            for i, value in enumerate(args[:6]):
+                if value != "-":
+                    self.joints[i] = float(value)
+            return []
+        if command == "PROGRAM":
+            return []
+        if command == "POS":
+            return self.joints
+        raise ValueError(f"{command} is not defined..!")
+
+
+class DeviceSimulator():
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, program_ms=0.0):
+        '''
+            latency_ms / jitter_ms: 요청마다 적용할 응답 지연 (요청별로 독립 적용되므로 파이프라이닝 시 응답 순서가 바뀔 수 있음)
+        '''
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.program_ms = program_ms
+        self.servers = []
+        self.log = get_logger(self.__class__.__name__)
+
+    async def serve(self, state, host, port):
+        async def on_client(reader, writer):
+            peer = writer.get_extra_info("peername")
+            self.log.info("%s:%d client connected: %s", host, port, peer)
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    asyncio.ensure_future(self.respond(state, line.decode("utf-8").split(), writer))
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(on_client, host, port)
+        self.servers.append(server)
+        self.log.info("listening on %s:%d (%s)", host, port, state.__class__.__name__)
+        return server
+
+    async def respond(self, state, words, writer):
+        if not words:
+            return
+        request_id, command, args = words[0], words[1] if len(words) > 1 else "", words[2:]
+        delay_ms = self.latency_ms + random.uniform(0.0, self.jitter_ms)
+        if command == "PROGRAM":
+            delay_ms += self.program_ms
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000.0)
+        try:
+            values = state.handle(command, args)
+            response = " ".join([request_id, "OK"] + [str(v) for v in values])
+        except (ValueError, IndexError) as e:
+            response = f"{request_id} ERR {e}"
+        if not writer.is_closing():
+            writer.write((response + "\n").encode("utf-8"))
+
+    async def run(self, host, dio_ports, scara_ports):
+        for port in dio_ports:
+            await self.serve(DIOState(), host, port)
+        for port in scara_ports:
+            await self.serve(SCARAState(self.program_ms), host, port)
+        await asyncio.gather(*(server.serve_forever() for server in self.servers))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WADF device simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--dio-port", type=int, action="append", default=[], help="DIO 보드 포트 (여러 번 지정 가능)")
+    parser.add_argument("--scara-port", type=int, action="append", default=[], help="SCARA 컨트롤러 포트 (여러 번 지정 가능)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="요청별 응답 지연")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="응답 지연에 더할 최대 무작위 값")
+    parser.add_argument("--program-ms", type=float, default=0.0, help="PROGRAM 실행 시간")
+    args = parser.parse_args(argv)
+
+    simulator = DeviceSimulator(args.latency_ms, args.jitter_ms, args.program_ms)
+    try:
+        asyncio.run(simulator.run(args.host, args.dio_port or [2000, 1000], args.scara_port or [5000]))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
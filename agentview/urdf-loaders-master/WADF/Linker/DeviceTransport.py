@@ -0,0 +1,279 @@
+"""
+WADF 실제 장비 전송 계층 모듈
+장비별로 유지되는 TCP 연결 풀 위에서 요청을 파이프라이닝 (응답을 기다리지 않고 연속 전송, 요청 번호로 응답 매칭)
+연결이 끊기면 대기 중인 요청을 실패 처리하고 지수 백오프로 재연결, 장비별 왕복 시간(RTT) 히스토그램 기록
+
+프로토콜 (줄 단위 텍스트, DeviceSimulator와 동일)
+    요청: "<id> <COMMAND> <arg> ...\\n"
+    응답: "<id> OK <value> ...\\n" | "<id> ERR <message>\\n"
+    DIO: READ <pin> ... -> OK <state> ... / WRITE <pin> <state> ... -> OK
+    SCARA: CONNECT / POWER <0|1> / MOVE <theta1> <theta2> <theta3> <d1> <d2> <d3> ("-"는 현재값 유지) / PROGRAM <name> / POS
+"""
+import itertools
+import random
+import socket
+import threading
+import time
+from concurrent.futures import Future
+
+from WADF.Linker.LinkerLogger import get_logger
+from WADF.Linker.LinkerProfiler import PROFILER, Histogram
+
+class DeviceError(Exception):
+    '''
+        장비가 ERR로 응답한 경우
+    '''
+    pass
+
+
+class DeviceConnection():
+    def __init__(self, transport, index):
+        self.transport = transport
+        self.index = index
+        self.sock = None
+        self.send_lock = threading.Lock()
+        self.pending = {}           # request id -> (Future, start_ns)
+        self.reader = None
+
+    @property
+    def connected(self):
+        return self.sock is not None
+
+    def open(self):
+        sock = socket.create_connection((self.transport.host, self.transport.port), timeout=self.transport.connect_timeout_s)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(None)
+        self.sock = sock
+        self.reader = threading.Thread(target=self.read_loop, args=(sock,), name=f"{self.transport.name}-{self.index}", daemon=True)
+        self.reader.start()
+
+    def send(self, request_id, line, future):
+        with self.send_lock:
+            if self.sock is None:
+                raise ConnectionError(f"{self.transport.name} is not connected..!")
+            self.pending[request_id] = (future, time.perf_counter_ns())
+            try:
+                self.sock.sendall(line)
+            except OSError as e:
+                self.pending.pop(request_id, None)
+                self.fail(e)
+                raise ConnectionError(str(e))
+
+    def read_loop(self, sock):
+        '''
+            잘못된 응답 줄은 버리고 계속 수신, 어떤 이유로든 종료되면 연결을 끊어 재연결 경로로 넘김
+        '''
+        buffer = b""
+        error = ConnectionError("reader stopped")
+        try:
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    raise ConnectionError("connection closed by device")
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    try:
+                        self.resolve(line.decode("utf-8"))
+                    except (ValueError, UnicodeDecodeError) as e:
+                        self.transport.errors += 1
+                        self.transport.log.warning("%s: malformed reply %r dropped (%s)", self.transport.name, line[:80], e)
+        except Exception as e:
+            error = e
+        finally:
+            if self.sock is sock:
+                self.fail(error)
+
+    def resolve(self, line):
+        request_id, _, rest = line.partition(" ")
+        status, _, payload = rest.partition(" ")
+        entry = self.pending.pop(int(request_id), None)
+        if entry is None:
+            return
+        future, start_ns = entry
+        self.transport.record_rtt(start_ns, time.perf_counter_ns())
+        if status == "OK":
+            future.set_result(payload.split() if payload else [])
+        else:
+            self.transport.errors += 1
+            future.set_exception(DeviceError(payload))
+
+    def fail(self, error):
+        '''
+            연결을 닫고 응답을 기다리던 요청을 모두 ConnectionError로 실패 처리
+        '''
+        with self.send_lock:
+            sock, self.sock = self.sock, None
+            pending, self.pending = self.pending, {}
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+            self.transport.on_disconnect(self, error)
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(str(error)))
+
+    def close(self):
+        self.fail(ConnectionError("closed"))
+
+
+class DeviceTransport():
+    def __init__(self, host, port, name=None, pool_size=2, timeout_s=2.0, connect_timeout_s=1.0,
+                 backoff_initial_s=0.1, backoff_max_s=5.0):
+        '''
+            pool_size: 장비당 유지할 연결 수 (요청은 대기 중인 요청이 가장 적은 연결로 전송)
+            timeout_s: call()의 응답 대기 시간
+        '''
+        self.host = host
+        self.port = port
+        self.name = name or f"{host}:{port}"
+        self.timeout_s = timeout_s
+        self.connect_timeout_s = connect_timeout_s
+        self.backoff_initial_s = backoff_initial_s
+        self.backoff_max_s = backoff_max_s
+
+        self.connections = [DeviceConnection(self, i) for i in range(pool_size)]
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.backoff_s = 0.0
+        self.next_attempt = 0.0
+
+        self.metrics_lock = threading.Lock()   # 연결별 수신 스레드가 함께 기록
+        self.rtt = Histogram()
+        self.requests = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.log = get_logger(self.__class__.__name__)
+
+    def connect(self):
+        '''
+            끊긴 연결을 다시 연결 (백오프 기간 중이면 시도하지 않음)
+        '''
+        with self.lock:
+            if time.monotonic() < self.next_attempt:
+                return any(conn.connected for conn in self.connections)
+            for conn in self.connections:
+                if conn.connected:
+                    continue
+                try:
+                    conn.open()
+                except OSError as e:
+                    self.backoff_s = min(self.backoff_max_s, max(self.backoff_initial_s, self.backoff_s * 2.0))
+                    self.next_attempt = time.monotonic() + self.backoff_s * random.uniform(0.8, 1.2)
+                    self.log.warning("%s connect failed: %s (retry in %.2f s)", self.name, e, self.backoff_s)
+                    break
+                if self.backoff_s:
+                    self.reconnects += 1
+                    self.log.info("%s reconnected", self.name)
+                self.backoff_s = 0.0
+            return any(conn.connected for conn in self.connections)
+
+    def on_disconnect(self, conn, error):
+        self.log.warning("%s connection %d lost: %s", self.name, conn.index, error)
+        with self.lock:
+            self.backoff_s = max(self.backoff_s, self.backoff_initial_s)
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+
+    def request(self, command, *args):
+        '''
+            요청을 전송하고 응답 값 목록을 결과로 갖는 Future 반환 (응답을 기다리지 않으므로 연속 호출 시 파이프라이닝)
+        '''
+        connected = [conn for conn in self.connections if conn.connected]
+        if len(connected) < len(self.connections) and self.connect():
+            connected = [conn for conn in self.connections if conn.connected]
+        if not connected:
+            raise ConnectionError(f"{self.name} is not connected..!")
+
+        conn = min(connected, key=lambda c: len(c.pending))
+        request_id = next(self.ids)
+        line = " ".join([str(request_id), command] + ["-" if arg is None else str(arg) for arg in args]) + "\n"
+        future = Future()
+        future.route = (conn, request_id)
+        self.requests += 1
+        conn.send(request_id, line.encode("utf-8"), future)
+        return future
+
+    def call(self, command, *args):
+        future = self.request(command, *args)
+        try:
+            return future.result(timeout=self.timeout_s)
+        finally:
+            conn, request_id = future.route
+            conn.pending.pop(request_id, None)     # 시간 초과 시 대기 목록에 남지 않도록 함
+
+    def record_rtt(self, start_ns, end_ns):
+        with self.metrics_lock:
+            self.rtt.record(end_ns - start_ns)
+        if PROFILER.enabled:
+            PROFILER.record("transport", self.name, start_ns, end_ns)
+
+    def metrics(self):
+        return {
+            "device": self.name,
+            "connected": sum(conn.connected for conn in self.connections),
+            "pool_size": len(self.connections),
+            "in_flight": sum(len(conn.pending) for conn in self.connections),
+            "requests": self.requests,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "rtt_ms": {
+                "count": self.rtt.count,
+                "mean": self.rtt.total_ns / self.rtt.count / 1e6 if self.rtt.count else 0.0,
+                "p50": self.rtt.percentile_ns(50) / 1e6,
+                "p99": self.rtt.percentile_ns(99) / 1e6,
+                "max": self.rtt.max_ns / 1e6,
+            },
+        }
+
+
+class TransportDIODriver():
+    '''
+        NMC2DIODriver와 같은 Read/Write, digital_read/digital_write 인터페이스
+    '''
+    def __init__(self, ip, port, pool_size=2, **kwargs):
+        self.transport = DeviceTransport(ip, port, name=f"DIO@{ip}:{port}", pool_size=pool_size, **kwargs)
+
+    def Read(self, pins):
+        return [int(v) for v in self.transport.call("READ", *pins)]
+
+    def Write(self, pins, states):
+        args = []
+        for pin, state in zip(pins, states):
+            args += [pin, 1 if state else 0]
+        self.transport.call("WRITE", *args)
+
+    def digital_read(self, pin_number):
+        return self.Read([pin_number])[0]
+
+    def digital_write(self, pins, states):
+        if not isinstance(pins, (list, tuple)):
+            pins, states = [pins], [states]
+        self.Write(pins, states)
+
+
+class TransportSCARARobotDriver():
+    '''
+        SR3iA와 같은 connect/set_power/MoveAbsolute/set_program 인터페이스
+    '''
+    def __init__(self, host, port, pool_size=1, **kwargs):
+        self.transport = DeviceTransport(host, port, name=f"SCARA@{host}:{port}", pool_size=pool_size, **kwargs)
+
+    def connect(self):
+        self.transport.call("CONNECT")
+
+    def set_power(self, power):
+        self.transport.call("POWER", 1 if power else 0)
+
+    def MoveAbsolute(self, theta1=None, theta2=None, theta3=None, d1=None, d2=None, d3=None):
+        self.transport.call("MOVE", theta1, theta2, theta3, d1, d2, d3)
+
+    def set_program(self, program):
+        self.transport.call("PROGRAM", program)
+
+    def get_position(self):
+        return [float(v) for v in self.transport.call("POS")]
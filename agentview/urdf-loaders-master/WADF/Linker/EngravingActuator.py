@@ -1,6 +1,11 @@
 from WADF.Linker.DeviceDriverDefinition import ADIO_DRIVER2, VDIO_DRIVER2
 from WADF.Linker.CommonDecorators import data_store_decorator
+from WADF.Linker.ModeDispatch import compile_mode_table
+from WADF.Linker.LinkerLogger import get_logger
+from WADF.Linker.LinkerProfiler import PROFILER
+from WADF.Linker.CommandQueue import queue_for, PRIORITY_NORMAL
 from Parser.WDFParser import *
+import time
 from PySide2.QtCore import QRunnable, QThread, QThreadPool, Signal, QObject
 
 '''
@@ -26,63 +31,64 @@ class EngravingActuator():
         self.data = self.wdf[wdf.workcell_name][self.linker_name]
         '''
         '''
+        self.log = get_logger(self.__class__.__name__)
         self.is_running = False
         self.thread_pool = QThreadPool()
         self.task_done = TaskSignal()
         self.task_done.result_signal.connect(self.update_linker_state)
+        self.impl = compile_mode_table(self, self.mode)
 
     def switch_mode(self, mode):
+        self.impl = compile_mode_table(self, mode)  # 테이블 전체를 한 번에 교체 (폴링 중에도 안전)
         self.mode = mode
         
     def update_linker_state(self, result):
-        print(f"result: {result}")
+        self.log.debug("result: %s", result)
         self.is_running = False # Decorator에서 장비 상태 업데이트 수행
 
     @data_store_decorator
-    def set_state(self, arg):
+    def set_state(self, arg, priority=PRIORITY_NORMAL, deadline_ms=None):
         '''
             Input Argument Name: arg
+            priority, deadline_ms: 실제 장비 명령 큐의 우선순위(CommandQueue.PRIORITY_*)와 마감 시간
         '''
-        '''
-            User-Define Code
-        '''
-        if self.mode == "VirtualMode":
-            return self.virtual_driver.Write(pins=self.pin, states=[arg])
-        
-        elif self.mode == "ActualMode":
-            return self.actual_driver.digital_write(pins=self.pin[0], states=arg)
-        
-        elif self.mode == "DigitalTwinMode":
-            control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'Write', self.pin, [arg])
-            control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'digital_write', self.pin[0], arg)
+        return self.impl["set_state"](arg, priority, deadline_ms)
 
-            self.thread_pool.start(control_task_1)
-            self.thread_pool.start(control_task_2)
-
-        else:
-            print(f"{self.mode} is not defined..!")
-        print(f"updated linker data: {self.data}")
-    
     @data_store_decorator
     def get_state(self):
         '''
             Output Argument Name: arg
         '''
-        arg = None
-        '''
-            User-Define Code
-        '''
-        if self.mode == "VirtualMode":
-            arg = self.virtual_driver.Read(pins=self.pin)
-        elif self.mode == "ActualMode":
-            arg = self.actual_driver.Read(pins=self.pin)
-        elif self.mode == "DigitalTwinMode":
-            arg1 = self.virtual_driver.Read(pins=self.pin)
-            arg = self.actual_driver.Read(pins=self.pin)
+        return self.impl["get_state"]()
+
+    '''
+        User-Define Code (모드별 구현, switch_mode에서 self.impl로 바인딩)
+    '''
+    def _set_state_virtual(self, arg, priority, deadline_ms):
+        return self.virtual_driver.Write(pins=self.pin, states=[arg])
+
+    def _set_state_actual(self, arg, priority, deadline_ms):
+        # 같은 보드의 다른 링커 명령과 직렬화, 대기 중인 같은 핀 명령은 마지막 상태로 합쳐짐
+        return queue_for(self.actual_driver).call('digital_write', self.pin[0], (self.pin[0], arg), priority, deadline_ms)
+
+    def _set_state_digitaltwin(self, arg, priority, deadline_ms):
+        control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'Write', self.pin, [arg])
+        self.thread_pool.start(control_task_1)
+        if self.actual_driver is None:      # 실제 장비가 연결되지 않은 경우 가상 장비만 동작
+            self.log.warning("actual driver is not defined, pin %s is not written", self.pin[0])
         else:
-            print(f"{self.mode} is not defined..!")
-        
-        return arg
+            queue_for(self.actual_driver).submit('digital_write', self.pin[0], (self.pin[0], arg), priority, deadline_ms)
+        self.log.debug("updated linker data: %s", self.data)
+
+    def _get_state_virtual(self):
+        return self.virtual_driver.Read(pins=self.pin)
+
+    def _get_state_actual(self):
+        return self.actual_driver.Read(pins=self.pin)
+
+    def _get_state_digitaltwin(self):
+        arg1 = self.virtual_driver.Read(pins=self.pin)
+        return self.actual_driver.Read(pins=self.pin)
         
 class TaskSignal(QObject):
     task_done = Signal(object)
@@ -97,15 +103,18 @@ class ControlTask(QRunnable):
         self.driver = driver
         self.method_name = method_name
         self.args = args
+        self.queued_ns = time.perf_counter_ns()
 
 
     def run(self):
+        if PROFILER.enabled:
+            PROFILER.record("queue", f"{self.__class__.__name__}.{self.method_name}", self.queued_ns, time.perf_counter_ns())
         if hasattr(self.driver, self.method_name):
             method = getattr(self.driver, self.method_name)
             method(*self.args)
             
         else:
-            print(f"Error: {self.method_name} not found in {self.driver}")
+            get_logger(self.__class__.__name__).error("Error: %s not found in %s", self.method_name, self.driver)
 
 class MonitoringTask(QRunnable):
     def __init__(self, driver, method_name, *args):
@@ -119,4 +128,4 @@ class MonitoringTask(QRunnable):
             method = getattr(self.driver, self.method_name)
             result = method(*self.args)
         else:
-            print(f"Error: {self.method_name} not found in {self.driver}")
\ No newline at end of file
+            get_logger(self.__class__.__name__).error("Error: %s not found in %s", self.method_name, self.driver)
\ No newline at end of file
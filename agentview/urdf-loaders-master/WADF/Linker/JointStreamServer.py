@@ -0,0 +1,399 @@
+"""
+WADF 관절 상태 스트리밍 모듈
+링커 변수 저장소의 관절 값(SCARA 관절, 공압 관절, 팔레트 위치)을 WebSocket으로 브라우저 URDF 뷰어에 전송
+    - 클라이언트마다 요청한 프레임 속도(?fps=30 또는 {"fps": 15} 텍스트 메시지)로 마지막 전송 이후 바뀐 값만 바이너리 델타 프레임으로 전송
+    - 소켓 송신 버퍼가 high_water를 넘은 느린 클라이언트는 프레임을 건너뛰고, 다음 프레임에 그동안의 변경을 합쳐 전송
+    - publish()는 최신값만 기록하고 바로 반환하므로 제어 루프가 네트워크를 기다리지 않음
+
+채널 정의는 텍스트 프레임 {"type": "schema", "channels": {"<index>": "<name>", ...}}으로 먼저 전송
+제거된 채널(None)은 모든 클라이언트에 NaN이 전송된 뒤 번호를 회수하여 새 채널에 재사용 (새 이름은 schema로 다시 전송)
+바이너리 프레임 (little-endian)
+    header: uint8 magic(0x4A) | uint8 flags(bit0: keyframe) | uint32 seq | uint32 time_ms | uint16 count
+    entry:  uint16 channel | float32 value (NaN: 채널 제거, ex. 배출된 팔레트)
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import struct
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from PySide2.QtCore import QTimer
+from WADF.Linker.LinkerLogger import get_logger
+from WADF.Linker.SCARAKinematics import JOINT_NAMES
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+FRAME_MAGIC = 0x4A
+FLAG_KEYFRAME = 0x01
+HEADER = struct.Struct("<BBIIH")
+ENTRY = struct.Struct("<Hf")
+MAX_CHANNELS = 1 << 16          # entry의 uint16 channel
+
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+def encode_ws_frame(opcode, payload):
+    '''
+        서버 -> 클라이언트 프레임 (마스크 없음, FIN=1)
+    '''
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+async def read_ws_frame(reader):
+    '''
+        클라이언트 -> 서버 프레임 (마스크 적용됨), return: (opcode, payload)
+    '''
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if second & 0x80 else b"\x00\x00\x00\x00"
+    payload = bytearray(await reader.readexactly(length))
+    for i in range(length):
+        payload[i] ^= mask[i % 4]
+    return opcode, bytes(payload)
+
+def encode_delta(seq, changes, keyframe=False):
+    '''
+        changes: [(channel, value)] -> 바이너리 델타 프레임
+    '''
+    parts = [HEADER.pack(FRAME_MAGIC, FLAG_KEYFRAME if keyframe else 0, seq & 0xFFFFFFFF,
+                         int(time.monotonic() * 1000) & 0xFFFFFFFF, len(changes))]
+    parts += [ENTRY.pack(channel, value) for channel, value in changes]
+    return b"".join(parts)
+
+
+class StreamClient():
+    def __init__(self, writer, fps):
+        self.writer = writer
+        self.fps = fps
+        self.sent = {}              # channel -> 마지막으로 전송한 값
+        self.schema = {}            # channel -> 전송한 채널 이름
+        self.seq = 0
+        self.frames = 0
+        self.skipped = 0            # 송신 버퍼 초과로 건너뛴 프레임 수
+        self.bytes = 0
+
+
+class JointStreamServer():
+    def __init__(self, host="0.0.0.0", port=8765, default_fps=30, max_fps=60, high_water=64 * 1024, epsilon=1e-5):
+        '''
+            high_water: 클라이언트 송신 버퍼가 이 크기(bytes)를 넘으면 해당 클라이언트의 프레임을 건너뜀
+            epsilon: 이 값 이하의 변화는 전송하지 않음
+        '''
+        self.host = host
+        self.port = port
+        self.default_fps = default_fps
+        self.max_fps = max_fps
+        self.high_water = high_water
+        self.epsilon = epsilon
+
+        self.channels = {}          # name -> channel index
+        self.names = []             # channel index -> name
+        self.latest = {}            # channel -> 최신값 (publish에서 기록)
+        self.released = set()       # 제거되어 회수를 기다리는 channel
+        self.free = []              # 회수되어 재사용할 수 있는 channel
+        self.lock = threading.Lock()
+
+        self.clients = set()
+        self.loop = None
+        self.thread = None
+        self.server = None
+        self.log = get_logger(self.__class__.__name__)
+
+    '''
+        제어 측 (임의 스레드)
+    '''
+    def channel(self, name):
+        '''
+            self.lock 안에서 호출, 채널 번호가 모두 사용 중이면 None
+        '''
+        index = self.channels.get(name)
+        if index is not None:
+            return index
+        if self.free:
+            index = self.free.pop()
+            names = list(self.names)
+            names[index] = name
+        elif len(self.names) < MAX_CHANNELS:
+            index = len(self.names)
+            names = self.names + [name]
+        else:
+            self.log.error("channel limit (%d) exceeded, dropping %s", MAX_CHANNELS, name)
+            return None
+        self.channels[name] = index
+        self.names = names
+        return index
+
+    def publish(self, values):
+        '''
+            values: {channel name: float}, None은 채널 제거
+        '''
+        latest = self.latest
+        with self.lock:
+            for name, value in values.items():
+                if value is None:
+                    index = self.channels.get(name)
+                    if index is not None:
+                        latest[index] = math.nan
+                        self.released.add(index)
+                    continue
+                index = self.channel(name)
+                if index is not None:
+                    latest[index] = float(value)
+                    self.released.discard(index)
+            if self.released:
+                self.reclaim()
+
+    def reclaim(self):
+        '''
+            self.lock 안에서 호출: 제거된 채널 중 연결된 모든 클라이언트에 NaN이 전송된 채널 번호를 회수
+            (send_frame은 self.lock 안에서 sent를 갱신하고 그 프레임을 다음 schema보다 먼저 쓰므로 NaN 프레임이 먼저 전송됨)
+        '''
+        clients = list(self.clients)
+        for index in list(self.released):
+            if not all(math.isnan(client.sent.get(index, math.nan)) for client in clients):
+                continue
+            self.released.discard(index)
+            self.channels.pop(self.names[index], None)
+            self.latest.pop(index, None)
+            for client in clients:
+                client.sent.pop(index, None)
+            self.free.append(index)
+
+    '''
+        서버 측 (asyncio 스레드)
+    '''
+    def start(self):
+        if self.thread is not None:
+            return
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self.run, args=(ready,), name="JointStreamServer", daemon=True)
+        self.thread.start()
+        ready.wait(5.0)
+
+    def run(self, ready):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(asyncio.start_server(self.on_connect, self.host, self.port))
+        self.log.info("listening on ws://%s:%d", self.host, self.port)
+        ready.set()
+        self.loop.run_forever()
+
+    def stop(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread is not None:
+            self.thread.join(1.0)
+            self.thread = None
+
+    def clamp_fps(self, fps):
+        return max(1.0, min(float(fps), float(self.max_fps)))
+
+    async def handshake(self, reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        lines = request.decode("latin-1").split("\r\n")
+        path = lines[0].split(" ")[1] if len(lines[0].split(" ")) > 1 else "/"
+        headers = {}
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        key = headers.get("sec-websocket-key")
+        if key is None:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            return None
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("ascii"))
+        query = parse_qs(urlparse(path).query)
+        return self.clamp_fps(query.get("fps", [self.default_fps])[0])
+
+    async def on_connect(self, reader, writer):
+        try:
+            fps = await self.handshake(reader, writer)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            fps = None
+        if fps is None:
+            writer.close()
+            return
+
+        client = StreamClient(writer, fps)
+        self.clients.add(client)
+        self.log.info("client connected: %s (%.0f fps)", writer.get_extra_info("peername"), fps)
+        sender = asyncio.ensure_future(self.send_loop(client))
+        try:
+            await self.receive_loop(reader, client)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            sender.cancel()
+            self.clients.discard(client)
+            writer.close()
+            self.log.info("client disconnected (%d frames, %d skipped)", client.frames, client.skipped)
+
+    async def receive_loop(self, reader, client):
+        while True:
+            opcode, payload = await read_ws_frame(reader)
+            if opcode == OP_CLOSE:
+                client.writer.write(encode_ws_frame(OP_CLOSE, payload[:2]))
+                return
+            if opcode == OP_PING:
+                client.writer.write(encode_ws_frame(OP_PONG, payload))
+            elif opcode == OP_TEXT:
+                try:
+                    message = json.loads(payload.decode("utf-8"))
+                except ValueError:
+                    continue
+                if not isinstance(message, dict):
+                    self.log.warning("ignored non-object message: %.64s", payload)
+                    continue
+                if "fps" in message:
+                    try:
+                        client.fps = self.clamp_fps(message["fps"])
+                    except (TypeError, ValueError):
+                        self.log.warning("ignored invalid fps: %.64s", message["fps"])
+                if message.get("keyframe"):
+                    client.sent = {}
+
+    async def send_loop(self, client):
+        try:
+            while True:
+                await asyncio.sleep(1.0 / client.fps)
+                transport = client.writer.transport
+                if transport.is_closing():
+                    return
+                if transport.get_write_buffer_size() > self.high_water:
+                    client.skipped += 1     # 느린 클라이언트: 이번 프레임은 건너뛰고 다음 델타에 합침
+                    continue
+                self.send_frame(client)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:      # 태스크 예외가 조용히 사라지지 않도록 기록하고 연결 종료
+            self.log.error("send loop failed for %s: %s", client.writer.get_extra_info("peername"), e)
+            client.writer.close()
+
+    def send_frame(self, client):
+        '''
+            채널 이름과 값은 self.lock 안에서 한 번에 읽음 (publish/reclaim이 그 사이에 채널을 재사용하지 못하도록)
+        '''
+        with self.lock:
+            schema = {str(i): name for i, name in enumerate(self.names) if client.schema.get(i) != name}
+            keyframe = not client.sent
+            changes = []
+            for channel, value in self.latest.items():
+                previous = client.sent.get(channel)
+                if previous is None or (math.isnan(value) != math.isnan(previous)) or abs(value - previous) > self.epsilon:
+                    changes.append((channel, value))
+                    client.sent[channel] = value
+
+        if schema:
+            self.write(client, OP_TEXT, json.dumps({"type": "schema", "channels": schema}).encode("utf-8"))
+            client.schema.update((int(i), name) for i, name in schema.items())
+        if not changes:
+            return
+        client.seq += 1
+        self.write(client, OP_BINARY, encode_delta(client.seq, changes, keyframe))
+        client.frames += 1
+
+    def write(self, client, opcode, payload):
+        frame = encode_ws_frame(opcode, payload)
+        client.writer.write(frame)
+        client.bytes += len(frame)
+
+    def stats(self):
+        return [{"peer": client.writer.get_extra_info("peername"), "fps": client.fps, "frames": client.frames,
+                 "skipped": client.skipped, "bytes": client.bytes} for client in list(self.clients)]
+
+
+class JointStreamFeed():
+    '''
+        링커 변수 저장소에서 관절 값을 읽어 JointStreamServer로 전달
+    '''
+    def __init__(self, server, scara=None, actuators=(), actuator_driver=None, joint_names=None, flow=None,
+                 stepper=None, robot_id=None, joint_ids=None):
+        '''
+            scara: SCARARobot 링커 (관절값 -> SCARAKinematics.JOINT_NAMES)
+            actuators: DigitalOutputDevice 링커 목록, actuator_driver: 핀별 oriPos/tarPos를 가진 VDIO_ACTUATOR
+            joint_names: {pin: URDF 관절 이름}
+            flow: ConveyorFlowModel (팔레트 위치 -> "Pallet_INP_<id>_x")
+            stepper: SimulationStepper, 진행 중이면 지령값 대신 스냅샷의 실제 관절 위치를 전송
+                     (robot_id, joint_ids: SCARA 관절, 액추에이터 관절은 여기서 스냅샷 기록 대상에 추가)
+            ex) JointStreamFeed(server, scara, actuators, VDIO_ACTUATOR, ACTUATOR_JOINT_NAMES, stepper=VSIM_STEPPER,
+                                robot_id=VSCR_ROBOT_ID, joint_ids=VSCR_JOINT_IDS)
+        '''
+        self.server = server
+        self.scara = scara
+        self.actuators = list(actuators)
+        self.actuator_driver = actuator_driver
+        self.joint_names = joint_names or {}
+        self.flow = flow
+        self.stepper = stepper
+        self.robot_id = robot_id
+        self.joint_ids = joint_ids
+        self.pallets = set()
+        self.timer = None
+
+        if stepper is not None and actuator_driver is not None:
+            tracked = {}
+            for pin in self.joint_names:
+                i = actuator_driver.pin_index.get(pin)
+                if i is not None:
+                    tracked.setdefault(actuator_driver.robot[i], []).append(actuator_driver.joint[i])
+            for robot, joints in tracked.items():
+                stepper.track_joints(robotId=robot, jointIds=joints)
+
+    def start(self, period_ms=20):
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.timeout.connect(self.sample)
+            self.timer.start(period_ms)
+
+    def sample(self, dt=None):
+        values = {}
+        snapshot = self.stepper.latest() if self.stepper is not None and self.stepper.running else None
+        if self.scara is not None:
+            joints = snapshot.joint_positions(self.robot_id, self.joint_ids) if snapshot is not None else None
+            values.update(zip(JOINT_NAMES, self.scara.joint_state if joints is None else joints))
+
+        driver = self.actuator_driver
+        for linker in self.actuators:
+            pin = linker.pin[0]
+            name = self.joint_names.get(pin)
+            if name is None:
+                continue
+            i = driver.pin_index[pin]
+            joint = snapshot.joints.get((driver.robot[i], driver.joint[i])) if snapshot is not None else None
+            if joint is not None:
+                values[name] = joint[0]
+                continue
+            entry = linker.data.get("Control", {}).get(f"{linker.__class__.__name__}_control_state_arg")
+            if entry is None or entry["Value"] is None:
+                continue
+            values[name] = driver.tar_pos[i] if entry["Value"] else driver.ori_pos[i]
+
+        if self.flow is not None:
+            with self.flow.lock:
+                ids = self.flow.ids.tolist()
+                x = self.flow.positions(self.flow.time()).tolist()
+            current = set(ids)
+            values.update({f"Pallet_INP_{pallet}_x": value for pallet, value in zip(ids, x)})
+            values.update({f"Pallet_INP_{pallet}_x": None for pallet in self.pallets - current})
+            self.pallets = current
+
+        self.server.publish(values)
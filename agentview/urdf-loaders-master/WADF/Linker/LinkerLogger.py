@@ -0,0 +1,160 @@
+"""
+WADF 비동기 로그 모듈
+제어 경로에서는 링 버퍼에 (시각, 레벨, 링커명, 포맷, 인자)만 추가하고
+문자열 포맷팅과 출력은 백그라운드 스레드에서 수행하여 I/O로 인해 블로킹되지 않도록 함
+"""
+import atexit
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+class LogPipeline():
+    def __init__(self, capacity=4096, flush_interval_ms=100, rate_limit_s=5.0, max_warning_keys=1024, stream=None):
+        self.buffer = deque(maxlen=capacity)    # 가득 차면 가장 오래된 로그부터 버림
+        self.dropped = 0
+        self.flush_interval_s = flush_interval_ms / 1000.0
+        self.rate_limit_s = rate_limit_s        # 동일 경고의 최소 출력 간격
+        self.stream = stream
+
+        self.default_level = INFO
+        self.levels = {}                        # linker_name -> level
+        self.last_warning = OrderedDict()       # (linker_name, fmt) -> [마지막 출력 시각, 억제된 횟수], 출력 순서
+        self.max_warning_keys = max_warning_keys    # 넘으면 가장 오래전에 출력된 경고부터 제거
+
+        self.lock = threading.Lock()            # last_warning, dropped, 스레드 시작 보호
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def set_level(self, name, level):
+        self.levels[name] = level
+
+    def is_enabled(self, name, level):
+        return level >= self.levels.get(name, self.default_level)
+
+    def push(self, name, level, fmt, args):
+        '''
+            제어 경로에서 호출: 포맷팅 없이 버퍼에 추가만 수행
+            WARNING 이상은 (링커명, 포맷) 단위로 rate_limit_s 동안 한 번만 출력하고 나머지는 횟수만 집계
+        '''
+        if level < self.levels.get(name, self.default_level):
+            return
+
+        now = time.time()
+        suppressed = 0
+        with self.lock:
+            if level >= WARNING:
+                key = (name, fmt)
+                state = self.last_warning.get(key)
+                if state is not None and now - state[0] < self.rate_limit_s:
+                    state[1] += 1
+                    return
+                if state is not None:
+                    suppressed = state[1]
+                    self.last_warning.move_to_end(key)
+                self.last_warning[key] = [now, 0]
+                if len(self.last_warning) > self.max_warning_keys:
+                    self.last_warning.popitem(last=False)
+
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append((now, level, name, fmt, args, suppressed))
+
+        if self.thread is None:
+            self.start()
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self.run, name="LinkerLogger", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.flush_interval_s)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        '''
+            버퍼에 쌓인 로그를 포맷팅하여 한 번에 출력
+        '''
+        lines = []
+        while self.buffer:
+            try:
+                record = self.buffer.popleft()
+            except IndexError:
+                break
+            lines.append(self.format(record))
+
+        with self.lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            lines.append(f"{datetime.now()} [WARNING] LinkerLogger: {dropped} log records dropped (buffer full)")
+
+        if lines:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+
+    def format(self, record):
+        created, level, name, fmt, args, suppressed = record
+        try:
+            message = fmt % args if args else fmt
+        except Exception as e:
+            message = f"{fmt!r} % {args!r} ({e})"
+        if suppressed:
+            message += f" (repeated {suppressed} times)"
+        return f"{datetime.fromtimestamp(created)} [{LEVEL_NAMES.get(level, level)}] {name}: {message}"
+
+
+class LinkerLog():
+    '''
+        링커 단위 로거 (get_logger로 생성)
+        ex) self.log.debug("updated linker data: %s", self.data)
+    '''
+    def __init__(self, name, pipeline):
+        self.name = name
+        self.pipeline = pipeline
+
+    def set_level(self, level):
+        self.pipeline.set_level(self.name, level)
+
+    def is_enabled(self, level):
+        return self.pipeline.is_enabled(self.name, level)
+
+    def debug(self, fmt, *args):
+        self.pipeline.push(self.name, DEBUG, fmt, args)
+
+    def info(self, fmt, *args):
+        self.pipeline.push(self.name, INFO, fmt, args)
+
+    def warning(self, fmt, *args):
+        self.pipeline.push(self.name, WARNING, fmt, args)
+
+    def error(self, fmt, *args):
+        self.pipeline.push(self.name, ERROR, fmt, args)
+
+
+LOG_PIPELINE = LogPipeline()
+_LOGGERS = {}
+
+def get_logger(name):
+    log = _LOGGERS.get(name)
+    if log is None:
+        log = _LOGGERS.setdefault(name, LinkerLog(name, LOG_PIPELINE))
+    return log
+
+def set_level(name, level):
+    LOG_PIPELINE.set_level(name, level)
+
+atexit.register(LOG_PIPELINE.flush)
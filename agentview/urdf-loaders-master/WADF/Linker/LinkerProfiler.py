@@ -0,0 +1,214 @@
+"""
+WADF 링커/드라이버 계측 모듈
+런타임에 enable/disable 가능한 저부하 계측기로
+링커 메서드별 호출 횟수와 지연 시간 히스토그램, 드라이버 왕복 시간, QThreadPool 대기 시간을 기록
+결과는 Prometheus 텍스트 포맷과 Chrome trace(JSON) 파일로 내보냄
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS     # 2의 거듭제곱 구간마다 16개 버킷 (상대 오차 약 6%)
+
+def bucket_index(value_ns):
+    '''
+        HDR 방식의 로그-선형 버킷 인덱스
+        [0, 32) 구간은 1 ns 단위, 이후 2의 거듭제곱 구간마다 SUB_BUCKET_COUNT 개로 분할
+    '''
+    if value_ns < 2 * SUB_BUCKET_COUNT:
+        return max(0, int(value_ns))
+    shift = int(value_ns).bit_length() - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKET_COUNT + (int(value_ns) >> shift)
+
+def bucket_upper_ns(index):
+    if index < 2 * SUB_BUCKET_COUNT:
+        return index + 1
+    shift = index // SUB_BUCKET_COUNT - 1
+    return (index - shift * SUB_BUCKET_COUNT + 1) << shift
+
+class Histogram():
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = {}
+
+    def record(self, value_ns):
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        index = bucket_index(value_ns)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        while True:
+            try:
+                buckets = list(other.buckets.items())
+                break
+            except RuntimeError:    # 기록 중인 스레드에서 새 버킷이 추가되는 중
+                continue
+        for index, count in buckets:
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def percentile_ns(self, percent):
+        if self.count == 0:
+            return 0
+        target = self.count * percent / 100.0
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                return bucket_upper_ns(index)
+        return self.max_ns
+
+
+class LinkerProfiler():
+    def __init__(self, trace_capacity=100000):
+        self.enabled = False
+        self.trace_enabled = False
+        self.trace_events = deque(maxlen=trace_capacity)
+
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.thread_tables = []    # 스레드별 {(kind, name): Histogram} (각 스레드만 기록하므로 락 불필요)
+
+    def enable(self, trace=False):
+        self.trace_enabled = trace
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.trace_enabled = False
+
+    def reset(self):
+        with self.lock:
+            for table in self.thread_tables:
+                table.clear()
+        self.trace_events.clear()
+
+    def table(self):
+        table = getattr(self.local, "table", None)
+        if table is None:
+            table = self.local.table = {}
+            with self.lock:
+                self.thread_tables.append(table)
+        return table
+
+    def record(self, kind, name, start_ns, end_ns):
+        '''
+            kind: "linker" | "driver" | "queue" | "transport"
+            name: ex) "PartPusher1.set_state", "VDIO_DRIVER.Read"
+        '''
+        table = self.table()
+        key = (kind, name)
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = Histogram()
+        histogram.record(end_ns - start_ns)
+
+        if self.trace_enabled:
+            self.trace_events.append((name, kind, start_ns, end_ns, threading.get_ident()))
+
+    def snapshot(self):
+        '''
+            모든 스레드의 히스토그램을 병합한 {(kind, name): Histogram}
+        '''
+        with self.lock:
+            tables = list(self.thread_tables)
+
+        merged = {}
+        for table in tables:
+            for key, histogram in self.copy_items(table):
+                merged.setdefault(key, Histogram()).merge(histogram)
+        return merged
+
+    def copy_items(self, table):
+        while True:
+            try:
+                return list(table.items())
+            except RuntimeError:    # 다른 스레드에서 새 키가 추가되는 중
+                continue
+
+    def prometheus_text(self):
+        lines = []
+        declared = set()
+        for (kind, name), histogram in sorted(self.snapshot().items()):
+            metric = f"wadf_{kind}_latency_seconds"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} histogram")
+                declared.add(metric)
+
+            cumulative = 0
+            for index in sorted(histogram.buckets):
+                cumulative += histogram.buckets[index]
+                le = bucket_upper_ns(index) / 1e9
+                lines.append(f'{metric}_bucket{{name="{name}",le="{le:.9g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{name="{name}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{metric}_sum{{name="{name}"}} {histogram.total_ns / 1e9:.9g}')
+            lines.append(f'{metric}_count{{name="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        events = []
+        for name, kind, start_ns, end_ns, tid in list(self.trace_events):
+            events.append({
+                "name": name, "cat": kind, "ph": "X",
+                "ts": start_ns / 1000.0, "dur": (end_ns - start_ns) / 1000.0,
+                "pid": pid, "tid": tid,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, directory, prefix="wadf_profile"):
+        '''
+            실행 중인 셀의 계측 결과를 파일로 저장 (prefix.prom, prefix.trace.json)
+        '''
+        os.makedirs(directory, exist_ok=True)
+        prom_path = os.path.join(directory, f"{prefix}.prom")
+        trace_path = os.path.join(directory, f"{prefix}.trace.json")
+        with open(prom_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return prom_path, trace_path
+
+
+class InstrumentedDriver():
+    '''
+        드라이버 메서드 호출을 감싸 왕복 시간을 기록하는 프록시
+        계측이 꺼져 있으면 원본 속성을 그대로 반환
+    '''
+    def __init__(self, driver, name):
+        self._driver = driver
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(self._driver, attr)
+        if not PROFILER.enabled or not callable(value):
+            return value
+
+        key = f"{self._name}.{attr}"
+        def timed(*args, **kwargs):
+            start_ns = time.perf_counter_ns()
+            try:
+                return value(*args, **kwargs)
+            finally:
+                PROFILER.record("driver", key, start_ns, time.perf_counter_ns())
+        return timed
+
+    def __repr__(self):
+        return f"InstrumentedDriver({self._name}, {self._driver!r})"
+
+def instrument_driver(driver, name):
+    if driver is None:
+        return None
+    return InstrumentedDriver(driver, name)
+
+PROFILER = LinkerProfiler()
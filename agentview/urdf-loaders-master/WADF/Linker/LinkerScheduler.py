@@ -0,0 +1,68 @@
+"""
+WADF 공유 폴링 스케줄러 모듈
+링커마다 QTimer를 생성하는 대신 하나의 QTimer로 등록된 모니터링 메서드를 주기적으로 호출
+모드 변경 요청은 폴링 주기 사이에 일괄 적용되며, 요청부터 적용까지의 지연 시간을 기록
+"""
+import threading
+import time
+from PySide2.QtCore import QTimer
+from WADF.Linker.LinkerLogger import get_logger
+
+class LinkerScheduler():
+    def __init__(self, period_ms=200):
+        self.period_ms = period_ms
+        self.tasks = []
+        self.timer = None
+
+        self.lock = threading.Lock()
+        self.pending_modes = []
+        self.switch_latency_ms = {}   # linker_name -> 마지막 모드 변경 지연 시간(ms)
+        self.log = get_logger(self.__class__.__name__)
+
+    def register(self, task):
+        '''
+            task: 주기적으로 호출할 메서드 (ex. linker.get_state)
+            QTimer는 QApplication 생성 이후 첫 등록 시점에 생성
+        '''
+        self.tasks = self.tasks + [task]
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.timeout.connect(self.tick)
+            self.timer.start(self.period_ms)
+
+    def unregister(self, task):
+        self.tasks = [t for t in self.tasks if t != task]
+
+    def request_mode(self, linker, mode):
+        '''
+            다음 폴링 주기 시작 시점에 linker.switch_mode(mode)를 적용
+            폴링 중인 링커의 모드가 주기 도중에 바뀌지 않도록 보장
+        '''
+        with self.lock:
+            self.pending_modes.append((linker, mode, time.perf_counter()))
+
+        if self.timer is None:
+            self.apply_pending_modes()
+
+    def apply_pending_modes(self):
+        with self.lock:
+            pending, self.pending_modes = self.pending_modes, []
+
+        for linker, mode, requested_at in pending:
+            try:
+                linker.switch_mode(mode)
+            except ValueError as e:
+                self.log.error("%s: %s", linker.__class__.__name__, e)
+                continue
+            latency_ms = (time.perf_counter() - requested_at) * 1000.0
+            self.switch_latency_ms[linker.__class__.__name__] = latency_ms
+            self.log.info("%s switched to %s (%.3f ms)", linker.__class__.__name__, mode, latency_ms)
+
+    def tick(self):
+        if self.pending_modes:
+            self.apply_pending_modes()
+
+        for task in self.tasks:
+            task()
+
+SCHEDULER = LinkerScheduler(period_ms=200)
@@ -0,0 +1,29 @@
+"""
+WADF 모드별 구현 테이블 모듈
+switch_mode 시점에 모드별 구현 메서드를 미리 바인딩하여
+get_state/set_state 호출 시 mode 문자열 비교 없이 바로 호출되도록 함
+"""
+
+MODE_SUFFIX = {
+    "VirtualMode": "virtual",
+    "ActualMode": "actual",
+    "DigitalTwinMode": "digitaltwin",
+}
+
+def compile_mode_table(linker, mode):
+    """
+    linker 클래스에 정의된 `_<메서드명>_<모드>` 구현 메서드를 찾아
+    {메서드명: bound method} 테이블을 생성
+    ex) _set_state_virtual -> table["set_state"]
+
+    정의되지 않은 mode는 ValueError를 발생시키며, 호출 측의 기존 테이블은 그대로 유지됨
+    """
+    if mode not in MODE_SUFFIX:
+        raise ValueError(f"{mode} is not defined..!")
+
+    suffix = "_" + MODE_SUFFIX[mode]
+    table = {}
+    for name in dir(type(linker)):
+        if name.startswith("_") and not name.startswith("__") and name.endswith(suffix):
+            table[name[1:-len(suffix)]] = getattr(linker, name)
+    return table
@@ -0,0 +1,223 @@
+"""
+WADF WPF 런타임 모듈
+WPF 파일(ex. WPF/BML.wpf)의 Performance를 평가기로 컴파일하고 링커 데이터 저장소 값의 엣지에 맞춰 계산
+    - Measure: <Value> 상수 또는 <DataReference Edge="Rising|Falling|Both"> 엣지 시각 (Update="Increment"이면 엣지 횟수)
+    - Formula: Measure 순서대로 t0, t1, ... (= v0, v1, ...) 변수로 계산, None이면 결과를 갱신하지 않음
+    - Performance Update="Accumulate": 계산 결과를 누적 (ex. IdleTime)
+reload()는 바뀐 Performance만 다시 컴파일하고 누적값, 측정값 같은 상태는 유지
+"""
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+from WADF.Linker.LinkerLogger import get_logger
+
+RISING = "Rising"
+FALLING = "Falling"
+BOTH = "Both"
+
+class MeasureDefinition():
+    __slots__ = ("name", "reference", "edge", "update", "constant")
+
+    def __init__(self, element):
+        self.name = element.get("MeasureName")
+        self.update = element.get("Update")
+        reference = element.find("DataReference")
+        self.reference = reference.text.strip() if reference is not None else None
+        self.edge = reference.get("Edge", BOTH) if reference is not None else None
+        value = element.findtext("Value")
+        self.constant = parse_constant(value) if value is not None else None
+
+    def signature(self):
+        return (self.name, self.reference, self.edge, self.update, self.constant)
+
+
+class PerformanceDefinition():
+    def __init__(self, element):
+        self.name = element.get("PerformanceName")
+        self.update = element.get("Update")
+        self.measures = [MeasureDefinition(measure) for measure in element.findall("Measure")]
+        self.formula = (element.findtext("Formula") or "").strip()
+
+    def signature(self):
+        return (self.update, tuple(measure.signature() for measure in self.measures), self.formula)
+
+
+def parse_constant(text):
+    text = text.strip()
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+def parse_wpf(wpf_path):
+    '''
+        return: {PerformanceName: PerformanceDefinition} (파일 순서 유지)
+    '''
+    root = ET.parse(wpf_path).getroot()
+    return {definition.name: definition for definition in map(PerformanceDefinition, root.findall("Performance"))}
+
+
+class PerformanceEvaluator():
+    def __init__(self, definition, previous=None):
+        '''
+            previous: 같은 이름의 기존 평가기, 정의가 같은 Measure의 값과 누적값을 이어받음
+        '''
+        self.definition = definition
+        self.name = definition.name
+        self.code = compile(definition.formula, f"<WPF {definition.name}>", "eval") if definition.formula else None
+        self.values = [measure.constant for measure in definition.measures]
+        self.value = None           # 마지막 계산 결과 (Accumulate이면 누적값)
+        self.timestamp = None
+        self.evaluations = 0
+
+        if previous is not None:
+            kept = {measure.signature(): value for measure, value in zip(previous.definition.measures, previous.values)
+                    if measure.constant is None}
+            for i, measure in enumerate(definition.measures):
+                if measure.constant is None and measure.signature() in kept:
+                    self.values[i] = kept[measure.signature()]
+            if definition.update == previous.definition.update:
+                self.value = previous.value
+                self.timestamp = previous.timestamp
+            self.evaluations = previous.evaluations
+
+    def measure(self, name):
+        for measure, value in zip(self.definition.measures, self.values):
+            if measure.name == name:
+                return value
+        raise KeyError(name)
+
+    def on_edge(self, index, timestamp):
+        measure = self.definition.measures[index]
+        if measure.update == "Increment":
+            self.values[index] = (self.values[index] or 0) + 1
+        else:
+            self.values[index] = timestamp
+        return self.evaluate(timestamp)
+
+    def evaluate(self, timestamp=None):
+        if self.code is None or any(value is None for value in self.values):
+            return False
+        scope = {}
+        for i, value in enumerate(self.values):
+            scope[f"t{i}"] = scope[f"v{i}"] = value
+        try:
+            result = eval(self.code, {"__builtins__": {}, "timedelta": timedelta}, scope)
+        except (ArithmeticError, TypeError, ValueError):
+            return False
+        if result is None:
+            return False
+
+        if self.definition.update == "Accumulate" and self.value is not None:
+            result = self.value + result
+        self.value = result
+        self.timestamp = timestamp or datetime.now()
+        self.evaluations += 1
+        return True
+
+
+class PerformanceRuntime():
+    def __init__(self, wpf_path, linkers):
+        '''
+            linkers: {링커 이름: 링커}, DataReference "<링커>/<Section>/<key>"의 값을 링커 data에서 읽음
+        '''
+        self.path = wpf_path
+        self.linkers = linkers
+        self.evaluators = {}
+        self.references = {}        # reference -> [(evaluator, measure index, edge)]
+        self.previous = {}          # reference -> 마지막으로 읽은 값 (reload 후에도 유지)
+        self.subscribers = []
+        self.log = get_logger(self.__class__.__name__)
+        self.apply(parse_wpf(wpf_path))
+
+    def subscribe(self, callback):
+        '''
+            callback(name, value, evaluator): Performance 결과가 갱신될 때 호출
+        '''
+        self.subscribers = self.subscribers + [callback]
+
+    def bind_store(self, store):
+        '''
+            WUIF ViewModelStore에 "<Performance>", "<Performance>/<Measure>" 경로로 기록
+        '''
+        def publish(name, value, evaluator):
+            store.set(name, value)
+            for measure, measure_value in zip(evaluator.definition.measures, evaluator.values):
+                store.set(f"{name}/{measure.name}", measure_value)
+        self.subscribe(publish)
+
+    def reload(self, wpf_path=None):
+        '''
+            return: {"added": [...], "changed": [...], "removed": [...], "ms": 소요 시간}
+        '''
+        start = time.perf_counter()
+        self.path = wpf_path or self.path
+        diff = self.apply(parse_wpf(self.path))
+        diff["ms"] = (time.perf_counter() - start) * 1000.0
+        self.log.info("%s reloaded in %.3f ms: %s", self.path, diff["ms"],
+                      {key: value for key, value in diff.items() if key != "ms" and value})
+        return diff
+
+    def apply(self, definitions):
+        diff = {"added": [], "changed": [], "removed": []}
+        evaluators = {}
+        for name, definition in definitions.items():
+            current = self.evaluators.get(name)
+            if current is not None and current.definition.signature() == definition.signature():
+                evaluators[name] = current
+                continue
+            evaluators[name] = PerformanceEvaluator(definition, current)
+            diff["changed" if current is not None else "added"].append(name)
+        diff["removed"] = [name for name in self.evaluators if name not in definitions]
+
+        if diff["added"] or diff["changed"] or diff["removed"]:
+            references = {}
+            for evaluator in evaluators.values():
+                for i, measure in enumerate(evaluator.definition.measures):
+                    if measure.reference is not None:
+                        references.setdefault(measure.reference, []).append((evaluator, i, measure.edge))
+            self.evaluators, self.references = evaluators, references
+
+        # 바뀐 식은 다음 엣지를 기다리지 않고 현재 Measure 값으로 다시 계산 (이전 식의 결과를 남기지 않음)
+        # Accumulate는 누적값에 한 번 더 더해지므로 제외
+        for name in diff["added"] + diff["changed"]:
+            evaluator = evaluators[name]
+            if evaluator.definition.update == "Accumulate":
+                continue
+            evaluator.value = None
+            if evaluator.evaluate(evaluator.timestamp):
+                for callback in self.subscribers:
+                    callback(name, evaluator.value, evaluator)
+        return diff
+
+    def read(self, reference):
+        linker_name, section, key = reference.split("/", 2)
+        linker = self.linkers.get(linker_name)
+        entry = linker.data.get(section, {}).get(key) if linker is not None else None
+        return None if entry is None else entry["Value"]
+
+    def poll(self):
+        '''
+            SCHEDULER.register(runtime.poll)로 링커 모니터링 주기마다 호출
+        '''
+        for reference in list(self.references):
+            self.on_value(reference, self.read(reference))
+
+    def on_value(self, reference, value, timestamp=None):
+        previous = self.previous.get(reference)
+        self.previous[reference] = value
+        if previous is None or value is None or bool(previous) == bool(value):
+            return
+        edge = RISING if value else FALLING
+        timestamp = timestamp or datetime.now()
+        for evaluator, index, expected in self.references.get(reference, ()):
+            if expected in (edge, BOTH) and evaluator.on_edge(index, timestamp):
+                for callback in self.subscribers:
+                    callback(evaluator.name, evaluator.value, evaluator)
+
+    def value(self, name, measure=None):
+        evaluator = self.evaluators[name]
+        return evaluator.value if measure is None else evaluator.measure(measure)
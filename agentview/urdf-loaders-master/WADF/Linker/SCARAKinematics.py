@@ -0,0 +1,131 @@
+"""
+WADF SCARA 기구학 모듈
+INP3 URDF의 SCARA 관절 배치(jointId=[6, 7, 9, 8, 10, 12])에 대한 정기구학/역기구학을 NumPy로 계산
+    6: Rotation_31  (theta1, +z)
+    7: Rotation_36  (theta2, +z)
+    9: Rotation_151 (theta3, -z)
+    8: Slider_44    (d1, +z)
+    10: Slider_41   (d2, 그리퍼 L)
+    12: Slider_42   (d3, 그리퍼 R)
+
+관절 배열 순서는 MoveAbsolute와 동일한 [theta1, theta2, theta3, d1, d2, d3]
+위치 배열 순서는 WDF의 SCARA_monitoring_position_[x, y, z, rx, ry, rz]
+(N, 6) 배열을 받아 녹화된 궤적 전체를 한 번에 계산할 수 있음
+"""
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+'''
+INP3.urdf 기준 상수 (모든 관절 rpy = 0, 회전축은 z)
+'''
+URDF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "urdf", "INP3", "INP3", "INP3.urdf")
+BASE_OFFSET = np.array([-0.596, -0.336, 0.874])     # base_link -> J1_BASE_UNIT (Rigid_13 + Rigid_8 + Rigid_30)
+J1_ORIGIN = np.array([0.064525, 0.069853, 0.1771])   # Rotation_31
+J2_ORIGIN = np.array([0.2, 0.0, 0.0281])             # Rotation_36
+J3_ORIGIN = np.array([-0.331475, -0.266146, 1.0133]) # Slider_44
+J4_ORIGIN = np.array([0.531475, 0.266146, -1.0795])  # Rotation_151
+TOOL_OFFSET = np.array([0.0, 0.0, -0.078575])        # 그리퍼 핑거(Slider_41/42) 중심
+
+JOINT_NAMES = ["Rotation_31", "Rotation_36", "Rotation_151", "Slider_44", "Slider_41", "Slider_42"]
+JOINT_LOWER = np.array([-2.094395, -2.094395, -np.inf, -0.05, 0.0, 0.0])
+JOINT_UPPER = np.array([2.094395, 2.094395, np.inf, 0.05, 0.0135, 0.0135])
+
+POSITION_NAMES = ["x", "y", "z", "rx", "ry", "rz"]
+
+class SCARAKinematics():
+    def __init__(self, base_offset=BASE_OFFSET, j1_origin=J1_ORIGIN, j2_origin=J2_ORIGIN,
+                 j3_origin=J3_ORIGIN, j4_origin=J4_ORIGIN, tool_offset=TOOL_OFFSET,
+                 lower=JOINT_LOWER, upper=JOINT_UPPER):
+        self.shoulder = np.asarray(base_offset, dtype=float) + np.asarray(j1_origin, dtype=float)
+        self.link1 = np.asarray(j2_origin, dtype=float)
+        self.link2 = np.asarray(j3_origin, dtype=float) + np.asarray(j4_origin, dtype=float)
+        self.tool = np.asarray(tool_offset, dtype=float)
+
+        self.l1 = float(np.hypot(self.link1[0], self.link1[1]))
+        self.l2 = float(np.hypot(self.link2[0], self.link2[1]))
+        self.a1 = float(np.arctan2(self.link1[1], self.link1[0]))
+        self.a2 = float(np.arctan2(self.link2[1], self.link2[0]))
+        self.z0 = self.shoulder[2] + self.link1[2] + self.link2[2] + self.tool[2]
+
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+
+    @classmethod
+    def from_urdf(cls, urdf_path=URDF_PATH, **kwargs):
+        '''
+            URDF 파일에서 SCARA 관절 원점과 한계값을 읽어 생성 (base_offset은 kwargs로 지정)
+        '''
+        root = ET.parse(urdf_path).getroot()
+        joints = {joint.get("name"): joint for joint in root.findall("joint")}
+
+        def origin(name):
+            return np.array([float(v) for v in joints[name].find("origin").get("xyz").split()])
+
+        lower, upper = JOINT_LOWER.copy(), JOINT_UPPER.copy()
+        for i, name in enumerate(JOINT_NAMES):
+            limit = joints[name].find("limit")
+            if limit is not None and joints[name].get("type") != "continuous":
+                lower[i] = float(limit.get("lower"))
+                upper[i] = float(limit.get("upper"))
+
+        return cls(j1_origin=origin("Rotation_31"), j2_origin=origin("Rotation_36"),
+                   j3_origin=origin("Slider_44"), j4_origin=origin("Rotation_151"),
+                   lower=lower, upper=upper, **kwargs)
+
+    def forward(self, joints):
+        '''
+            joints: (6,) 또는 (N, 6) [theta1, theta2, theta3, d1, d2, d3]
+            return: 같은 배치 형태의 [x, y, z, rx, ry, rz]
+        '''
+        q = np.asarray(joints, dtype=float)
+        single = q.ndim == 1
+        q = np.atleast_2d(q)
+
+        phi1 = q[:, 0]
+        phi2 = q[:, 0] + q[:, 1]
+        pose = np.zeros((q.shape[0], 6))
+        pose[:, 0] = self.shoulder[0] + self.l1 * np.cos(phi1 + self.a1) + self.l2 * np.cos(phi2 + self.a2)
+        pose[:, 1] = self.shoulder[1] + self.l1 * np.sin(phi1 + self.a1) + self.l2 * np.sin(phi2 + self.a2)
+        pose[:, 2] = self.z0 + q[:, 3]
+        pose[:, 5] = phi2 - q[:, 2]     # Rotation_151 회전축이 -z
+        return pose[0] if single else pose
+
+    def inverse(self, pose, elbow=1, gripper=(0.0, 0.0)):
+        '''
+            pose: (4,) 이상 또는 (N, 4) 이상 [x, y, z, (rx, ry,) rz] - rx, ry는 무시
+            elbow: 1 | -1 (theta2 부호), 관절 한계를 벗어나면 반대 해를 사용
+            return: [theta1, theta2, theta3, d1, d2, d3], 도달 불가능한 목표는 NaN
+        '''
+        p = np.atleast_2d(np.asarray(pose, dtype=float))
+        single = np.asarray(pose).ndim == 1
+        x, y, z = p[:, 0], p[:, 1], p[:, 2]
+        rz = p[:, -1]
+
+        px = x - self.shoulder[0]
+        py = y - self.shoulder[1]
+        c2 = (px ** 2 + py ** 2 - self.l1 ** 2 - self.l2 ** 2) / (2.0 * self.l1 * self.l2)
+        reachable = np.abs(c2) <= 1.0
+        c2 = np.clip(c2, -1.0, 1.0)
+
+        q = np.full((p.shape[0], 6), np.nan)
+        for sign in (elbow, -elbow):
+            beta = sign * np.arccos(c2)
+            theta1 = np.arctan2(py, px) - np.arctan2(self.l2 * np.sin(beta), self.l1 + self.l2 * np.cos(beta)) - self.a1
+            theta2 = beta + self.a1 - self.a2
+            theta1 = (theta1 + np.pi) % (2.0 * np.pi) - np.pi
+            theta2 = (theta2 + np.pi) % (2.0 * np.pi) - np.pi
+
+            candidate = np.stack([theta1, theta2, theta1 + theta2 - rz, z - self.z0,
+                                  np.full_like(x, gripper[0]), np.full_like(x, gripper[1])], axis=1)
+            valid = reachable & np.all((candidate >= self.lower) & (candidate <= self.upper), axis=1)
+            fill = valid & np.isnan(q[:, 0])
+            q[fill] = candidate[fill]
+        return q[0] if single else q
+
+def position_variables(pose, prefix="SCARA_monitoring_position"):
+    '''
+        [x, y, z, rx, ry, rz] -> {"SCARA_monitoring_position_x": ..., ...}
+    '''
+    return {f"{prefix}_{name}": float(value) for name, value in zip(POSITION_NAMES, pose)}
@@ -1,6 +1,14 @@
-from WADF.Linker.DeviceDriverDefinition import ASCR_DRIVER, VSCR_DRIVER
+from WADF.Linker.DeviceDriverDefinition import ASCR_DRIVER, VSCR_DRIVER, VSCR_ROBOT_ID, VSCR_JOINT_IDS, VSIM_STEPPER
 from WADF.Linker.CommonDecorators import data_store_decorator
+from WADF.Linker.ModeDispatch import compile_mode_table
+from WADF.Linker.LinkerLogger import get_logger
+from WADF.Linker.LinkerProfiler import PROFILER
+from WADF.Linker.LinkerScheduler import SCHEDULER
+from WADF.Linker.SCARAKinematics import SCARAKinematics, position_variables
+from WADF.Linker.SCARASequence import PROGRAMS, PROGRAM_NUMBERS, JOINT_TOLERANCE
 from Parser.WDFParser import *
+import time
+from datetime import datetime
 from PySide2.QtCore import QRunnable, QEventLoop, QThreadPool, Signal, QObject, QTimer
 import numpy as np
 '''
@@ -18,24 +26,31 @@ class SCARARobot():
         '''
         Modified Part
         '''
-        # self.wdf_path = wdf_path
-        # wdf = WDFParser(self.wdf_path)
-        # self.wdf = wdf.value
+        self.wdf_path = wdf_path
+        wdf = WDFParser(self.wdf_path)
+        self.wdf = wdf.value
         
-        # self.linker_name = self.__class__.__name__
-        # self.data = self.wdf[wdf.workcell_name][self.linker_name]
+        self.linker_name = self.__class__.__name__
+        self.data = self.wdf[wdf.workcell_name]["SCARA"]     # WDF DeviceName은 SCARA (변수 이름도 SCARA_...)
         '''
         '''
+        self.log = get_logger(self.__class__.__name__)
         self.is_running = False
         self.thread_pool = QThreadPool()
         self.task_done = TaskSignal()
         self.task_done.result_signal.connect(self.update_linker_state)
+        self.impl = compile_mode_table(self, self.mode)
+
+        self.kinematics = SCARAKinematics.from_urdf()
+        self.joint_state = np.zeros(6)  # 마지막 지령 관절값 [theta1, theta2, theta3, d1, d2, d3]
+        SCHEDULER.register(self.get_position)
 
     def switch_mode(self, mode):
+        self.impl = compile_mode_table(self, mode)  # 테이블 전체를 한 번에 교체 (폴링 중에도 안전)
         self.mode = mode
         
     def update_linker_state(self, result):
-        print(f"result: {result}")
+        self.log.debug("result: %s", result)
         self.is_running = False # Decorator에서 장비 상태 업데이트 수행
 
     def msleep(self, delay_ms):
@@ -43,200 +58,164 @@ class SCARARobot():
         QTimer.singleShot(int(delay_ms), loop.quit)
         loop.exec_()
 
+    def move_virtual(self, theta1=None, theta2=None, theta3=None, d1=None, d2=None, d3=None):
+        '''
+            가상 드라이버에 MoveAbsolute를 전달하고 지령 관절값을 joint_state에 기록 (None은 현재값 유지)
+            pybullet 호출이므로 시뮬레이션 스텝과 같은 physics_lock 안에서 전달
+        '''
+        with VSIM_STEPPER.physics_lock:
+            self.virtual_driver.MoveAbsolute(theta1=theta1, theta2=theta2, theta3=theta3, d1=d1, d2=d2, d3=d3)
+        for i, value in enumerate((theta1, theta2, theta3, d1, d2, d3)):
+            if value is not None:
+                self.joint_state[i] = value
+
+    def get_position(self):
+        '''
+            SCARA_monitoring_position_[x, y, z, rx, ry, rz]를 계산하여 링커 데이터 저장소(Monitoring)에 기록
+            VirtualMode에서 시뮬레이션 스텝이 진행 중이면 스냅샷의 실제 관절값, 아니면 joint_state 사용
+        '''
+        joints = None
+        if self.mode == "VirtualMode":
+            joints = VSIM_STEPPER.latest().joint_positions(VSCR_ROBOT_ID, VSCR_JOINT_IDS)
+        pose = self.kinematics.forward(self.joint_state if joints is None else joints)
+        time_stamp = datetime.now()
+        monitoring = self.data["Monitoring"]
+        for key, value in position_variables(pose).items():
+            monitoring[key]["Value"] = value
+            monitoring[key]["Timestamp"] = time_stamp
+        return pose
+
     def connect(self):
-        if self.mode == "ActualMode":
-            self.actual_driver.connect()
-        elif self.mode == "VirtualMode":
-            self.virtual_driver.set_power(1)
-        elif self.mode == "DigitalTwinMode":
-            self.actual_driver.connect()
-            self.virtual_driver.set_power(1)
+        return self.impl["connect"]()
 
     def set_power(self, power):
-
-        if self.mode == "ActualMode":
-            pass
-        elif self.mode == "VirtualMode":
-            self.virtual_driver.set_power(power)
-        elif self.mode == "DigitalTwinMode":
-            pass
+        return self.impl["set_power"](power)
 
     # @data_store_decorator
     def set_absPosition(self, theta1=None, theta2=None, theta3=None, d1=None, d2=None, d3=None):
-        if self.mode == "ActualMode":
-            pass
-        elif self.mode == "VirtualMode":
-            self.virtual_driver.MoveAbsolute(theta1=theta1, theta2=theta2, theta3=theta3, d1=d1, d2=d2, d3=d3)
-        elif self.mode == "DigitalTwinMode":
-            pass
+        return self.impl["set_absPosition"](theta1=theta1, theta2=theta2, theta3=theta3, d1=d1, d2=d2, d3=d3)
 
     def set_program(self, program):
-        if self.mode == "ActualMode":
-            print(f"program:{program}")
-            self.actual_driver.set_program(program)
-        elif self.mode == "VirtualMode":
-            if program == "GRIPPER_TEST2_01":
-                self.virtual_driver.MoveAbsolute(np.deg2rad(-22.3), np.deg2rad(1.4), np.deg2rad(69.3), 0.0, None, None)
-                self.msleep(1000)
-
-            elif program == "GRIPPER_TEST2_02":
-                self.virtual_driver.MoveAbsolute(None, None, None, -0.045, None, None)
-                self.msleep(7000)
-
-            elif program == "GRIPPER_TEST2_03":
-                self.virtual_driver.MoveAbsolute(None, None, None, None, 0.0135, 0.0135)
-                self.msleep(500)
-
-            elif program == "GRIPPER_TEST2_04":
-                self.virtual_driver.MoveAbsolute(None, None, None, None, 0.0135, 0.0135)
-                self.msleep(500)
-
-            elif program == "GRIPPER_TEST2_05":
-                self.msleep(500)
-
-            elif program == "GRIPPER_TEST2_06":
-                self.msleep(500)
-
-            elif program == "GRIPPER_TEST2_07":
-                self.virtual_driver.MoveAbsolute(None, None, None, 0.0, None, None)
-                self.msleep(7000)
-
-            elif program == "GRIPPER_TEST2_08":
-                self.virtual_driver.MoveAbsolute(np.deg2rad(85), np.deg2rad(-65), np.deg2rad(200), None, None, None)
-                self.msleep(3000)
-
-            elif program == "GRIPPER_TEST2_09":
-                self.virtual_driver.MoveAbsolute(None, None, None, -0.02, None, None)
-                self.msleep(2000)
-
-            elif program == "GRIPPER_TEST2_10":
-                self.virtual_driver.MoveAbsolute(None, None, None, -0.04, None, None)
-                self.msleep(2500)
-
-            elif program in ["GRIPPER_TEST2_11", "GRIPPER_TEST2_12", "GRIPPER_TEST2_13", "GRIPPER_TEST2_14", "GRIPPER_TEST2_15"]:
-                self.msleep(1000)
-
-            elif program == "GRIPPER_TEST2_16":
-                self.virtual_driver.MoveAbsolute(None, None, None, None, 0.0, 0.0)
-                self.msleep(500)
-
-            elif program in ["GRIPPER_TEST2_17", "GRIPPER_TEST2_18", "GRIPPER_TEST2_19"]:
-                self.msleep(500)
-
-            elif program == "GRIPPER_TEST2_20":
-                self.virtual_driver.MoveAbsolute(None, None, None, 0.0, None, None)
-                self.msleep(3000)
+        self.record_program(program)
+        return self.impl["set_program"](program)
 
-            elif program == "GRIPPER_TEST2_21":
-                self.virtual_driver.MoveAbsolute(np.deg2rad(0.0), np.deg2rad(0.0), np.deg2rad(90.0), 0.0, None, None)
-                self.msleep(3000)
-                
-        elif self.mode == "DigitalTwinMode":
-            if program == "GRIPPER_TEST2_01":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', np.deg2rad(-22.3), np.deg2rad(1.4), np.deg2rad(69.3), 0.0, None, None)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
-
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-
-                self.msleep(1000)
-
-            elif program == "GRIPPER_TEST2_02":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', None, None, None, -0.045, None, None)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
-
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-                self.msleep(7000)
-
-            elif program == "GRIPPER_TEST2_03":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', None, None, None, None, 0.0135, 0.0135)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
-
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-                self.msleep(500)
-
-            elif program == "GRIPPER_TEST2_04":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', None, None, None, None, 0.0135, 0.0135)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
-
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-                self.msleep(500)
-
-            elif program == "GRIPPER_TEST2_05":
-                self.actual_driver.set_program(program)
-                self.msleep(500)
-
-            elif program == "GRIPPER_TEST2_06":
-                self.actual_driver.set_program(program)
-                self.msleep(500)
-
-            elif program == "GRIPPER_TEST2_07":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', None, None, None, 0.0, None, None)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
-
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-                self.msleep(7000)
-
-            elif program == "GRIPPER_TEST2_08":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', np.deg2rad(85), np.deg2rad(-65), np.deg2rad(200), None, None, None)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
-
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-                self.msleep(3000)
-
-            elif program == "GRIPPER_TEST2_09":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', None, None, None, -0.02, None, None)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
+    def record_program(self, program):
+        '''
+            SCARA_control_program_arg(UInt16)에 프로그램 번호 기록 (run_sequence도 같은 경로로 기록)
+            ex) GRIPPER_TEST2_03 -> 3, 정수로 지정한 프로그램은 그대로 기록
+        '''
+        entry = self.data["Control"]["SCARA_control_program_arg"]
+        entry["Value"] = program if isinstance(program, int) else PROGRAM_NUMBERS.get(program)
+        entry["Timestamp"] = datetime.now()
 
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-                self.msleep(2000)
+    def wait_reached(self, goal, timeout_ms, tolerance=JOINT_TOLERANCE):
+        '''
+            시뮬레이션 스냅샷의 관절값이 goal에 tolerance 이내로 도달할 때까지 대기, timeout_ms가 지나면 False
+            스텝이 진행 중이 아니면 도달 여부를 알 수 없으므로 timeout_ms(원래 대기 시간)만큼 대기
+        '''
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        while True:
+            joints = VSIM_STEPPER.latest().joint_positions(VSCR_ROBOT_ID, VSCR_JOINT_IDS) if VSIM_STEPPER.running else None
+            if joints is not None and np.all(np.abs(np.asarray(joints) - goal) <= tolerance):
+                return True
+            remaining_ms = (deadline - time.monotonic()) * 1000.0
+            if remaining_ms <= 0.0:
+                return False
+            self.msleep(min(VSIM_STEPPER.period_ms, remaining_ms))
+
+    def run_sequence(self, programs, optimizer=None):
+        '''
+            programs: 프로그램 이름 목록 (ex. [step.name for step in GRIPPER_TEST2])
+            VirtualMode에서 optimizer(SequenceOptimizer)를 주면 최적화된 계획으로 실행, 그 외에는 프로그램을 순서대로 실행
+            이동 세그먼트는 예측 시간만큼 기다리지 않고 관절이 목표에 도달할 때까지 대기 (상한은 PlanSegment.dwell_ms)
+            return: 최적화 리포트 또는 None
+        '''
+        if optimizer is None or self.mode != "VirtualMode":
+            for program in programs:
+                self.set_program(program)
+            return None
+
+        plan = optimizer.optimize([PROGRAMS[program] for program in programs], start=self.joint_state)
+        for segment in plan.segments:
+            for program in segment.names:
+                self.record_program(program)
+            if segment.kind == "wait":
+                self.msleep(segment.duration_ms)
+                continue
+
+            start = time.monotonic()
+            elapsed = 0.0
+            for send_at, target in segment.commands:     # 블렌딩 경유점은 정지하지 않으므로 예측 시각에 전송
+                if send_at > elapsed:
+                    self.msleep(send_at - elapsed)
+                    elapsed = send_at
+                self.move_virtual(*target)
+            timeout_ms = segment.dwell_ms - (time.monotonic() - start) * 1000.0
+            if not self.wait_reached(segment.goal, timeout_ms):
+                self.log.warning("%s: target not reached within %.0f ms", "+".join(segment.names), segment.dwell_ms)
+        self.log.info("sequence %s..%s: predicted %.2f s -> %.2f s", programs[0], programs[-1],
+                      plan.report["original_ms"] / 1000.0, plan.report["optimized_ms"] / 1000.0)
+        return plan.report
+
+    '''
+        모드별 구현 (switch_mode에서 self.impl로 바인딩)
+    '''
+    def _connect_actual(self):
+        self.actual_driver.connect()
+
+    def _connect_virtual(self):
+        with VSIM_STEPPER.physics_lock:
+            self.virtual_driver.set_power(1)
 
-            elif program == "GRIPPER_TEST2_10":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', None, None, None, -0.04, None, None)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
+    def _connect_digitaltwin(self):
+        self.actual_driver.connect()
+        with VSIM_STEPPER.physics_lock:
+            self.virtual_driver.set_power(1)
 
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-                self.msleep(2500)
+    def _set_power_actual(self, power):
+        pass
 
-            elif program in ["GRIPPER_TEST2_11", "GRIPPER_TEST2_12", "GRIPPER_TEST2_13", "GRIPPER_TEST2_14", "GRIPPER_TEST2_15"]:
-                self.actual_driver.set_program(program)
-                self.msleep(1000)
+    def _set_power_virtual(self, power):
+        with VSIM_STEPPER.physics_lock:
+            self.virtual_driver.set_power(power)
 
-            elif program == "GRIPPER_TEST2_16":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', None, None, None, None, 0.0, 0.0)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
+    def _set_power_digitaltwin(self, power):
+        pass
 
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-                self.msleep(500)
+    def _set_absPosition_actual(self, theta1=None, theta2=None, theta3=None, d1=None, d2=None, d3=None):
+        pass
 
-            elif program in ["GRIPPER_TEST2_17", "GRIPPER_TEST2_18", "GRIPPER_TEST2_19"]:
-                self.actual_driver.set_program(program)
-                self.msleep(500)
+    def _set_absPosition_virtual(self, theta1=None, theta2=None, theta3=None, d1=None, d2=None, d3=None):
+        self.move_virtual(theta1=theta1, theta2=theta2, theta3=theta3, d1=d1, d2=d2, d3=d3)
 
-            elif program == "GRIPPER_TEST2_20":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', None, None, None, 0.0, None, None)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
+    def _set_absPosition_digitaltwin(self, theta1=None, theta2=None, theta3=None, d1=None, d2=None, d3=None):
+        pass
 
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
-                self.msleep(3000)
+    def _set_program_actual(self, program):
+        self.log.info("program:%s", program)
+        self.actual_driver.set_program(program)
 
-            elif program == "GRIPPER_TEST2_21":
-                control_task_1 = ControlTask(self.task_done, 1500, self.virtual_driver, 'MoveAbsolute', np.deg2rad(0.0), np.deg2rad(0.0), np.deg2rad(90.0), 0.0, None, None)
-                control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
+    def _set_program_virtual(self, program):
+        step = PROGRAMS.get(program)    # GRIPPER_TEST2_xx: SCARASequence.GRIPPER_TEST2
+        if step is None:
+            return
+        if step.target is not None:
+            self.move_virtual(*step.target)
+        self.msleep(step.dwell_ms)
 
-                self.thread_pool.start(control_task_1)
-                self.thread_pool.start(control_task_2)
+    def _set_program_digitaltwin(self, program):
+        step = PROGRAMS.get(program)    # GRIPPER_TEST2_xx: SCARASequence.GRIPPER_TEST2
+        if step is None:
+            return
+        if step.target is None:
+            self.actual_driver.set_program(program)
+        else:
+            control_task_1 = ControlTask(self.task_done, 1500, self, 'move_virtual', *step.target)
+            control_task_2 = ControlTask(self.task_done, 1500, self.actual_driver, 'set_program', program)
 
-                self.msleep(3000)
+            self.thread_pool.start(control_task_1)
+            self.thread_pool.start(control_task_2)
+        self.msleep(step.dwell_ms)
 
 class TaskSignal(QObject):
     task_done = Signal(object)
@@ -251,15 +230,18 @@ class ControlTask(QRunnable):
         self.driver = driver
         self.method_name = method_name
         self.args = args
+        self.queued_ns = time.perf_counter_ns()
 
 
     def run(self):
+        if PROFILER.enabled:
+            PROFILER.record("queue", f"{self.__class__.__name__}.{self.method_name}", self.queued_ns, time.perf_counter_ns())
         if hasattr(self.driver, self.method_name):
             method = getattr(self.driver, self.method_name)
             method(*self.args)
             
         else:
-            print(f"Error: {self.method_name} not found in {self.driver}")
+            get_logger(self.__class__.__name__).error("Error: %s not found in %s", self.method_name, self.driver)
         
 class MonitoringTask(QRunnable):
     def __init__(self, driver, method_name, *args):
@@ -273,4 +255,4 @@ class MonitoringTask(QRunnable):
             method = getattr(self.driver, self.method_name)
             result = method(*self.args)
         else:
-            print(f"Error: {self.method_name} not found in {self.driver}")
\ No newline at end of file
+            get_logger(self.__class__.__name__).error("Error: %s not found in %s", self.method_name, self.driver)
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""
+WADF SCARA 시퀀스 최적화 모듈
+GRIPPER_TEST2_xx 프로그램을 (관절 목표, 대기 시간) 데이터로 정의하고, 같은 경유점을 지나는 더 짧은 실행 계획을 생성
+    - 현재 지령값과 같은 이동(ex. 03 다음의 04)은 제거하고, 그 대기 시간은 앞 이동의 도달 대기 상한에 더함
+    - 연속된 대기 스텝(05-06, 11-15, 17-19)은 하나로 합침 (스텝 호출 오버헤드만 절약, 대기 시간은 유지)
+    - 이동 뒤 대기는 사다리꼴 속도 프로파일로 예측한 이동 시간 + settle_ms로 맞춤
+      (원래 대기가 이동보다 짧으면 늘림, ex. 03/16 그리퍼 875 ms 이동의 500 ms 대기)
+    - 같은 관절을 같은 방향으로 움직이는 연속 이동(ex. 09-10)은 경유점에서 멈추지 않고 이어서 이동 (포물선 블렌딩)
+      방향이 바뀌거나 움직이는 관절이 다르면 블렌딩하지 않음 (ex. 하강 후 그리퍼, 상승 후 회전은 순서 유지)
+    - 모든 목표는 관절 한계(SCARAKinematics.JOINT_LOWER/UPPER) 안에 있어야 함
+    - 계획은 원래 스텝의 목표(step.target)를 그대로 전송하며, 원래 시퀀스와 같은 관절 상태를 같은 순서로 지나는지 검사
+    - 줄인 대기 시간은 예측값이므로 실행 시에는 관절이 목표에 도달할 때까지 기다림
+      (SCARARobot.run_sequence, 원래 대기 시간과 예측 시간 중 긴 쪽이 상한)
+
+관절 배열 순서는 MoveAbsolute와 동일한 [theta1, theta2, theta3, d1, d2, d3], None은 현재값 유지
+"""
+import numpy as np
+
+from WADF.Linker.SCARAKinematics import JOINT_LOWER, JOINT_UPPER
+
+'''
+관절별 속도/가속도 한계 (가상 SCARA 기준 추정값, 실제 장비 사양에 맞게 조정)
+'''
+JOINT_MAX_VELOCITY = np.array([1.5, 1.5, 3.0, 0.05, 0.02, 0.02])        # rad/s, m/s
+JOINT_MAX_ACCELERATION = np.array([3.0, 3.0, 6.0, 0.2, 0.1, 0.1])       # rad/s^2, m/s^2
+JOINT_TOLERANCE = np.array([0.01, 0.01, 0.01, 0.0005, 0.0005, 0.0005])  # 도달 판정 허용 오차 (rad, m)
+EPSILON = 1e-6
+
+class SequenceStep():
+    __slots__ = ("name", "target", "dwell_ms")
+
+    def __init__(self, name, target, dwell_ms):
+        '''
+            target: 6개 관절 목표 (None 허용) 또는 None(대기 스텝), dwell_ms: 스텝 후 대기 시간
+        '''
+        self.name = name
+        self.target = target
+        self.dwell_ms = dwell_ms
+
+    def __repr__(self):
+        return f"SequenceStep({self.name}, {self.target}, {self.dwell_ms})"
+
+
+def deg(*values):
+    return tuple(None if value is None else float(np.deg2rad(value)) for value in values)
+
+GRIPPER_TEST2 = [
+    SequenceStep("GRIPPER_TEST2_01", deg(-22.3, 1.4, 69.3) + (0.0, None, None), 1000),
+    SequenceStep("GRIPPER_TEST2_02", (None, None, None, -0.045, None, None), 7000),
+    SequenceStep("GRIPPER_TEST2_03", (None, None, None, None, 0.0135, 0.0135), 500),
+    SequenceStep("GRIPPER_TEST2_04", (None, None, None, None, 0.0135, 0.0135), 500),
+    SequenceStep("GRIPPER_TEST2_05", None, 500),
+    SequenceStep("GRIPPER_TEST2_06", None, 500),
+    SequenceStep("GRIPPER_TEST2_07", (None, None, None, 0.0, None, None), 7000),
+    SequenceStep("GRIPPER_TEST2_08", deg(85, -65, 200) + (None, None, None), 3000),
+    SequenceStep("GRIPPER_TEST2_09", (None, None, None, -0.02, None, None), 2000),
+    SequenceStep("GRIPPER_TEST2_10", (None, None, None, -0.04, None, None), 2500),
+    SequenceStep("GRIPPER_TEST2_11", None, 1000),
+    SequenceStep("GRIPPER_TEST2_12", None, 1000),
+    SequenceStep("GRIPPER_TEST2_13", None, 1000),
+    SequenceStep("GRIPPER_TEST2_14", None, 1000),
+    SequenceStep("GRIPPER_TEST2_15", None, 1000),
+    SequenceStep("GRIPPER_TEST2_16", (None, None, None, None, 0.0, 0.0), 500),
+    SequenceStep("GRIPPER_TEST2_17", None, 500),
+    SequenceStep("GRIPPER_TEST2_18", None, 500),
+    SequenceStep("GRIPPER_TEST2_19", None, 500),
+    SequenceStep("GRIPPER_TEST2_20", (None, None, None, 0.0, None, None), 3000),
+    SequenceStep("GRIPPER_TEST2_21", deg(0.0, 0.0, 90.0) + (0.0, None, None), 3000),
+]
+PROGRAMS = {step.name: step for step in GRIPPER_TEST2}
+PROGRAM_NUMBERS = {step.name: number for number, step in enumerate(GRIPPER_TEST2, 1)}    # SCARA_control_program_arg (UInt16)
+
+
+class PlanSegment():
+    def __init__(self, names, kind, duration_ms, commands=(), dwell_ms=None, goal=None):
+        '''
+            kind: "move" | "wait"
+            duration_ms: 예측 소요 시간, dwell_ms: 도달 대기 상한 (원래 스텝 대기 시간의 합과 예측 시간 중 긴 쪽)
+            commands: [(send_at_ms, target)] 세그먼트 시작 기준 MoveAbsolute 전송 시각과 원래 스텝 목표
+            goal: 세그먼트가 끝났을 때의 6개 관절 목표 (move)
+        '''
+        self.names = list(names)
+        self.kind = kind
+        self.duration_ms = duration_ms
+        self.commands = list(commands)
+        self.dwell_ms = duration_ms if dwell_ms is None else dwell_ms
+        self.goal = goal
+
+    def __repr__(self):
+        return f"PlanSegment({'+'.join(self.names)}, {self.kind}, {self.duration_ms:.0f} ms)"
+
+
+class SequencePlan():
+    def __init__(self, segments, report):
+        self.segments = segments
+        self.report = report
+
+    def waypoints(self):
+        return [target for segment in self.segments for _, target in segment.commands]
+
+
+def visited_states(targets, start):
+    '''
+        목표 목록을 차례로 적용했을 때 지나는 관절 상태 (값이 바뀌지 않는 목표는 제외)
+    '''
+    state = np.array(start, dtype=float)
+    states = [state.copy()]
+    for target in targets:
+        for i, value in enumerate(target):
+            if value is not None:
+                state[i] = value
+        if np.any(np.abs(state - states[-1]) > EPSILON):
+            states.append(state.copy())
+    return states
+
+
+def trapezoid_time(distance, velocity, acceleration):
+    '''
+        정지 -> 정지 이동 시간과 가속 구간 시간 (삼각형 프로파일 포함)
+    '''
+    if distance <= EPSILON:
+        return 0.0, 0.0
+    ramp = velocity / acceleration
+    if distance < velocity * ramp:      # 최고 속도에 도달하지 못함
+        ramp = np.sqrt(distance / acceleration)
+        return 2.0 * ramp, ramp
+    return distance / velocity + ramp, ramp
+
+
+class SequenceOptimizer():
+    def __init__(self, max_velocity=JOINT_MAX_VELOCITY, max_acceleration=JOINT_MAX_ACCELERATION,
+                 lower=JOINT_LOWER, upper=JOINT_UPPER, settle_ms=100.0, step_overhead_ms=0.0, trim_dwell=True):
+        '''
+            settle_ms: 이동 완료 후 정착 여유 시간
+            step_overhead_ms: 스텝(set_program) 한 번의 호출 오버헤드 (실제 장비 측정값)
+            trim_dwell: False이면 대기 시간을 줄이지 않고 블렌딩도 하지 않음 (중복 제거와 대기 병합만 수행)
+        '''
+        self.max_velocity = np.asarray(max_velocity, dtype=float)
+        self.max_acceleration = np.asarray(max_acceleration, dtype=float)
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.settle_ms = settle_ms
+        self.step_overhead_ms = step_overhead_ms
+        self.trim_dwell = trim_dwell
+
+    def motion_time(self, start, goal):
+        '''
+            모든 관절이 동시에 도착하도록 가장 느린 관절에 맞춘 이동 시간(s)과 가속 구간 시간(s)
+        '''
+        times = [trapezoid_time(abs(g - s), v, a) for s, g, v, a in zip(start, goal, self.max_velocity, self.max_acceleration)]
+        return max(times)
+
+    def resolve(self, steps, start):
+        '''
+            return: [("move", step, start, goal, moved) | ("noop", step) | ("wait", step)]
+        '''
+        state = np.array(start, dtype=float)
+        items = []
+        for step in steps:
+            if step.target is None:
+                items.append(("wait", step))
+                continue
+            goal = state.copy()
+            for i, value in enumerate(step.target):
+                if value is not None:
+                    goal[i] = value
+            if np.any(goal < self.lower - EPSILON) or np.any(goal > self.upper + EPSILON):
+                raise ValueError(f"{step.name}: target {goal.tolist()} is outside the joint limits")
+            moved = np.abs(goal - state) > EPSILON
+            if not moved.any():
+                items.append(("noop", step))
+                continue
+            items.append(("move", step, state, goal, moved))
+            state = goal
+        return items
+
+    def blendable(self, previous, item):
+        '''
+            같은 관절만 같은 방향으로 움직이는 연속 이동
+        '''
+        _, _, start1, goal1, moved1 = previous
+        _, _, start2, goal2, moved2 = item
+        if not np.array_equal(moved1, moved2):
+            return False
+        return bool(np.all(np.sign(goal1 - start1)[moved1] == np.sign(goal2 - start2)[moved2]))
+
+    def optimize(self, steps, start=None):
+        start = np.zeros(6) if start is None else np.asarray(start, dtype=float)
+        items = self.resolve(steps, start)
+        overhead = self.step_overhead_ms
+        report = {"original_ms": sum(step.dwell_ms for step in steps) + overhead * len(steps),
+                  "removed": [], "merged_waits": [], "blended": [], "trimmed_ms": 0.0, "extended_ms": 0.0}
+
+        segments = []
+        previous_move = None        # 마지막 세그먼트가 블렌딩 가능한 이동이면 해당 item
+        for item in items:
+            kind, step = item[0], item[1]
+            if kind == "noop":
+                # 원래 프로그램에서는 앞 이동이 이 스텝의 대기 시간 동안에도 계속되므로 도달 대기 상한에 더함
+                if segments and segments[-1].kind == "move":
+                    segments[-1].dwell_ms += step.dwell_ms + overhead
+                    if not self.trim_dwell:
+                        segments[-1].duration_ms = max(segments[-1].duration_ms, segments[-1].dwell_ms)
+                report["removed"].append(step.name)
+                continue
+
+            if kind == "wait":
+                previous_move = None
+                if segments and segments[-1].kind == "wait":
+                    segments[-1].names.append(step.name)
+                    segments[-1].duration_ms += step.dwell_ms
+                    segments[-1].dwell_ms += step.dwell_ms
+                    report["merged_waits"].append(step.name)
+                else:
+                    segments.append(PlanSegment([step.name], "wait", step.dwell_ms + overhead))
+                continue
+
+            _, _, state, goal, moved = item
+            target = step.target
+            motion_s, ramp_s = self.motion_time(state, goal)
+            # 이동이 끝나기 전에 다음 세그먼트를 시작하지 않도록 예측 시간은 이동 + 정착 시간 이상
+            arrival_ms = motion_s * 1000.0 + self.settle_ms
+            duration_ms = arrival_ms if self.trim_dwell else max(step.dwell_ms, arrival_ms)
+
+            if self.trim_dwell and previous_move is not None and self.blendable(previous_move[0], item):
+                # 이전 이동의 감속 구간과 이번 이동의 가속 구간을 겹침 (경유점은 정지 없이 통과)
+                segment = segments[-1]
+                overlap_ms = min(previous_move[1], ramp_s) * 1000.0
+                send_at = max(segment.commands[-1][0], segment.duration_ms - self.settle_ms - overlap_ms)
+                segment.names.append(step.name)
+                segment.commands.append((send_at, target))
+                segment.duration_ms = send_at + arrival_ms
+                segment.dwell_ms += step.dwell_ms + overhead
+                segment.goal = goal
+                report["blended"].append(step.name)
+            else:
+                segments.append(PlanSegment([step.name], "move", duration_ms + overhead, [(0.0, target)],
+                                            dwell_ms=step.dwell_ms + overhead, goal=goal))
+            previous_move = (item, ramp_s) if self.trim_dwell else None
+
+        for segment in segments:
+            if segment.kind == "move":     # dwell_ms: 여기까지는 원래 대기 시간의 합
+                report["trimmed_ms"] += max(0.0, segment.dwell_ms - segment.duration_ms)
+                report["extended_ms"] += max(0.0, segment.duration_ms - segment.dwell_ms)
+                segment.dwell_ms = max(segment.dwell_ms, segment.duration_ms)
+
+        report["optimized_ms"] = sum(segment.duration_ms for segment in segments)
+        report["saving_ms"] = report["original_ms"] - report["optimized_ms"]
+        report["saving_pct"] = 100.0 * report["saving_ms"] / report["original_ms"] if report["original_ms"] else 0.0
+        report["steps"] = len(steps)
+        report["segments"] = len(segments)
+        plan = SequencePlan(segments, report)
+
+        # resolve 결과가 아닌 원래 스텝 목표로 검사: 같은 관절 상태를 같은 순서로 지나야 함
+        expected = visited_states([step.target for step in steps if step.target is not None], start)
+        visited = visited_states(plan.waypoints(), start)
+        if len(visited) != len(expected) or any(np.any(np.abs(a - b) > EPSILON) for a, b in zip(visited, expected)):
+            raise ValueError("optimized plan does not reach the original waypoints")
+        return plan
+
+
+def format_report(report):
+    lines = [f"steps {report['steps']} -> segments {report['segments']}",
+             f"cycle {report['original_ms'] / 1000.0:.2f} s -> {report['optimized_ms'] / 1000.0:.2f} s "
+             f"({-report['saving_ms'] / 1000.0:+.2f} s, {-report['saving_pct']:+.1f}%)",
+             f"removed no-op steps: {', '.join(report['removed']) or '-'}",
+             f"merged waits: {', '.join(report['merged_waits']) or '-'}",
+             f"blended moves: {', '.join(report['blended']) or '-'}",
+             f"dwell trimmed: {report['trimmed_ms'] / 1000.0:.2f} s",
+             f"dwell extended to motion time: {report['extended_ms'] / 1000.0:.2f} s"]
+    return "\n".join(lines)
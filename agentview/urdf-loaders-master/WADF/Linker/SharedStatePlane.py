@@ -0,0 +1,339 @@
+"""
+WADF 공유 메모리 상태 플레인 모듈
+링커 변수 저장소(linker.data)를 WDF DataType에 맞춘 고정 레이아웃으로 공유 메모리에 게시하여
+UI, OPC UA 서버(WAServer), MQTT 브리지(WACommu)를 별도 프로세스에서 실행할 수 있도록 함
+
+세그먼트 레이아웃
+    header (64 bytes): magic "WADF" | version | schema 길이 | bank 크기 | active bank | generation | writer pid
+    schema: JSON [[경로, DataType], ...]  경로는 "<Device>/<Monitoring|Control>/<VariableName>" (WPF DataReference와 같은 형식)
+    bank 0, bank 1: uint64 seq (64 bytes) + 변수별 레코드 (value, valid, timestamp)
+
+게시 프로토콜 (단일 writer, 더블 버퍼 + 뱅크별 seqlock)
+    writer: 비활성 뱅크 seq를 홀수로 -> 레코드 전체 복사 -> seq를 짝수로 -> active 뱅크 교체
+    reader: active 뱅크의 seq가 짝수인지 확인 -> 복사(또는 zero-copy view) -> seq가 그대로인지 확인
+    reader는 writer가 쓰지 않는 뱅크를 읽으므로 두 번 연속 게시되는 동안 읽는 경우에만 재시도
+    (CPython 메모리뷰 쓰기는 프로그램 순서대로 수행되며 x86(TSO) 기준으로 추가 메모리 배리어 없이 동작)
+
+사용법
+    control 프로세스: plane = SharedStateWriter(wdf_path, {name: linker.data, ...}); SCHEDULER.register(plane.publish)
+    다른 프로세스:     reader = SharedStateReader("wadf_inp"); reader.values()
+    같은 이름의 세그먼트가 있으면 WADF 세그먼트이고 writer 프로세스가 종료된 경우에만 다시 생성, 그 외에는 FileExistsError
+    확인용:            python -m WADF.Linker.SharedStatePlane --name wadf_inp --interval 0.5
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from WADF.Linker.LinkerLogger import get_logger
+
+MAGIC = b"WADF"
+VERSION = 2
+HEADER = struct.Struct("<4sIIQIQ")      # magic, version, schema_len, bank_size, active, generation
+OWNER = struct.Struct("<I")             # writer pid
+HEADER_SIZE = 64
+BANK_HEADER_SIZE = 64
+ALIGN = 64
+ACTIVE_OFFSET = 20
+GENERATION_OFFSET = 24
+OWNER_OFFSET = 32
+STRING_SIZE = 64
+
+VALUE_TYPES = {
+    "Boolean": "?",
+    "SByte": "<i1",
+    "Byte": "<u1",
+    "Int16": "<i2",
+    "UInt16": "<u2",
+    "Int32": "<i4",
+    "UInt32": "<u4",
+    "Int64": "<i8",
+    "UInt64": "<u8",
+    "Int": "<i8",
+    "Integer": "<i8",
+    "Float": "<f8",
+    "Double": "<f8",
+    "String": f"S{STRING_SIZE}",
+}
+INT_TYPES = {data_type for data_type, code in VALUE_TYPES.items() if np.dtype(code).kind in "iu"}
+FLOAT_TYPES = {"Float", "Double"}
+
+def align(size):
+    return (size + ALIGN - 1) // ALIGN * ALIGN
+
+def wdf_schema(wdf_path):
+    '''
+        return: [(경로, DataType)] WDF 파일 순서
+    '''
+    root = ET.parse(wdf_path).getroot()
+    schema = []
+    for device in root.iter("Device"):
+        for section in ("Monitoring", "Control"):
+            node = device.find(section)
+            if node is None:
+                continue
+            for variable in node.findall("Variable"):
+                schema.append((f"{device.get('DeviceName')}/{section}/{variable.get('VariableName')}", variable.get("DataType")))
+    return schema
+
+def record_dtype(schema):
+    '''
+        변수마다 하나의 필드: (value, valid, timestamp)
+    '''
+    return np.dtype([(path, [("value", VALUE_TYPES.get(data_type, f"S{STRING_SIZE}")), ("valid", "u1"), ("timestamp", "<f8")])
+                     for path, data_type in schema])
+
+def encode_value(value, data_type):
+    '''
+        정수형은 범위를 벗어나면 OverflowError (numpy의 조용한 wrap-around 방지)
+    '''
+    if data_type in INT_TYPES:
+        info = np.iinfo(VALUE_TYPES[data_type])
+        value = int(value)
+        if not info.min <= value <= info.max:
+            raise OverflowError(f"{value} is out of range for {data_type}")
+        return value
+    if data_type == "Boolean" or data_type in FLOAT_TYPES:
+        return value
+    return str(value).encode("utf-8")[:STRING_SIZE]
+
+def decode_value(value, data_type):
+    if data_type == "Boolean":
+        return bool(value)
+    if data_type in INT_TYPES:
+        return int(value)
+    if data_type in FLOAT_TYPES:
+        return float(value)
+    return bytes(value).decode("utf-8", "replace")
+
+def attach(name):
+    '''
+        다른 프로세스가 만든 세그먼트 열기 (종료 시 resource_tracker가 세그먼트를 지우지 않도록 등록 해제)
+    '''
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except (ImportError, AttributeError):
+        pass
+    return shm
+
+def owner_alive(pid):
+    '''
+        writer pid가 살아 있는지 확인 (Windows는 마지막 핸들이 닫히면 세그먼트가 사라지므로 항상 사용 중으로 판단)
+    '''
+    if os.name == "nt":
+        return True
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedStateLayout():
+    def __init__(self, buf, schema):
+        self.schema = schema
+        self.types = dict(schema)
+        self.dtype = record_dtype(schema)
+        schema_len = len(json.dumps(schema).encode("utf-8"))
+        self.bank_offset = HEADER_SIZE + align(schema_len)
+        self.bank_size = BANK_HEADER_SIZE + align(self.dtype.itemsize)
+        self.size = self.bank_offset + 2 * self.bank_size
+        self.buf = buf
+        if buf is not None:
+            self.bind(buf)
+
+    def bind(self, buf):
+        self.buf = buf
+        self.seqs = [np.ndarray((1,), "<u8", buf, self.bank_offset + i * self.bank_size) for i in range(2)]
+        self.banks = [np.ndarray((), self.dtype, buf, self.bank_offset + i * self.bank_size + BANK_HEADER_SIZE) for i in range(2)]
+        self.active = np.ndarray((1,), "<u4", buf, ACTIVE_OFFSET)
+        self.generation = np.ndarray((1,), "<u8", buf, GENERATION_OFFSET)
+
+
+class SharedStateWriter():
+    def __init__(self, wdf_path, stores, name="wadf_inp"):
+        '''
+            stores: {DeviceName: linker.data} (링커가 없는 Device의 변수는 valid=0으로 유지)
+            name: 공유 메모리 이름 (같은 이름의 세그먼트는 종료된 writer가 남긴 WADF 세그먼트일 때만 다시 생성)
+        '''
+        self.name = name
+        self.stores = stores
+        self.log = get_logger(self.__class__.__name__)
+        self.layout = SharedStateLayout(None, wdf_schema(wdf_path))
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.layout.size)
+        except FileExistsError:
+            self.reclaim(name)
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.layout.size)
+
+        schema_bytes = json.dumps(self.layout.schema).encode("utf-8")
+        self.shm.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        self.shm.buf[HEADER_SIZE:HEADER_SIZE + len(schema_bytes)] = schema_bytes
+        self.layout.bind(self.shm.buf)
+        HEADER.pack_into(self.shm.buf, 0, MAGIC, VERSION, len(schema_bytes), self.layout.bank_size, 0, 0)
+        OWNER.pack_into(self.shm.buf, OWNER_OFFSET, os.getpid())
+
+        self.mirror = np.zeros((), self.layout.dtype)
+        self.entries = []           # [(경로, DataType, data entry dict)]
+        for path, data_type in self.layout.schema:
+            device, section, variable = path.split("/", 2)
+            entry = stores.get(device, {}).get(section, {}).get(variable)
+            if entry is not None:
+                self.entries.append((path, data_type, entry))
+        self.seen = {}              # 경로 -> 마지막으로 게시한 Timestamp
+        self.publishes = 0
+        self.log.info("%s: %d variables, %d bytes", name, len(self.layout.schema), self.layout.size)
+
+    def reclaim(self, name):
+        '''
+            같은 이름의 세그먼트가 WADF 세그먼트이고 기록된 writer가 종료되었을 때만 삭제, 아니면 FileExistsError
+        '''
+        existing = attach(name)
+        try:
+            if existing.size < OWNER_OFFSET + OWNER.size or bytes(existing.buf[:4]) != MAGIC:
+                raise FileExistsError(f"{name} exists and is not a WADF state plane..!")
+            pid = OWNER.unpack_from(existing.buf, OWNER_OFFSET)[0]
+            if owner_alive(pid):
+                raise FileExistsError(f"{name} is in use by writer pid {pid}..!")
+            generation = HEADER.unpack_from(existing.buf, 0)[5]
+        finally:
+            existing.close()
+        self.log.warning("%s: reclaiming stale segment (writer pid %d exited, generation %d)", name, pid, generation)
+        stale = shared_memory.SharedMemory(name=name)   # resource_tracker 등록과 해제가 짝이 맞도록 다시 열어서 삭제
+        stale.close()
+        stale.unlink()
+
+    def publish(self, force=False):
+        '''
+            마지막 게시 이후 Timestamp가 바뀐 변수만 mirror에 반영하고, 하나라도 바뀌었으면 비활성 뱅크에 게시
+        '''
+        mirror = self.mirror
+        changed = False
+        for path, data_type, entry in self.entries:
+            timestamp = entry.get("Timestamp")
+            if timestamp is self.seen.get(path):
+                continue
+            self.seen[path] = timestamp
+            value = entry.get("Value")
+            record = mirror[path]
+            if value is None:
+                record["valid"] = 0
+            else:
+                try:
+                    record["value"] = encode_value(value, data_type)
+                    record["valid"] = 1
+                except (TypeError, ValueError, OverflowError):
+                    record["valid"] = 0
+            record["timestamp"] = timestamp.timestamp() if isinstance(timestamp, datetime) else 0.0
+            changed = True
+        if not changed and not force:
+            return False
+
+        layout = self.layout
+        back = 1 - int(layout.active[0])
+        layout.seqs[back][0] += 1           # 홀수: 쓰는 중
+        layout.banks[back][...] = mirror
+        layout.seqs[back][0] += 1           # 짝수: 완료
+        layout.active[0] = back
+        layout.generation[0] += 1
+        self.publishes += 1
+        return True
+
+    def close(self):
+        self.layout = None
+        self.mirror = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedStateReader():
+    def __init__(self, name="wadf_inp"):
+        self.shm = attach(name)
+        magic, version, schema_len, bank_size, _, _ = HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.shm.close()
+            raise ValueError(f"{name} is not a WADF state plane (version {version})")
+        schema = [tuple(item) for item in json.loads(bytes(self.shm.buf[HEADER_SIZE:HEADER_SIZE + schema_len]).decode("utf-8"))]
+        self.layout = SharedStateLayout(self.shm.buf, schema)
+        self.retries = 0
+
+    def view(self):
+        '''
+            zero-copy: (active 뱅크 레코드 view, token), 사용 후 valid(token)으로 일관성 확인
+        '''
+        layout = self.layout
+        while True:
+            bank = int(layout.active[0])
+            seq = int(layout.seqs[bank][0])
+            if seq & 1 == 0:
+                return layout.banks[bank], (bank, seq)
+            self.retries += 1
+
+    def valid(self, token):
+        bank, seq = token
+        return int(self.layout.seqs[bank][0]) == seq
+
+    def snapshot(self):
+        '''
+            일관된 복사본 (numpy structured scalar)과 generation
+        '''
+        while True:
+            generation = int(self.layout.generation[0])
+            record, token = self.view()
+            copy = record.copy()
+            if self.valid(token):
+                return copy, generation
+            self.retries += 1
+
+    def values(self):
+        '''
+            return: {경로: (값 또는 None, timestamp)}
+        '''
+        record, _ = self.snapshot()
+        result = {}
+        for path, data_type in self.layout.schema:
+            field = record[path]
+            value = decode_value(field["value"], data_type) if field["valid"] else None
+            result[path] = (value, float(field["timestamp"]))
+        return result
+
+    def get(self, path):
+        return self.values()[path]
+
+    def close(self):
+        self.layout = None
+        self.shm.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WADF shared state plane reader")
+    parser.add_argument("--name", default="wadf_inp")
+    parser.add_argument("--interval", type=float, default=0.5)
+    parser.add_argument("--count", type=int, default=0, help="0이면 계속 출력")
+    args = parser.parse_args(argv)
+
+    reader = SharedStateReader(args.name)
+    n = 0
+    while args.count == 0 or n < args.count:
+        values = {path: value for path, (value, _) in reader.values().items() if value is not None}
+        print(json.dumps({"generation": int(reader.layout.generation[0]), "retries": reader.retries, "values": values}))
+        n += 1
+        time.sleep(args.interval)
+    reader.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+WADF 고정 주기 물리 스텝 모듈
+Qt 이벤트 루프(링커 QTimer, msleep의 중첩 QEventLoop)와 분리된 전용 스레드에서
+WorkcellConfig/UpdateTimeMS 주기로 stepSimulation을 호출
+    - 한 주기를 substeps개의 고정 시간 스텝으로 나누어 계산
+    - 주기가 밀리면 최대 max_catchup 스텝까지 따라잡고, 그 이상은 버리고 overrun으로 기록
+    - 스텝 직후 관절/링크 상태를 새 스냅샷에 기록한 뒤 참조를 교체 (읽는 쪽은 잠금 없음, 가져간 스냅샷은 바뀌지 않음)
+    - 스텝 훅(on_step)으로 일괄 처리 드라이버(근접 센서, 공압 액추에이터)를 같은 스레드에서 갱신
+    - 다른 스레드(링커, 엣지 퍼블리셔, 스레드 풀)의 pybullet 호출은 PHYSICS_LOCK으로 stepSimulation과 직렬화
+"""
+import threading
+import time
+from collections import deque
+
+import pybullet as p
+from WADF.Linker.LinkerLogger import get_logger
+
+'''
+pybullet 클라이언트 공용 잠금 (스텝 스레드는 스텝과 훅 실행 동안 보유)
+가상 드라이버 호출(MoveAbsolute, 컨베이어 power_on/off, 레이 계산 등)은 이 잠금 안에서 수행
+'''
+PHYSICS_LOCK = threading.RLock()
+
+class StateSnapshot():
+    __slots__ = ("step_id", "sim_time", "monotonic_ns", "joints", "links")
+
+    def __init__(self):
+        self.step_id = 0
+        self.sim_time = 0.0
+        self.monotonic_ns = 0
+        self.joints = {}    # (robotId, jointId) -> (position, velocity)
+        self.links = {}     # (robotId, linkId) -> (worldPosition, worldOrientation)
+
+    def joint_positions(self, robotId, jointIds):
+        '''
+            기록된 관절 위치 목록, 아직 기록되지 않은 관절이 있으면 None
+        '''
+        try:
+            return [self.joints[(robotId, joint)][0] for joint in jointIds]
+        except KeyError:
+            return None
+
+    def link_pose(self, robotId, linkId):
+        return self.links.get((robotId, linkId))
+
+
+class SimulationStepper():
+    def __init__(self, period_ms=20.0, substeps=1, max_catchup=4, physicsClientId=0, stats_window=250, physics_lock=None):
+        '''
+            period_ms: 스텝 주기 (WorkcellConfig/UpdateTimeMS)
+            substeps: 주기당 stepSimulation 호출 수 (fixedTimeStep = period / substeps)
+            max_catchup: 한 번에 따라잡을 최대 주기 수, 초과분은 버림
+            physics_lock: pybullet 호출 직렬화 잠금 (기본 PHYSICS_LOCK)
+        '''
+        self.period_ms = period_ms
+        self.substeps = substeps
+        self.max_catchup = max_catchup
+        self.physicsClientId = physicsClientId
+
+        self.hooks = []             # hook(dt)
+        self.tracked_joints = []    # (robotId, [jointId, ...])
+        self.tracked_links = []     # (robotId, [linkId, ...])
+
+        self.front = StateSnapshot()
+
+        self.physics_lock = PHYSICS_LOCK if physics_lock is None else physics_lock
+        self.thread = None
+        self.running = False
+        self.step_id = 0
+        self.sim_time = 0.0
+
+        self.step_times = deque(maxlen=stats_window)
+        self.overruns = 0           # 주기를 넘긴 스텝 수
+        self.dropped_steps = 0      # max_catchup 초과로 버린 주기 수
+        self.last_step_ms = 0.0
+        self.max_step_ms = 0.0
+        self.log = get_logger(self.__class__.__name__)
+
+    @property
+    def dt(self):
+        return self.period_ms / 1000.0
+
+    def add_hook(self, hook):
+        '''
+            hook(dt): 매 스텝 직후 시뮬레이션 스레드에서 호출
+        '''
+        self.hooks = self.hooks + [hook]
+
+    def remove_hook(self, hook):
+        self.hooks = [h for h in self.hooks if h != hook]
+
+    def track_joints(self, robotId, jointIds):
+        self.tracked_joints = self.tracked_joints + [(robotId, list(jointIds))]
+
+    def track_links(self, robotId, linkIds):
+        self.tracked_links = self.tracked_links + [(robotId, list(linkIds))]
+
+    def latest(self):
+        '''
+            마지막으로 완성된 스냅샷 (읽는 쪽은 잠금 없이 참조만 가져감)
+        '''
+        return self.front
+
+    def start(self):
+        if self.running:
+            return
+        with self.physics_lock:
+            p.setPhysicsEngineParameter(fixedTimeStep=self.dt / self.substeps, physicsClientId=self.physicsClientId)
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="SimulationStepper", daemon=True)
+        self.thread.start()
+        self.log.info("started: %.1f ms x %d substeps", self.period_ms, self.substeps)
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def run(self):
+        period_ns = int(self.period_ms * 1e6)
+        next_ns = time.monotonic_ns()
+        while self.running:
+            now = time.monotonic_ns()
+            if now < next_ns:
+                time.sleep((next_ns - now) / 1e9)
+                continue
+
+            behind = (now - next_ns) // period_ns
+            if behind > self.max_catchup:
+                self.dropped_steps += behind - self.max_catchup
+                next_ns += (behind - self.max_catchup) * period_ns
+
+            try:
+                self.step()
+            except Exception as e:
+                self.log.error("step failed: %s", e)
+
+            next_ns += period_ns
+            if time.monotonic_ns() > next_ns:
+                self.overruns += 1
+
+    def step(self):
+        '''
+            한 주기 진행: substeps번 stepSimulation -> 스냅샷 기록 -> 훅 호출
+        '''
+        start = time.monotonic_ns()
+        with self.physics_lock:
+            for _ in range(self.substeps):
+                p.stepSimulation(physicsClientId=self.physicsClientId)
+            self.step_id += 1
+            self.sim_time += self.dt
+            self.publish_snapshot(start)
+
+            for hook in self.hooks:
+                try:
+                    hook(self.dt)
+                except Exception as e:
+                    self.log.error("step hook %s failed: %s", hook, e)
+
+        end = time.monotonic_ns()
+        self.step_times.append(end)
+        self.last_step_ms = (end - start) / 1e6
+        self.max_step_ms = max(self.max_step_ms, self.last_step_ms)
+
+    def publish_snapshot(self, monotonic_ns):
+        '''
+            스텝마다 새 스냅샷을 만들어 교체 (이전 스냅샷을 가진 reader가 읽는 도중 값이 바뀌지 않음)
+        '''
+        snapshot = StateSnapshot()
+        joints = {}
+        for robot, jointIds in self.tracked_joints:
+            for joint, state in zip(jointIds, p.getJointStates(robot, jointIds, physicsClientId=self.physicsClientId)):
+                joints[(robot, joint)] = (state[0], state[1])
+        links = {}
+        for robot, linkIds in self.tracked_links:
+            for link, state in zip(linkIds, p.getLinkStates(robot, linkIds, computeForwardKinematics=1, physicsClientId=self.physicsClientId)):
+                links[(robot, link)] = (state[4], state[5])
+
+        snapshot.step_id = self.step_id
+        snapshot.sim_time = self.sim_time
+        snapshot.monotonic_ns = monotonic_ns
+        snapshot.joints = joints
+        snapshot.links = links
+        self.front = snapshot   # 참조 교체는 원자적이므로 읽는 쪽은 완성된 스냅샷만 봄
+
+    def stats(self):
+        '''
+            최근 stats_window 스텝 기준 달성 주파수와 overrun 통계
+        '''
+        times = list(self.step_times)
+        hz = (len(times) - 1) / ((times[-1] - times[0]) / 1e9) if len(times) > 1 and times[-1] > times[0] else 0.0
+        return {
+            "target_hz": 1000.0 / self.period_ms,
+            "achieved_hz": hz,
+            "step_id": self.step_id,
+            "sim_time": self.sim_time,
+            "overruns": self.overruns,
+            "dropped_steps": self.dropped_steps,
+            "last_step_ms": self.last_step_ms,
+            "max_step_ms": self.max_step_ms,
+        }
@@ -0,0 +1,288 @@
+"""
+WADF 가상 DIO 일괄 처리 드라이버 모듈
+Virtual_DIODriver와 같은 Read/Write 인터페이스를 제공하면서
+물리 스텝마다 모든 근접 센서의 링크 자세를 한 번에 읽고 레이를 한 번의 rayTestBatch로 계산
+결과는 다음 스텝(on_step) 또는 max_age_ms 경과 전까지 캐시되므로 센서 수가 늘어도 Read 비용은 거의 일정
+공압 액추에이터는 스텝마다 바디별 목표값을 모아 한 번의 setJointMotorControlArray로 전달
+pybullet 호출은 physics_lock(SimulationStepper.PHYSICS_LOCK) 안에서 수행 (잠금 순서: physics_lock -> 드라이버 lock)
+"""
+import threading
+import time
+
+import numpy as np
+import pybullet as p
+
+from WADF.Linker.SimulationStepper import PHYSICS_LOCK
+
+AXES = {
+    'x': np.array([1.0, 0.0, 0.0]), '-x': np.array([-1.0, 0.0, 0.0]),
+    'y': np.array([0.0, 1.0, 0.0]), '-y': np.array([0.0, -1.0, 0.0]),
+    'z': np.array([0.0, 0.0, 1.0]), '-z': np.array([0.0, 0.0, -1.0]),
+}
+
+def rotate(quaternions, vectors):
+    '''
+        quaternions: (N, 4) [x, y, z, w], vectors: (N, 3) -> (N, 3)
+    '''
+    q = quaternions[:, :3]
+    w = quaternions[:, 3:4]
+    t = 2.0 * np.cross(q, vectors)
+    return vectors + w * t + np.cross(q, t)
+
+
+class Virtual_BatchedProximityDriver():
+    def __init__(self, max_age_ms=20.0, ignore_self=True, physicsClientId=0, physics_lock=PHYSICS_LOCK):
+        '''
+            max_age_ms: on_step 호출이 없을 때 캐시 유효 시간 (WorkcellConfig/UpdateTimeMS)
+            ignore_self: 센서가 달린 바디 자신에 맞은 레이는 감지로 보지 않음
+        '''
+        self.max_age_ns = int(max_age_ms * 1e6)
+        self.ignore_self = ignore_self
+        self.physicsClientId = physicsClientId
+        self.physics_lock = physics_lock
+
+        self.pins = []              # 센서 순서대로의 핀 번호
+        self.ray_sensor = []        # 레이별 센서 인덱스
+        self.ray_robot = []         # 레이별 robotId
+        self.ray_link = []          # 레이별 linkId
+        self.ray_origin = []        # 레이별 링크 좌표계 원점 오프셋
+        self.ray_vector = []        # 레이별 링크 좌표계 방향 * 길이
+        self.arrays = None
+
+        self.lock = threading.Lock()
+        self.step_id = 0
+        self.step_driven = False
+        self.cached_step = -1
+        self.cached_ns = 0
+        self.pin_states = {}
+        self.ray_fractions = np.zeros(0)
+
+    def add_sensor(self, pin, robotId, linkId, direction, rayMaxLen, count=1, spacing=0.0, spread='z'):
+        '''
+            Virtual_ProximitySensor와 같은 인자로 센서 추가
+            count > 1이면 링크 좌표계 spread 축을 따라 spacing 간격으로 레이를 배치 (라이트 커튼)
+            핀은 레이 중 하나라도 감지되면 1
+        '''
+        sensor = len(self.pins)
+        self.pins.append(pin)
+        offsets = (np.arange(count) - (count - 1) / 2.0) * spacing
+        for offset in offsets:
+            self.ray_sensor.append(sensor)
+            self.ray_robot.append(robotId)
+            self.ray_link.append(linkId)
+            self.ray_origin.append(AXES[spread] * offset)
+            self.ray_vector.append(AXES[direction] * rayMaxLen)
+        self.arrays = None
+
+    def on_step(self, dt=None):
+        '''
+            물리 스텝 직후 호출: 스텝 스레드에서 바로 레이를 계산하고, 다음 스텝까지 Read는 캐시만 사용
+        '''
+        self.step_driven = True
+        self.step_id += 1
+        self.refresh()
+
+    def compile(self):
+        ray_robot = np.array(self.ray_robot)
+        ray_link = np.array(self.ray_link)
+        groups = []
+        for robot in np.unique(ray_robot):
+            links = np.unique(ray_link[ray_robot == robot])
+            groups.append((int(robot), [int(link) for link in links]))
+
+        link_keys = [(robot, link) for robot, links in groups for link in links]
+        link_index = {key: i for i, key in enumerate(link_keys)}
+        self.arrays = {
+            "groups": groups,
+            "ray_link_index": np.array([link_index[(r, l)] for r, l in zip(self.ray_robot, self.ray_link)], dtype=int),
+            "ray_origin": np.array(self.ray_origin, dtype=float).reshape(-1, 3),
+            "ray_vector": np.array(self.ray_vector, dtype=float).reshape(-1, 3),
+            "ray_sensor": np.array(self.ray_sensor, dtype=int),
+            "ray_robot": ray_robot,
+        }
+
+    def cast(self):
+        '''
+            모든 센서 링크 자세를 바디별 getLinkStates로 한 번에 읽고, 전체 레이를 rayTestBatch로 계산
+        '''
+        if self.arrays is None:
+            self.compile()
+        arrays = self.arrays
+
+        positions = []
+        orientations = []
+        for robot, links in arrays["groups"]:
+            for state in p.getLinkStates(robot, links, computeForwardKinematics=1, physicsClientId=self.physicsClientId):
+                positions.append(state[4])
+                orientations.append(state[5])
+        positions = np.array(positions, dtype=float)
+        orientations = np.array(orientations, dtype=float)
+
+        index = arrays["ray_link_index"]
+        quat = orientations[index]
+        ray_from = positions[index] + rotate(quat, arrays["ray_origin"])
+        ray_to = ray_from + rotate(quat, arrays["ray_vector"])
+
+        hit_body = np.full(len(index), -1, dtype=int)
+        fractions = np.ones(len(index))
+        batch = getattr(p, "MAX_RAY_INTERSECTION_BATCH_SIZE", 16384)
+        for start in range(0, len(index), batch):
+            results = p.rayTestBatch(ray_from[start:start + batch].tolist(), ray_to[start:start + batch].tolist(),
+                                     physicsClientId=self.physicsClientId)
+            for i, result in enumerate(results):
+                hit_body[start + i] = result[0]
+                fractions[start + i] = result[2]
+
+        hit = hit_body >= 0
+        if self.ignore_self:
+            hit &= hit_body != arrays["ray_robot"]
+
+        detected = np.zeros(len(self.pins), dtype=bool)
+        np.logical_or.at(detected, arrays["ray_sensor"], hit)
+        return {pin: int(state) for pin, state in zip(self.pins, detected)}, fractions
+
+    def refresh(self):
+        now = time.monotonic_ns()
+        if self.is_fresh(now):
+            return
+        with self.physics_lock, self.lock:     # 스텝 스레드(physics_lock 보유 후 on_step)와 같은 순서
+            if self.is_fresh(now):
+                return
+            self.pin_states, self.ray_fractions = self.cast()
+            self.cached_step = self.step_id
+            self.cached_ns = now
+
+    def is_fresh(self, now):
+        if self.cached_step != self.step_id:
+            return False
+        return self.step_driven or now - self.cached_ns < self.max_age_ns
+
+    def Read(self, pins):
+        if not self.pins:
+            return [0 for _ in pins]
+        self.refresh()
+        return [self.pin_states.get(pin, 0) for pin in pins]
+
+    def ReadRays(self, pin):
+        '''
+            라이트 커튼용: 해당 핀의 레이별 hit fraction (1.0 = 감지 없음)
+        '''
+        self.refresh()
+        sensor = self.pins.index(pin)
+        return self.ray_fractions[self.arrays["ray_sensor"] == sensor].tolist()
+
+    def Write(self, pins, states):
+        pass
+
+
+class Virtual_PneumaticActuatorArrayDriver():
+    def __init__(self, physicsClientId=0, physics_lock=PHYSICS_LOCK):
+        '''
+            Write는 목표 상태만 기록하고, on_step(dt)에서 바디별로 한 번의 setJointMotorControlArray로 전달
+            on_step이 한 번도 호출되지 않았다면 Write 시점에 관절별 setJointMotorControl2(maxVelocity=tarVel)로 바로 전달
+        '''
+        self.physicsClientId = physicsClientId
+        self.physics_lock = physics_lock
+        self.pin_index = {}
+        self.robot = []
+        self.joint = []
+        self.ori_pos = []
+        self.tar_pos = []
+        self.tar_vel = []
+        self.tar_force = []
+        self.dynamics = []
+
+        self.lock = threading.Lock()
+        self.states = None          # 핀별 지령 상태 (0/1)
+        self.goal = None            # 관절별 최종 목표 위치
+        self.setpoint = None        # 관절별 현재 스텝 목표 위치 (tarVel로 속도 제한)
+        self.dirty = False
+        self.step_driven = False
+        self.dynamics_applied = False
+
+    def add_actuator(self, pin, robotId, jointId, oriPos, tarPos, tarVel, tarForce, **dynamics):
+        '''
+            Virtual_PneumaticActuator와 같은 인자로 액추에이터 추가
+            dynamics(lateralFriction, mass 등)는 첫 전달 시 한 번만 changeDynamics로 적용
+        '''
+        self.pin_index[pin] = len(self.robot)
+        self.robot.append(robotId)
+        self.joint.append(jointId)
+        self.ori_pos.append(oriPos)
+        self.tar_pos.append(tarPos)
+        self.tar_vel.append(tarVel)
+        self.tar_force.append(tarForce)
+        self.dynamics.append(dynamics)
+
+        self.states = np.zeros(len(self.robot), dtype=int)
+        self.goal = np.array(self.ori_pos, dtype=float)
+        self.setpoint = self.goal.copy()
+
+    def apply_dynamics(self):
+        for robot, joint, dynamics in zip(self.robot, self.joint, self.dynamics):
+            if dynamics:
+                p.changeDynamics(robot, joint, physicsClientId=self.physicsClientId, **dynamics)
+        self.dynamics_applied = True
+
+    def index(self, pins):
+        missing = [pin for pin in pins if pin not in self.pin_index]
+        if missing:
+            raise ValueError(f"pin {', '.join(map(str, missing))} is not defined..!")
+        return [self.pin_index[pin] for pin in pins]
+
+    def Write(self, pins, states):
+        indexes = self.index(pins)     # 정의되지 않은 핀이 있으면 아무 상태도 바꾸지 않음
+        with self.lock:
+            changed = False
+            for i, state in zip(indexes, states):
+                state = 1 if state else 0
+                if self.states[i] != state:
+                    self.states[i] = state
+                    self.goal[i] = self.tar_pos[i] if state else self.ori_pos[i]
+                    changed = True
+            self.dirty = self.dirty or changed
+        if changed and not self.step_driven:
+            self.flush(None)
+
+    def Read(self, pins):
+        return [int(self.states[i]) for i in self.index(pins)]
+
+    def on_step(self, dt=None):
+        '''
+            물리 스텝마다 호출: 이동 중인 관절의 목표를 tarVel * dt 만큼 전진시키고 바디별로 일괄 전달
+        '''
+        self.step_driven = True
+        self.flush(dt)
+
+    def flush(self, dt):
+        with self.physics_lock:     # 전달 순서가 뒤바뀌지 않도록 setpoint 계산부터 잠금 안에서 수행
+            with self.lock:
+                moving = self.setpoint != self.goal
+                if not self.dirty and not moving.any():
+                    return
+                if dt is None:
+                    self.setpoint[moving] = self.goal[moving]
+                else:
+                    limit = np.array(self.tar_vel, dtype=float) * dt
+                    self.setpoint = self.setpoint + np.clip(self.goal - self.setpoint, -limit, limit)
+                self.dirty = False
+                setpoint = self.setpoint.copy()
+
+            if not self.dynamics_applied:
+                self.apply_dynamics()
+                moving = np.ones(len(self.robot), dtype=bool)
+
+            if dt is None:      # 스텝 없이 바로 전달: 목표까지 한 번에 보내고 속도는 tarVel로 제한
+                for i in np.flatnonzero(moving):
+                    p.setJointMotorControl2(self.robot[i], self.joint[i], p.POSITION_CONTROL,
+                                            targetPosition=float(setpoint[i]), force=self.tar_force[i],
+                                            maxVelocity=self.tar_vel[i], physicsClientId=self.physicsClientId)
+                return
+
+            robot = np.array(self.robot)
+            for body in np.unique(robot[moving]):
+                index = np.flatnonzero((robot == body) & moving)
+                p.setJointMotorControlArray(int(body), [self.joint[i] for i in index], p.POSITION_CONTROL,
+                                            targetPositions=setpoint[index].tolist(),
+                                            forces=[self.tar_force[i] for i in index],
+                                            physicsClientId=self.physicsClientId)
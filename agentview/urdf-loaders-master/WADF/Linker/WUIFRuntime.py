@@ -0,0 +1,277 @@
+"""
+WADF WUIF 런타임 모듈
+WUIF 파일(ex. WUIF/JobProgress.xml)의 Data/SubData 바인딩을 데이터 저장소 슬롯 번호와 위젯 setter로 미리 컴파일하고
+GUI 스레드의 QTimer에서 화면 주사율 주기로 바뀐 슬롯만 모아 위젯을 갱신
+    - 모니터링 값은 임의 스레드에서 ViewModelStore.set()으로 기록 (값이 같으면 무시)
+    - 한 주기 동안 여러 번 바뀐 값은 마지막 값만 한 번 그림 (Qt 이벤트 큐에 중복 repaint가 쌓이지 않음)
+    - 위젯에 마지막으로 표시한 문자열(setText, format_value 결과)/값(setValue)과 같으면 setter를 호출하지 않음
+      (ex. 12.31 -> 12.34는 둘 다 "12.3"이므로 다시 그리지 않음)
+"""
+import os
+import threading
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+from PySide2.QtCore import QTimer
+from WADF.Linker.LinkerLogger import get_logger
+
+class ViewModelStore():
+    '''
+        "CycleTime", "CycleTime/ProcessStartTime" 같은 경로를 정수 슬롯으로 매핑한 값 저장소
+    '''
+    def __init__(self):
+        self.slots = {}         # path -> slot
+        self.paths = []         # slot -> path
+        self.values = []        # slot -> 값
+        self.dirty = set()
+        self.lock = threading.Lock()
+
+    def slot(self, path):
+        index = self.slots.get(path)
+        if index is None:
+            with self.lock:
+                index = self.slots.get(path)
+                if index is None:
+                    index = self.slots[path] = len(self.paths)
+                    self.paths.append(path)
+                    self.values.append(None)
+        return index
+
+    def set(self, path, value):
+        '''
+            path: 경로 문자열 또는 slot() 번호
+        '''
+        slot = path if isinstance(path, int) else self.slot(path)
+        if self.values[slot] == value:
+            return False
+        with self.lock:
+            self.values[slot] = value
+            self.dirty.add(slot)
+        return True
+
+    def get(self, path):
+        slot = path if isinstance(path, int) else self.slots.get(path)
+        return None if slot is None else self.values[slot]
+
+    def take_dirty(self):
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+        return dirty
+
+
+def format_value(value, datatype):
+    '''
+        WUIF datatype에 따른 표시 문자열
+    '''
+    if value is None:
+        return "-"
+    if datatype == "Timestamp" and isinstance(value, datetime):
+        return value.strftime("%H:%M:%S")
+    if datatype == "TimeDelta":
+        seconds = value.total_seconds() if isinstance(value, timedelta) else float(value)
+        return f"{seconds:.1f} s"
+    if datatype == "Float":
+        return f"{float(value):.1f}"
+    if datatype == "Int":
+        return str(int(value))
+    return str(value)
+
+
+class WUIFBinding():
+    __slots__ = ("path", "slot", "datatype", "widget", "setter", "formatted", "shown")
+
+    def __init__(self, path, slot, datatype, widget, setter, formatted=False):
+        '''
+            formatted: True이면 setter에 format_value 문자열을 전달하고 그 문자열로 비교
+        '''
+        self.path = path
+        self.slot = slot
+        self.datatype = datatype
+        self.widget = widget
+        self.setter = setter
+        self.formatted = formatted
+        self.shown = None       # 위젯에 마지막으로 전달한 문자열 또는 값
+
+
+class WUIFView():
+    def __init__(self, wuif_path):
+        root = ET.parse(wuif_path).getroot()
+        self.path = wuif_path
+        self.name = root.get("name")
+        profile = root.find("Profile")
+        self.view = profile.findtext("View") if profile is not None else None
+        self.view_model = profile.findtext("ViewModel") if profile is not None else None
+        self.widget = profile.findtext("Widget") if profile is not None else None
+
+        self.fields = []        # [(path, datatype, widget 이름 후보)]
+        for data in root.findall("Data"):
+            name = data.get("name")
+            self.fields.append((name, data.get("datatype"), [name, f"label_{name}", f"{name}_value"]))
+            for sub in data.findall("SubData"):
+                sub_name = sub.get("name")
+                self.fields.append((f"{name}/{sub_name}", sub.get("datatype"),
+                                    [f"{name}_{sub_name}", sub_name, f"label_{sub_name}", f"{sub_name}_value"]))
+
+
+def widget_setter(widget, datatype):
+    '''
+        위젯 종류에 맞는 setter: setValue(숫자 위젯) 또는 setText(라벨 등, format_value 문자열을 받음)
+        return: (setter, formatted)
+    '''
+    if datatype in ("Int", "Float") and hasattr(widget, "setValue") and not hasattr(widget, "setText"):
+        return (lambda value: widget.setValue(0 if value is None else value)), False
+    if hasattr(widget, "setText"):
+        return widget.setText, True
+    return None, False
+
+def monitoring_views(wadf_path):
+    '''
+        return: {MonitoringView name: WUIF 파일 경로}
+    '''
+    root = ET.parse(wadf_path).getroot()
+    return {view.get("name"): view.findtext("FilePath").replace("\\", os.sep)
+            for view in root.iter("MonitoringView")}
+
+def display_refresh_hz(default=60.0):
+    try:
+        from PySide2.QtGui import QGuiApplication
+        screen = QGuiApplication.primaryScreen()
+        return float(screen.refreshRate()) if screen is not None and screen.refreshRate() > 0 else default
+    except (ImportError, AttributeError):
+        return default
+
+
+class WUIFRuntime():
+    def __init__(self, store=None, refresh_hz=None):
+        '''
+            refresh_hz: 위젯 갱신 주기 (None이면 주 화면 주사율)
+        '''
+        self.store = store or ViewModelStore()
+        self.refresh_hz = refresh_hz
+        self.views = {}             # view name -> [WUIFBinding]
+        self.by_slot = {}           # slot -> [WUIFBinding]
+        self.sources = {}           # view name -> (wuif_path, root_widget, targets)
+        self.timer = None
+
+        self.frames = 0             # 위젯 갱신이 있었던 주기 수
+        self.widget_updates = 0     # 실제 setter 호출 수
+        self.suppressed = 0         # 값이 바뀌었지만 표시가 같아 생략한 수
+        self.log = get_logger(self.__class__.__name__)
+
+    def bind(self, wuif_path, root_widget=None, targets=None, name=None):
+        '''
+            WUIF 파일을 읽어 바인딩을 컴파일
+            name: 뷰 이름 (None이면 DataModel name, WADF MonitoringView name과 다를 수 있음)
+            root_widget: Profile/Widget(ex. frame_26) 위젯, 하위 위젯을 objectName 후보로 검색
+            targets: {경로: 위젯 또는 callable(value)} 직접 지정 (root_widget 검색보다 우선)
+        '''
+        view = WUIFView(wuif_path)
+        name = name or view.name
+        targets = targets or {}
+        bindings = []
+        for path, datatype, names in view.fields:
+            widget = targets.get(path)
+            if widget is None and root_widget is not None and hasattr(root_widget, "findChild"):
+                from PySide2.QtCore import QObject
+                widget = next((w for w in (root_widget.findChild(QObject, name) for name in names) if w is not None), None)
+            if widget is None:
+                continue
+
+            if callable(widget) and not hasattr(widget, "setText"):
+                setter, formatted = widget, False
+            else:
+                setter, formatted = widget_setter(widget, datatype)
+            if setter is None:
+                self.log.warning("%s: %s has no setter", name, path)
+                continue
+            bindings.append(WUIFBinding(path, self.store.slot(path), datatype, widget, setter, formatted))
+
+        shown = {(b.path, id(b.widget)): b.shown for b in self.views.get(name, [])}
+        self.unbind(name)
+        self.views[name] = bindings
+        self.sources[name] = (wuif_path, root_widget, targets)
+        for binding in bindings:
+            binding.shown = shown.get((binding.path, id(binding.widget)))     # 다시 바인딩해도 같은 값은 다시 그리지 않음
+            self.by_slot[binding.slot] = self.by_slot.get(binding.slot, []) + [binding]
+            self.store.dirty.add(binding.slot)      # 처음 한 번은 현재 값을 그림
+        self.log.info("%s: %d bindings compiled", name, len(bindings))
+        return view
+
+    def load_wadf(self, wadf_path, root_widgets, base_dir="."):
+        '''
+            WADF 파일의 WorkcellUIF/MonitoringView를 모두 바인딩
+            root_widgets: {MonitoringView name: Profile/Widget 위젯}
+        '''
+        views = []
+        for name, path in monitoring_views(wadf_path).items():
+            root_widget = root_widgets.get(name)
+            if root_widget is not None:
+                views.append(self.bind(os.path.join(base_dir, path), root_widget, name=name))
+        return views
+
+    def reload(self, view_name):
+        '''
+            WUIF 파일이 바뀌었을 때 해당 뷰의 바인딩만 다시 컴파일
+        '''
+        wuif_path, root_widget, targets = self.sources[view_name]
+        return self.bind(wuif_path, root_widget, targets, name=view_name)
+
+    def unbind(self, view_name):
+        self.sources.pop(view_name, None)
+        removed = self.views.pop(view_name, [])
+        for binding in removed:
+            remaining = [b for b in self.by_slot.get(binding.slot, []) if b is not binding]
+            if remaining:
+                self.by_slot[binding.slot] = remaining
+            else:
+                self.by_slot.pop(binding.slot, None)
+
+    def start(self):
+        '''
+            GUI 스레드에서 호출
+        '''
+        if self.timer is None:
+            hz = self.refresh_hz or display_refresh_hz()
+            self.timer = QTimer()
+            self.timer.timeout.connect(self.flush)
+            self.timer.start(max(1, int(1000.0 / hz)))
+
+    def stop(self):
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer = None
+
+    def flush(self):
+        '''
+            마지막 주기 이후 바뀐 슬롯의 바인딩만 갱신
+        '''
+        dirty = self.store.take_dirty()
+        if not dirty:
+            return
+        values = self.store.values
+        updated = False
+        for slot in dirty:
+            value = values[slot]
+            for binding in self.by_slot.get(slot, ()):
+                try:
+                    shown = format_value(value, binding.datatype) if binding.formatted else value
+                except (TypeError, ValueError) as e:
+                    self.log.error("%s update failed: %s", binding.path, e)
+                    continue
+                if binding.shown is not None and binding.shown == shown:
+                    self.suppressed += 1
+                    continue
+                binding.shown = shown
+                try:
+                    binding.setter(shown)
+                except Exception as e:
+                    self.log.error("%s update failed: %s", binding.path, e)
+                    continue
+                self.widget_updates += 1
+                updated = True
+        if updated:
+            self.frames += 1
+
+    def stats(self):
+        return {"views": len(self.views), "bindings": sum(len(b) for b in self.views.values()),
+                "frames": self.frames, "widget_updates": self.widget_updates, "suppressed": self.suppressed}
@@ -0,0 +1,715 @@
+"""
+WADF 오프라인 에셋 최적화 도구
+URDF 트리(INP3, Pallet_INP, lego_base, T12, TriATHLETE ...)의 STL 메시와 GLB 파일을 빌드 시점에 한 번 가공
+    - 중복 제거: 파일 내용이 아닌 용접(weld)된 형상 기준 해시로 같은 메시를 하나만 저장 (자산 간 공유)
+    - 시뮬레이션: 중복 제거된 binary STL(visual)과 단순화된 볼록 껍질(collision) STL
+    - 웹 뷰어: 위치를 int16으로 양자화한 GLB(KHR_mesh_quantization)와 정점 군집화로 만든 LOD 단계
+    - GLB/외부 .bin: 메시별로 같은 단계(용접, 볼록 껍질, int16 양자화, LOD)를 적용하고 노드/재질 구조는 유지
+      (같은 내용의 bufferView는 하나만 저장, 외부 버퍼는 GLB 안으로 포함)
+    - 자산별 manifest.json과 최적화된 URDF(<name>.sim.urdf, <name>.web.urdf)
+      (파일 이름이 같은 자산은 상위 디렉토리로 구분, ex. TriATHLETE_Climbing/TriATHLETE)
+    - 자산별 원본/최적화 크기와 로드 시간 비교 보고서 (report.json)
+
+사용법 (urdf-loaders-master 디렉토리에서 실행)
+    python -m WADF.Tools.AssetOptimizer urdf --output build/assets
+    python -m WADF.Tools.AssetOptimizer urdf/INP3/INP3/INP3.urdf --lod 96 32 12 --hull-points 64
+    python -m WADF.Tools.AssetOptimizer ../../urdf_colored_metallic.glb --output build/assets
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+'''
+STL
+'''
+STL_DTYPE = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+
+def read_stl(path):
+    '''
+        binary / ASCII STL -> (T, 3, 3) float32 삼각형 배열
+    '''
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) >= 84:
+        count = struct.unpack_from("<I", data, 80)[0]
+        if 84 + count * 50 == len(data):
+            return np.frombuffer(data, dtype=STL_DTYPE, count=count, offset=84)["vertices"].copy()
+
+    values = [line.split()[1:4] for line in data.decode("utf-8", "ignore").splitlines() if line.strip().startswith("vertex")]
+    return np.array(values, dtype=np.float32).reshape(-1, 3, 3)
+
+def write_stl(path, vertices, faces):
+    triangles = vertices[faces].astype(np.float32)
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)
+
+    records = np.zeros(len(faces), dtype=STL_DTYPE)
+    records["normal"] = normals
+    records["vertices"] = triangles
+    with open(path, "wb") as f:
+        f.write(b"WADF AssetOptimizer".ljust(80, b" "))
+        f.write(struct.pack("<I", len(faces)))
+        f.write(records.tobytes())
+
+'''
+Mesh processing
+'''
+def weld(triangles):
+    '''
+        삼각형 배열 -> 공유 정점 (vertices (V, 3), faces (F, 3)), 면적이 0인 삼각형 제거
+    '''
+    vertices, inverse = np.unique(triangles.reshape(-1, 3), axis=0, return_inverse=True)
+    faces = inverse.reshape(-1, 3)
+    keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+    return vertices.astype(np.float32), faces[keep]
+
+def geometry_hash(vertices, faces):
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(vertices, dtype=np.float32).tobytes())
+    digest.update(np.ascontiguousarray(faces, dtype=np.int64).tobytes())
+    return digest.hexdigest()[:16]
+
+def cluster(vertices, faces, resolution):
+    '''
+        정점 군집화 단순화: 바운딩 박스 긴 축을 resolution 칸으로 나눈 격자 셀마다 정점을 평균으로 합침
+    '''
+    lower = vertices.min(axis=0)
+    extent = float((vertices.max(axis=0) - lower).max())
+    if extent <= 0.0:
+        return vertices, faces
+    cell = extent / resolution
+    keys = np.floor((vertices - lower) / cell).astype(np.int64)
+    _, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    count = inverse.max() + 1
+    merged = np.zeros((count, 3), dtype=np.float64)
+    np.add.at(merged, inverse, vertices)
+    merged /= np.bincount(inverse, minlength=count)[:, None]
+
+    new_faces = inverse[faces]
+    keep = (new_faces[:, 0] != new_faces[:, 1]) & (new_faces[:, 1] != new_faces[:, 2]) & (new_faces[:, 2] != new_faces[:, 0])
+    new_faces = new_faces[keep]
+    _, first = np.unique(np.sort(new_faces, axis=1), axis=0, return_index=True)
+    new_faces = new_faces[np.sort(first)]
+
+    used = np.unique(new_faces)
+    remap = np.full(count, -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return merged[used].astype(np.float32), remap[new_faces]
+
+def convex_hull(points):
+    '''
+        점진적 3D 볼록 껍질 -> (vertices, faces) 바깥 방향 반시계 면, 퇴화된 경우 바운딩 박스 반환
+    '''
+    points = np.unique(np.asarray(points, dtype=np.float64), axis=0)
+    scale = float(np.ptp(points, axis=0).max()) if len(points) else 0.0
+    eps = 1e-9 * max(scale, 1e-12)
+
+    def box():
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        corners = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+        faces = np.array([[0, 2, 3], [0, 3, 1], [4, 5, 7], [4, 7, 6], [0, 1, 5], [0, 5, 4],
+                          [2, 6, 7], [2, 7, 3], [0, 4, 6], [0, 6, 2], [1, 3, 7], [1, 7, 5]])
+        return corners.astype(np.float32), faces
+
+    if len(points) < 4:
+        return box() if len(points) else (points.astype(np.float32), np.zeros((0, 3), dtype=np.int64))
+
+    i0 = int(np.argmin(points[:, 0]))
+    i1 = int(np.argmax(np.linalg.norm(points - points[i0], axis=1)))
+    line = points[i1] - points[i0]
+    i2 = int(np.argmax(np.linalg.norm(np.cross(points - points[i0], line), axis=1)))
+    normal = np.cross(line, points[i2] - points[i0])
+    distance = (points - points[i0]) @ normal
+    i3 = int(np.argmax(np.abs(distance)))
+    if np.linalg.norm(normal) <= eps * scale or abs(distance[i3]) <= eps * np.linalg.norm(normal):
+        return box()
+
+    faces = [[i0, i1, i2], [i0, i2, i3], [i0, i3, i1], [i1, i3, i2]]
+    if distance[i3] > 0:
+        faces = [[a, c, b] for a, b, c in faces]
+    centroid = points[[i0, i1, i2, i3]].mean(axis=0)
+    order = np.argsort(-np.linalg.norm(points - centroid, axis=1))
+
+    for index in order:
+        if index in (i0, i1, i2, i3):
+            continue
+        f = np.array(faces)
+        a, b, c = points[f[:, 0]], points[f[:, 1]], points[f[:, 2]]
+        visible = np.einsum("ij,ij->i", np.cross(b - a, c - a), points[index] - a) > eps
+        if not visible.any():
+            continue
+        edges = set()
+        for a_, b_, c_ in f[visible]:
+            edges.update(((a_, b_), (b_, c_), (c_, a_)))
+        horizon = [(u, v) for u, v in edges if (v, u) not in edges]
+        faces = [face for face, seen in zip(faces, visible) if not seen] + [[u, v, index] for u, v in horizon]
+
+    faces = np.array(faces, dtype=np.int64)
+    used = np.unique(faces)
+    remap = np.full(len(points), -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return points[used].astype(np.float32), remap[faces]
+
+def collision_hull(vertices, hull_points):
+    '''
+        정점을 군집화하여 약 hull_points개 이하로 줄인 뒤 볼록 껍질 계산
+    '''
+    points = vertices
+    resolution = 32
+    while len(points) > hull_points and resolution >= 2:
+        lower = vertices.min(axis=0)
+        cell = float((vertices.max(axis=0) - lower).max()) / resolution
+        keys = np.floor((vertices - lower) / cell).astype(np.int64)
+        _, first = np.unique(keys, axis=0, return_index=True)
+        points = vertices[first]
+        resolution //= 2
+    hull_vertices, hull_faces = convex_hull(points)
+    return hull_vertices, hull_faces
+
+'''
+GLB
+'''
+GLB_MAGIC = 0x46546C67
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+SHORT = 5122
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+FLOAT = 5126
+
+def pad4(data, fill=b"\x00"):
+    return data + fill * (-len(data) % 4)
+
+def pack_glb(document, binary):
+    text = pad4(json.dumps(document, separators=(",", ":")).encode("utf-8"), b" ")
+    binary = pad4(binary)
+    length = 12 + 8 + len(text) + (8 + len(binary) if binary else 0)
+    parts = [struct.pack("<III", GLB_MAGIC, 2, length), struct.pack("<II", len(text), CHUNK_JSON), text]
+    if binary:
+        parts += [struct.pack("<II", len(binary), CHUNK_BIN), binary]
+    return b"".join(parts)
+
+def unpack_glb(data):
+    magic, _, length = struct.unpack_from("<III", data, 0)
+    if magic != GLB_MAGIC:
+        raise ValueError("not a GLB file..!")
+    offset = 12
+    document, binary = None, b""
+    while offset < length:
+        size, kind = struct.unpack_from("<II", data, offset)
+        chunk = data[offset + 8:offset + 8 + size]
+        if kind == CHUNK_JSON:
+            document = json.loads(chunk.decode("utf-8"))
+        elif kind == CHUNK_BIN:
+            binary = bytes(chunk)
+        offset += 8 + size
+    return document, binary
+
+COMPONENT_DTYPES = {5120: np.int8, 5121: np.uint8, 5122: np.int16, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}
+TYPE_WIDTHS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4}
+TRIANGLES = 4
+
+def load_gltf(path):
+    '''
+        GLB 또는 glTF -> (document, 버퍼별 bytes), 외부 .bin(uri)은 같은 디렉토리에서 읽음
+    '''
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.lower().endswith(".gltf"):
+        document, binary = json.loads(data.decode("utf-8")), b""
+    else:
+        document, binary = unpack_glb(data)
+
+    buffers = []
+    for buffer in document.get("buffers", []):
+        if "uri" in buffer:
+            if buffer["uri"].startswith("data:"):
+                raise ValueError(f"{path}: data URI buffers are not supported..!")
+            with open(os.path.join(os.path.dirname(path), buffer["uri"]), "rb") as f:
+                buffers.append(f.read())
+        else:
+            buffers.append(binary)
+    return document, buffers
+
+def read_accessor(document, buffers, index):
+    '''
+        accessor -> (count, width) 배열 (byteStride 반영, sparse accessor는 지원하지 않음)
+    '''
+    accessor = document["accessors"][index]
+    if "sparse" in accessor or "bufferView" not in accessor:
+        raise ValueError(f"accessor {index}: sparse or empty accessors are not supported..!")
+    view = document["bufferViews"][accessor["bufferView"]]
+    dtype = np.dtype(COMPONENT_DTYPES[accessor["componentType"]])
+    width = TYPE_WIDTHS[accessor["type"]]
+    stride = view.get("byteStride") or dtype.itemsize * width
+    offset = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    return np.ndarray((accessor["count"], width), dtype=dtype, buffer=buffers[view["buffer"]],
+                      offset=offset, strides=(stride, dtype.itemsize)).copy()
+
+def quantize(vertices, lower=None, upper=None):
+    '''
+        위치 -> (int16 정규화 값, center, half), 복원: position = center + value / 32767 * half
+    '''
+    lower = vertices.min(axis=0).astype(np.float64) if lower is None else lower
+    upper = vertices.max(axis=0).astype(np.float64) if upper is None else upper
+    center = (lower + upper) / 2.0
+    half = np.maximum((upper - lower) / 2.0, 1e-12)
+    quantized = np.round(np.clip((vertices - center) / half, -1.0, 1.0) * 32767.0).astype(np.int16)
+    return quantized, center, half
+
+
+class GLBWriter():
+    def __init__(self):
+        '''
+            하나의 BIN 청크를 만들면서 같은 내용의 bufferView는 한 번만 저장
+        '''
+        self.binary = bytearray()
+        self.views = []
+        self.accessors = []
+        self.seen = {}
+
+    def view(self, data, target, stride=None):
+        key = (hashlib.sha1(data).digest(), target, stride)
+        if key not in self.seen:
+            self.binary += b"\x00" * (-len(self.binary) % 4)
+            view = {"buffer": 0, "byteOffset": len(self.binary), "byteLength": len(data), "target": target}
+            if stride:
+                view["byteStride"] = stride
+            self.binary += data
+            self.seen[key] = len(self.views)
+            self.views.append(view)
+        return self.seen[key]
+
+    def positions(self, quantized):
+        padded = np.zeros((len(quantized), 4), dtype=np.int16)     # byteStride는 4의 배수여야 하므로 int16 x 4
+        padded[:, :3] = quantized
+        self.accessors.append({"bufferView": self.view(padded.tobytes(), 34962, 8), "componentType": SHORT,
+                               "normalized": True, "count": len(quantized), "type": "VEC3",
+                               "min": quantized.min(axis=0).tolist(), "max": quantized.max(axis=0).tolist()})
+        return len(self.accessors) - 1
+
+    def indices(self, faces, vertex_count):
+        index_type, index_dtype = (UNSIGNED_SHORT, np.uint16) if vertex_count < 65536 else (UNSIGNED_INT, np.uint32)
+        self.accessors.append({"bufferView": self.view(faces.astype(index_dtype).tobytes(), 34963),
+                               "componentType": index_type, "count": int(faces.size), "type": "SCALAR"})
+        return len(self.accessors) - 1
+
+    def pack(self, document):
+        document = dict(document, bufferViews=self.views, accessors=self.accessors)
+        document["buffers"] = [{"byteLength": len(self.binary)}] if self.binary else []
+        return pack_glb(document, bytes(self.binary))
+
+
+def quantized_glb(vertices, faces, name):
+    '''
+        위치를 int16 정규화 값으로 저장하고 노드 translation/scale로 복원 (KHR_mesh_quantization)
+        법선은 저장하지 않음 (뷰어가 flat shading으로 표시, STL과 같은 모양)
+    '''
+    quantized, center, half = quantize(vertices)
+    writer = GLBWriter()
+    position = writer.positions(quantized)
+    indices = writer.indices(faces, len(vertices))
+    return writer.pack({
+        "asset": {"version": "2.0", "generator": "WADF AssetOptimizer"},
+        "extensionsUsed": ["KHR_mesh_quantization"],
+        "extensionsRequired": ["KHR_mesh_quantization"],
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"name": name, "mesh": 0, "translation": center.tolist(), "scale": half.tolist()}],
+        "meshes": [{"name": name, "primitives": [{"attributes": {"POSITION": position}, "indices": indices}]}],
+    })
+
+def scene_glb(document, primitives, level):
+    '''
+        원본 GLB의 노드/재질 구조를 유지하고 메시 위치만 int16으로 양자화한 GLB
+        primitives: 메시별 [(lods, material)], lods: [(vertices, faces)] (level 단계가 없으면 가장 낮은 단계 사용)
+        메시의 모든 프리미티브를 같은 범위로 양자화하고, 메시를 참조하던 노드 아래 복원용 자식 노드로 메시를 옮김
+    '''
+    writer = GLBWriter()
+    meshes, bounds = [], []
+    for mesh, mesh_primitives in zip(document["meshes"], primitives):
+        base = [lods[0][0] for lods, _ in mesh_primitives]
+        lower = np.min([vertices.min(axis=0) for vertices in base], axis=0).astype(np.float64)
+        upper = np.max([vertices.max(axis=0) for vertices in base], axis=0).astype(np.float64)
+        out = []
+        for lods, material in mesh_primitives:
+            vertices, faces = lods[min(level, len(lods) - 1)]
+            quantized, center, half = quantize(vertices, lower, upper)
+            primitive = {"attributes": {"POSITION": writer.positions(quantized)},
+                         "indices": writer.indices(faces, len(vertices)), "mode": TRIANGLES}
+            if material is not None:
+                primitive["material"] = material
+            out.append(primitive)
+        meshes.append(dict(mesh, primitives=out))
+        bounds.append((center, half))
+
+    nodes = [dict(node) for node in document.get("nodes", [])]
+    for node in nodes[:len(document.get("nodes", []))]:
+        if "mesh" not in node:
+            continue
+        mesh = node.pop("mesh")
+        center, half = bounds[mesh]
+        node["children"] = node.get("children", []) + [len(nodes)]
+        nodes.append({"name": f"{node.get('name', 'mesh')}.dequantize", "mesh": mesh,
+                      "translation": center.tolist(), "scale": half.tolist()})
+
+    document = {key: value for key, value in document.items() if key not in ("buffers", "bufferViews", "accessors")}
+    document.update(meshes=meshes, nodes=nodes)
+    document["asset"] = dict(document.get("asset", {"version": "2.0"}), generator="WADF AssetOptimizer")
+    for key in ("extensionsUsed", "extensionsRequired"):
+        document[key] = sorted(set(document.get(key, [])) | {"KHR_mesh_quantization"})
+    return writer.pack(document)
+
+'''
+Load time
+'''
+def load_time_ms(paths, repeat=3):
+    '''
+        파일 읽기 + 파싱(STL: 삼각형 배열, GLB: JSON/바이너리 청크 분리 후 accessor 배열화) 시간의 중앙값
+    '''
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            if path.lower().endswith(".glb"):
+                with open(path, "rb") as f:
+                    document, binary = unpack_glb(f.read())
+                for view in document.get("bufferViews", []):
+                    np.frombuffer(binary, dtype=np.uint8, count=view["byteLength"], offset=view.get("byteOffset", 0))
+            else:
+                read_stl(path)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return float(np.median(samples)) if samples else 0.0
+
+'''
+Pipeline
+'''
+class AssetOptimizer():
+    def __init__(self, output_dir, lod_resolutions=(96, 32, 12), hull_points=64):
+        '''
+            lod_resolutions: LOD1.. 단계별 격자 해상도 (바운딩 박스 긴 축 기준 칸 수), LOD0은 원본 형상
+            hull_points: 충돌 볼록 껍질 계산에 사용할 최대 점 수
+        '''
+        self.output_dir = output_dir
+        self.lod_resolutions = list(lod_resolutions)
+        self.hull_points = hull_points
+        self.mesh_dir = os.path.join(output_dir, "meshes")
+        self.web_dir = os.path.join(output_dir, "web")
+        self.meshes = {}            # 원본 파일 경로 -> 처리 결과 (같은 파일을 여러 자산이 참조할 때 재사용)
+        self.geometries = {}        # 형상 해시 -> 처리 결과 (내용이 같은 다른 파일)
+
+    def process_mesh(self, path):
+        path = os.path.normpath(os.path.abspath(path))
+        entry = self.meshes.get(path)
+        if entry is None:
+            vertices, faces = weld(read_stl(path))
+            name = os.path.splitext(os.path.basename(path))[0]
+            entry = self.meshes[path] = self.process_geometry(vertices, faces, name, path, os.path.getsize(path))
+        return entry
+
+    def lods(self, vertices, faces):
+        '''
+            [(vertices, faces)] LOD0(원본) + 삼각형 수가 줄어드는 군집화 단계
+        '''
+        lods = [(vertices, faces)]
+        for resolution in self.lod_resolutions:
+            lod_vertices, lod_faces = cluster(vertices, faces, resolution)
+            if len(lod_faces) == 0 or len(lod_faces) >= len(lods[-1][1]):
+                continue
+            lods.append((lod_vertices, lod_faces))
+        return lods
+
+    def process_geometry(self, vertices, faces, name, source, source_bytes, web=True):
+        '''
+            용접된 형상 하나를 처리: 시뮬레이션 STL, 충돌 볼록 껍질 STL, (web이면) 양자화 LOD GLB
+            형상 해시가 같은 결과가 있으면 다시 만들지 않고 공유
+        '''
+        key = geometry_hash(vertices, faces)
+        shared = self.geometries.get(key)
+        if shared is not None:
+            return dict(shared, source=source, duplicate_of=shared["source"])
+
+        os.makedirs(self.mesh_dir, exist_ok=True)
+        sim_path = os.path.join(self.mesh_dir, f"{key}.stl")
+        write_stl(sim_path, vertices, faces)
+        hull_vertices, hull_faces = collision_hull(vertices, self.hull_points)
+        hull_path = os.path.join(self.mesh_dir, f"{key}.hull.stl")
+        write_stl(hull_path, hull_vertices, hull_faces)
+
+        lods = self.lods(vertices, faces)
+        web_paths = []
+        if web:
+            os.makedirs(self.web_dir, exist_ok=True)
+            for level, (lod_vertices, lod_faces) in enumerate(lods):
+                web_path = os.path.join(self.web_dir, f"{key}.lod{level}.glb")
+                with open(web_path, "wb") as f:
+                    f.write(quantized_glb(lod_vertices, lod_faces, name))
+                web_paths.append(web_path)
+
+        entry = {
+            "source": source,
+            "hash": key,
+            "source_bytes": source_bytes,
+            "triangles": int(len(faces)),
+            "vertices": int(len(vertices)),
+            "sim": sim_path,
+            "sim_bytes": os.path.getsize(sim_path),
+            "collision": hull_path,
+            "collision_triangles": int(len(hull_faces)),
+            "collision_bytes": os.path.getsize(hull_path),
+            "web": web_paths,
+            "web_triangles": [int(len(lod_faces)) for _, lod_faces in lods],
+            "web_bytes": [os.path.getsize(web_path) for web_path in web_paths],
+        }
+        self.geometries[key] = entry
+        return entry
+
+    def resolve(self, urdf_path, filename):
+        if filename.startswith("package://"):
+            package_path = filename[len("package://"):]
+            package, _, rest = package_path.partition("/")
+            directory = os.path.dirname(os.path.abspath(urdf_path))
+            while directory and os.path.basename(directory) != package and os.path.dirname(directory) != directory:
+                directory = os.path.dirname(directory)
+            if os.path.basename(directory) != package:
+                directory = os.path.dirname(os.path.dirname(os.path.abspath(urdf_path)))
+            return os.path.join(directory, rest)
+        return os.path.join(os.path.dirname(os.path.abspath(urdf_path)), filename)
+
+    def process_urdf(self, urdf_path, name=None):
+        '''
+            URDF 하나를 처리하여 <output>/<name>/manifest.json, <name>.sim.urdf, <name>.web.urdf 생성
+            name: 자산 이름 (asset_names, 기본값은 파일 이름)
+        '''
+        name = name or os.path.splitext(os.path.basename(urdf_path))[0]
+        asset_dir = os.path.join(self.output_dir, name)
+        stem = os.path.basename(name)
+        os.makedirs(asset_dir, exist_ok=True)
+
+        tree = ET.parse(urdf_path)
+        sim_tree = ET.parse(urdf_path)
+        web_tree = ET.parse(urdf_path)
+        sources, entries, missing = [], {}, []
+        for mesh, sim_mesh, web_mesh, parent in zip(tree.iter("mesh"), sim_tree.iter("mesh"), web_tree.iter("mesh"), self.mesh_parents(tree)):
+            filename = mesh.get("filename")
+            path = self.resolve(urdf_path, filename)
+            if not os.path.exists(path) or not path.lower().endswith(".stl"):
+                missing.append(filename)
+                continue
+            entry = self.process_mesh(path)
+            entries[filename] = entry
+            sources.append(path)
+
+            sim_target = entry["collision"] if parent == "collision" else entry["sim"]
+            sim_mesh.set("filename", os.path.relpath(sim_target, asset_dir).replace(os.sep, "/"))
+            web_mesh.set("filename", os.path.relpath(entry["web"][0], asset_dir).replace(os.sep, "/"))
+
+        sim_urdf = os.path.join(asset_dir, f"{stem}.sim.urdf")
+        web_urdf = os.path.join(asset_dir, f"{stem}.web.urdf")
+        sim_tree.write(sim_urdf, encoding="utf-8", xml_declaration=True)
+        web_tree.write(web_urdf, encoding="utf-8", xml_declaration=True)
+
+        unique_sources = sorted(set(sources))
+        unique = list({entry["hash"]: entry for entry in entries.values()}.values())
+        source_bytes = sum(os.path.getsize(path) for path in unique_sources)
+        sim_outputs = sorted({entry["sim"] for entry in unique} | {entry["collision"] for entry in unique})
+        web_outputs = sorted({entry["web"][0] for entry in unique})
+
+        manifest = {
+            "asset": name,
+            "urdf": os.path.abspath(urdf_path),
+            "sim_urdf": sim_urdf,
+            "web_urdf": web_urdf,
+            "meshes": {filename: {key: value for key, value in entry.items() if key != "source"} for filename, entry in entries.items()},
+            "missing": missing,
+        }
+        with open(os.path.join(asset_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        return {
+            "asset": name,
+            "mesh_files": len(unique_sources),
+            "unique_meshes": len(unique),
+            "source_bytes": source_bytes,
+            "sim_bytes": sum(os.path.getsize(path) for path in sim_outputs),
+            "web_bytes": sum(os.path.getsize(path) for path in web_outputs),
+            "source_load_ms": load_time_ms(unique_sources),
+            "sim_load_ms": load_time_ms(sorted({entry["sim"] for entry in unique})),
+            "web_load_ms": load_time_ms(web_outputs),
+            "missing": len(missing),
+        }
+
+    def mesh_parents(self, tree):
+        '''
+            mesh 요소 순서대로 "visual" | "collision"
+        '''
+        parents = []
+        for element in tree.iter():
+            if element.tag in ("visual", "collision"):
+                parents += [element.tag] * len(list(element.iter("mesh")))
+        return parents
+
+    def process_glb(self, path, name=None):
+        '''
+            GLB/glTF(외부 .bin 포함)의 메시를 URDF 메시와 같은 단계로 처리
+                - 프리미티브마다 용접 -> 시뮬레이션 STL과 충돌 볼록 껍질 STL (형상 해시로 URDF 메시와도 공유)
+                - 노드/재질 구조를 유지한 int16 양자화 GLB: <name>.glb(LOD0), <name>.lod<n>.glb, 외부 버퍼는 GLB 안으로 포함
+            name: 자산 이름 (asset_names, 기본값은 파일 이름)
+        '''
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        document, buffers = load_gltf(path)
+        os.makedirs(os.path.join(self.output_dir, os.path.dirname(name)), exist_ok=True)
+
+        primitives, entries, max_error = [], {}, 0.0
+        for mesh_index, mesh in enumerate(document.get("meshes", [])):
+            mesh_primitives = []
+            for primitive_index, primitive in enumerate(mesh["primitives"]):
+                if primitive.get("mode", TRIANGLES) != TRIANGLES or "targets" in primitive:
+                    raise ValueError(f"{path}: mesh {mesh_index} has non-triangle or morph target primitives..!")
+                positions = read_accessor(document, buffers, primitive["attributes"]["POSITION"]).astype(np.float32)
+                if "indices" in primitive:
+                    indices = read_accessor(document, buffers, primitive["indices"]).reshape(-1, 3).astype(np.int64)
+                else:
+                    indices = np.arange(len(positions)).reshape(-1, 3)
+                vertices, faces = weld(positions[indices])
+                label = f"{mesh.get('name', mesh_index)}#{primitive_index}"
+                entry = self.process_geometry(vertices, faces, label, f"{os.path.abspath(path)}:{label}", 0, web=False)
+                entries[label] = {key: value for key, value in entry.items() if key != "source"}
+                lods = self.lods(vertices, faces)
+                mesh_primitives.append((lods, primitive.get("material")))
+            primitives.append(mesh_primitives)
+
+            base = np.concatenate([lods[0][0] for lods, _ in mesh_primitives])
+            quantized, center, half = quantize(base)
+            max_error = max(max_error, float(np.abs(center + quantized / 32767.0 * half - base).max()))
+
+        web_paths = []
+        for level in range(1 + len(self.lod_resolutions)):
+            if level and all(len(lods) <= level for mesh_primitives in primitives for lods, _ in mesh_primitives):
+                break
+            web_path = os.path.join(self.output_dir, f"{name}.glb" if level == 0 else f"{name}.lod{level}.glb")
+            with open(web_path, "wb") as f:
+                f.write(scene_glb(document, primitives, level))
+            web_paths.append(web_path)
+
+        source_bytes = os.path.getsize(path)
+        for buffer in document.get("buffers", []):
+            if "uri" in buffer:
+                source_bytes += os.path.getsize(os.path.join(os.path.dirname(path), buffer["uri"]))
+        unique = list({entry["hash"]: entry for entry in entries.values()}.values())
+        sim_outputs = sorted({entry["sim"] for entry in unique} | {entry["collision"] for entry in unique})
+
+        manifest = {
+            "asset": name,
+            "source": os.path.abspath(path),
+            "web": web_paths,
+            "web_bytes": [os.path.getsize(web_path) for web_path in web_paths],
+            "web_triangles": [sum(int(len(lods[min(level, len(lods) - 1)][1])) for mesh_primitives in primitives for lods, _ in mesh_primitives)
+                              for level in range(len(web_paths))],
+            "max_quantization_error": max_error,     # 원본 좌표 단위
+            "meshes": entries,
+        }
+        with open(os.path.join(self.output_dir, f"{name}.manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return {
+            "asset": name,
+            "mesh_files": sum(len(mesh_primitives) for mesh_primitives in primitives),
+            "unique_meshes": len(unique),
+            "source_bytes": source_bytes,
+            "sim_bytes": sum(os.path.getsize(sim_path) for sim_path in sim_outputs),
+            "web_bytes": os.path.getsize(web_paths[0]),
+            "source_load_ms": load_time_ms([path]) if path.lower().endswith(".glb") else 0.0,
+            "sim_load_ms": load_time_ms(sorted({entry["sim"] for entry in unique})),
+            "web_load_ms": load_time_ms(web_paths[:1]),
+            "missing": 0,
+        }
+
+def find_assets(paths):
+    '''
+        인자로 받은 파일/디렉토리에서 URDF와 GLB/glTF 목록 수집 (*.orig.URDF 제외)
+    '''
+    assets = []
+    for path in paths:
+        if os.path.isfile(path):
+            assets.append(path)
+            continue
+        for root, _, files in os.walk(path):
+            for file in sorted(files):
+                lower = file.lower()
+                if lower.endswith(".orig.urdf"):
+                    continue
+                if lower.endswith((".urdf", ".glb", ".gltf")):
+                    assets.append(os.path.join(root, file))
+    return assets
+
+def asset_names(assets):
+    '''
+        자산별 출력 이름: 파일 이름(확장자 제외)이 겹치면 겹치지 않을 때까지 상위 디렉토리를 붙임 ("urdf" 디렉토리는 생략)
+        ex) urdf/TriATHLETE/urdf/TriATHLETE.URDF -> TriATHLETE/TriATHLETE, urdf/TriATHLETE_Climbing/urdf/TriATHLETE.URDF -> TriATHLETE_Climbing/TriATHLETE
+        경로가 달라도 구분할 수 없으면 ValueError
+    '''
+    parts = []
+    for asset in assets:
+        directory, file = os.path.split(os.path.normpath(os.path.abspath(asset)))
+        components = [component for component in directory.split(os.sep) if component and component.lower() != "urdf"]
+        parts.append(components + [os.path.splitext(file)[0]])
+
+    depth = [1] * len(assets)
+    while True:
+        names = ["/".join(components[-n:]) for components, n in zip(parts, depth)]
+        groups = {}
+        for i, name in enumerate(names):
+            groups.setdefault(name.lower(), []).append(i)      # 대소문자만 다른 이름도 같은 디렉토리 (Windows)
+        duplicates = [group for group in groups.values() if len(group) > 1]
+        if not duplicates:
+            return names
+        for group in duplicates:
+            if all(depth[i] >= len(parts[i]) for i in group):
+                raise ValueError(f"{[assets[i] for i in group]} map to the same asset name {names[group[0]]}..!")
+            for i in group:
+                depth[i] = min(depth[i] + 1, len(parts[i]))
+
+def format_report(rows):
+    width = max([28] + [len(row["asset"]) + 2 for row in rows])
+    header = f"{'asset':<{width}}{'meshes':>8}{'unique':>8}{'source KB':>12}{'sim KB':>10}{'web KB':>10}{'load ms':>10}{'sim ms':>10}{'web ms':>10}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(f"{row['asset']:<{width}}{row['mesh_files']:>8}{row['unique_meshes']:>8}"
+                     f"{row['source_bytes'] / 1024:>12.1f}{row['sim_bytes'] / 1024:>10.1f}{row['web_bytes'] / 1024:>10.1f}"
+                     f"{row['source_load_ms']:>10.1f}{row['sim_load_ms']:>10.1f}{row['web_load_ms']:>10.1f}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WADF asset optimizer")
+    parser.add_argument("inputs", nargs="+", help="URDF/GLB 파일 또는 디렉토리")
+    parser.add_argument("--output", default=os.path.join("build", "assets"), help="출력 디렉토리")
+    parser.add_argument("--lod", type=int, nargs="*", default=[96, 32, 12], help="LOD 단계별 격자 해상도")
+    parser.add_argument("--hull-points", type=int, default=64, help="충돌 볼록 껍질 최대 점 수")
+    args = parser.parse_args(argv)
+
+    optimizer = AssetOptimizer(args.output, args.lod, args.hull_points)
+    rows = []
+    assets = find_assets(args.inputs)
+    for asset, name in zip(assets, asset_names(assets)):
+        if asset.lower().endswith((".glb", ".gltf")):
+            rows.append(optimizer.process_glb(asset, name))
+        else:
+            rows.append(optimizer.process_urdf(asset, name))
+
+    with open(os.path.join(args.output, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2)
+    print(format_report(rows))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
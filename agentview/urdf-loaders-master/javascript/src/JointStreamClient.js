@@ -0,0 +1,113 @@
+// Joint stream client
+// Connects to the WADF JointStreamServer and applies the binary delta frames
+// to a urdf-viewer element. Channels that are not URDF joints (ex. pallet
+// positions) are passed to the `onChannel` callback instead.
+
+// Frame layout (little-endian)
+// header: uint8 magic (0x4A) | uint8 flags (bit0: keyframe) | uint32 seq | uint32 time_ms | uint16 count
+// entry:  uint16 channel | float32 value (NaN: channel removed)
+const FRAME_MAGIC = 0x4A;
+const HEADER_SIZE = 12;
+const ENTRY_SIZE = 6;
+
+export class JointStreamClient {
+
+    constructor(viewer, url, options = {}) {
+
+        this.viewer = viewer;
+        this.url = url;
+        this.fps = options.fps || 30;
+        this.onChannel = options.onChannel || null;
+        this.reconnectMs = options.reconnectMs || 1000;
+
+        this.channels = {};
+        this.seq = 0;
+        this.socket = null;
+        this.closed = false;
+
+    }
+
+    connect() {
+
+        this.closed = false;
+
+        const socket = new WebSocket(`${ this.url }?fps=${ this.fps }`);
+        socket.binaryType = 'arraybuffer';
+        socket.onmessage = e => this._onMessage(e.data);
+        socket.onclose = () => {
+
+            this.socket = null;
+            this.channels = {};
+            if (!this.closed) setTimeout(() => this.connect(), this.reconnectMs);
+
+        };
+        this.socket = socket;
+
+    }
+
+    close() {
+
+        this.closed = true;
+        if (this.socket) this.socket.close();
+
+    }
+
+    setFrameRate(fps) {
+
+        this.fps = fps;
+        this._send({ fps });
+
+    }
+
+    /* Private Functions */
+    _send(message) {
+
+        if (this.socket && this.socket.readyState === WebSocket.OPEN) {
+
+            this.socket.send(JSON.stringify(message));
+
+        }
+
+    }
+
+    _onMessage(data) {
+
+        if (typeof data === 'string') {
+
+            const message = JSON.parse(data);
+            if (message.type === 'schema') Object.assign(this.channels, message.channels);
+            return;
+
+        }
+
+        const view = new DataView(data);
+        if (view.getUint8(0) !== FRAME_MAGIC) return;
+
+        this.seq = view.getUint32(2, true);
+        const count = view.getUint16(10, true);
+
+        const values = {};
+        for (let i = 0; i < count; i ++) {
+
+            const offset = HEADER_SIZE + i * ENTRY_SIZE;
+            const name = this.channels[view.getUint16(offset, true)];
+            const value = view.getFloat32(offset + 2, true);
+            if (name === undefined) continue;
+
+            if (this.viewer.robot && this.viewer.robot.joints[name]) {
+
+                values[name] = value;
+
+            } else if (this.onChannel) {
+
+                this.onChannel(name, Number.isNaN(value) ? null : value);
+
+            }
+
+        }
+
+        this.viewer.setJointValues(values);
+
+    }
+
+}
@@ -1,6 +1,7 @@
 import * as THREE from 'three';
 import { STLLoader } from 'three/examples/jsm/loaders/STLLoader.js';
 import { ColladaLoader } from 'three/examples/jsm/loaders/ColladaLoader.js';
+import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
 import { URDFRobot, URDFJoint, URDFLink, URDFCollider, URDFVisual, URDFMimicJoint } from './URDFClasses.js';
 
 /*
@@ -697,6 +698,15 @@ class URDFLoader {
 
                                         obj.material = material;
 
+                                    } else if (/\.glb$/i.test(filePath)) {
+
+                                        // optimized meshes keep their dequantization transform on a child node
+                                        obj.traverse(c => {
+
+                                            if (c.isMesh) c.material = material;
+
+                                        });
+
                                     }
 
                                     // We don't expect non identity rotations or positions. In the case of
@@ -786,6 +796,11 @@ class URDFLoader {
             const loader = new ColladaLoader(manager);
             loader.load(path, dae => done(dae.scene));
 
+        } else if (/\.glb$/i.test(path)) {
+
+            const loader = new GLTFLoader(manager);
+            loader.load(path, gltf => done(gltf.scene));
+
         } else {
 
             console.warn(`URDFLoader: Could not load model at ${ path }.\nNo loader available`);
@@ -0,0 +1,140 @@
+"""
+SharedStatePlane 검사
+    - writer(테스트 프로세스)가 모든 변수를 같은 카운터 값으로 계속 게시하는 동안 별도 reader 프로세스가 스냅샷을 읽어
+      한 스냅샷의 값이 모두 같은 게시에서 나온 것인지 확인 (seqlock 찢어진 읽기 없음)
+    - WDF 정수형(UInt16 등) 왕복, 같은 이름의 세그먼트가 있을 때의 처리
+
+실행 (urdf-loaders-master 디렉토리에서): python -m pytest tests
+"""
+import multiprocessing
+import os
+import time
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import pytest
+
+from WADF.Linker.SharedStatePlane import (INT_TYPES, FLOAT_TYPES, OWNER, OWNER_OFFSET, SharedStateReader,
+                                          SharedStateWriter, decode_value, encode_value, wdf_schema)
+
+WDF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "WADF", "WDF", "InP.wdf")
+
+def segment_name(tag):
+    return f"wadf_test_{tag}_{os.getpid()}"
+
+def value_for(data_type, n):
+    if data_type == "Boolean":
+        return n % 2 == 1
+    if data_type in INT_TYPES:
+        return n % 100
+    if data_type in FLOAT_TYPES:
+        return float(n)
+    return str(n)
+
+def make_stores(schema):
+    stores = {}
+    for path, _ in schema:
+        device, section, variable = path.split("/", 2)
+        stores.setdefault(device, {}).setdefault(section, {})[variable] = {"Value": None, "Timestamp": None}
+    return stores
+
+def set_all(stores, schema, n):
+    for path, data_type in schema:
+        device, section, variable = path.split("/", 2)
+        entry = stores[device][section][variable]
+        entry["Value"] = value_for(data_type, n)
+        entry["Timestamp"] = datetime.now()
+
+def read_loop(name, duration_s, ready, result):
+    '''
+        reader 프로세스: 스냅샷마다 Float 변수에서 카운터를 구하고 모든 변수가 같은 카운터 값인지 확인
+    '''
+    reader = SharedStateReader(name)
+    ready.set()
+    snapshots = torn = 0
+    counters = set()
+    deadline = time.monotonic() + duration_s
+    while time.monotonic() < deadline:
+        values = reader.values()
+        types = dict(reader.layout.schema)
+        n = next(int(value) for path, (value, _) in values.items() if types[path] in FLOAT_TYPES and value is not None)
+        if any(value != value_for(types[path], n) for path, (value, _) in values.items()):
+            torn += 1
+        counters.add(n)
+        snapshots += 1
+    reader.close()
+    result.put((snapshots, torn, len(counters), reader.retries))
+
+
+def test_seqlock_two_process_consistency():
+    schema = wdf_schema(WDF_PATH)
+    stores = make_stores(schema)
+    set_all(stores, schema, 0)
+    writer = SharedStateWriter(WDF_PATH, stores, segment_name("seqlock"))
+    writer.publish(force=True)
+
+    context = multiprocessing.get_context("spawn")
+    ready, result = context.Event(), context.Queue()
+    reader = context.Process(target=read_loop, args=(writer.name, 1.0, ready, result))
+    reader.start()
+    try:
+        assert ready.wait(30.0)
+        n = 0
+        while reader.is_alive():
+            n += 1
+            set_all(stores, schema, n)
+            writer.publish()
+        snapshots, torn, counters, retries = result.get(timeout=10.0)
+    finally:
+        reader.join(10.0)
+        writer.close()
+
+    assert reader.exitcode == 0
+    assert snapshots > 100 and counters > 10      # 게시가 진행되는 동안 실제로 여러 번 읽었는지
+    assert torn == 0
+
+
+def test_integer_types_round_trip():
+    assert decode_value(encode_value(65535, "UInt16"), "UInt16") == 65535
+    assert isinstance(decode_value(encode_value(7, "UInt16"), "UInt16"), int)
+    with pytest.raises(OverflowError):
+        encode_value(65536, "UInt16")
+
+    schema = wdf_schema(WDF_PATH)
+    stores = make_stores(schema)
+    program = next(path for path, data_type in schema if data_type == "UInt16")
+    device, section, variable = program.split("/", 2)
+    stores[device][section][variable].update(Value=513, Timestamp=datetime.now())
+    writer = SharedStateWriter(WDF_PATH, stores, segment_name("uint16"))
+    try:
+        writer.publish()
+        reader = SharedStateReader(writer.name)
+        assert reader.get(program)[0] == 513
+        reader.close()
+    finally:
+        writer.close()
+
+
+def test_existing_segment_is_not_silently_unlinked():
+    name = segment_name("owner")
+    live = SharedStateWriter(WDF_PATH, {}, name)
+    try:
+        with pytest.raises(FileExistsError):       # writer가 살아 있는 세그먼트
+            SharedStateWriter(WDF_PATH, {}, name)
+
+        exited = multiprocessing.get_context("spawn").Process(target=time.sleep, args=(0,))
+        exited.start()
+        exited.join()
+        OWNER.pack_into(live.shm.buf, OWNER_OFFSET, exited.pid)
+        replacement = SharedStateWriter(WDF_PATH, {}, name)    # 종료된 writer가 남긴 세그먼트는 다시 생성
+        replacement.close()
+    finally:
+        live.shm.close()
+
+    foreign = shared_memory.SharedMemory(name=segment_name("foreign"), create=True, size=4096)
+    try:
+        with pytest.raises(FileExistsError):       # WADF 세그먼트가 아님
+            SharedStateWriter(WDF_PATH, {}, foreign.name)
+    finally:
+        foreign.close()
+        foreign.unlink()